@@ -1,23 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
+import json
 import logging
 
 from app.database import get_db
 from app.schemas import (
-    URLInput, TextInput, NewsArticleResponse,
+    URLInput, BulkURLInput, FeedInput, TextInput, NewsArticleResponse,
     AnalyticsResponse, FilterParams
 )
 from app.models.db_models import NewsArticle, AlertHistory
 from app.services.processing_pipeline import news_pipeline
+from app.services.analysis_cache import analysis_cache
+from app.services.model_executor import model_executor, ExecutorOverloaded
+from app.services.translation_engine import translation_engine
+from app.services.translation_memory import translation_memory
+from app.services.translation_worker import translation_worker_client
+from app.services.llm_client import llm_client
+from app.services.http_fetcher import http_fetcher, FetchError
+from app.services.http_cache import http_cache
+from app.services.bulk_ingest import bulk_ingest
+from app.services.feed_poller import feed_poller
+from app.services.ocr_service import PREPROCESSING_PROFILES
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["news"])
 
 
-@router.post("/submit/url", response_model=NewsArticleResponse)
+def require_models_ready():
+    """Reject submissions while the ML models are still loading"""
+    if not model_executor.models_ready():
+        raise HTTPException(status_code=503, detail="ML models are still loading, try again shortly")
+
+
+@router.post("/submit/url", response_model=NewsArticleResponse, dependencies=[Depends(require_models_ready)])
 async def submit_url(
     url_input: URLInput,
     db: Session = Depends(get_db)
@@ -28,12 +48,65 @@ async def submit_url(
     try:
         article = await news_pipeline.process_url(url_input.url, db)
         return article
+    except FetchError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except ExecutorOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Processing timed out")
     except Exception as e:
         logger.error(f"Error processing URL: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process URL: {str(e)}")
 
 
-@router.post("/submit/text", response_model=NewsArticleResponse)
+@router.post("/submit/urls", status_code=202, dependencies=[Depends(require_models_ready)])
+async def submit_urls(bulk_input: BulkURLInput):
+    """
+    Submit many news article URLs at once. Returns a batch id to poll, or
+    with stream=true an NDJSON stream of per-URL results as they complete
+    """
+    try:
+        batch = bulk_ingest.submit(bulk_input.urls, stream=bulk_input.stream)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    if bulk_input.stream:
+        async def result_lines():
+            async for result in bulk_ingest.stream(batch):
+                yield json.dumps(result, default=str) + "\n"
+        return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+    return batch.summary()
+
+
+@router.get("/submit/urls/{batch_id}")
+def get_url_batch(batch_id: str):
+    """
+    Progress and per-URL results of a bulk URL batch
+    """
+    batch = bulk_ingest.get(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch.to_dict()
+
+
+@router.get("/feeds")
+def list_feeds(db: Session = Depends(get_db)):
+    """
+    Polled feeds with their publish rate, polling interval and last outcome
+    """
+    return feed_poller.list_feeds(db)
+
+
+@router.post("/feeds", status_code=201)
+def add_feed(feed_input: FeedInput, db: Session = Depends(get_db)):
+    """
+    Register an RSS/Atom feed or news sitemap for polling
+    """
+    feed = feed_poller.add_feed(feed_input.url.strip(), db)
+    return {"url": feed.url, "next_poll_at": feed.next_poll_at}
+
+
+@router.post("/submit/text", response_model=NewsArticleResponse, dependencies=[Depends(require_models_ready)])
 async def submit_text(
     text_input: TextInput,
     db: Session = Depends(get_db)
@@ -48,25 +121,40 @@ async def submit_text(
             db=db
         )
         return article
+    except ExecutorOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Processing timed out")
     except Exception as e:
         logger.error(f"Error processing text: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process text: {str(e)}")
 
 
-@router.post("/submit/pdf", response_model=NewsArticleResponse)
+def _validate_ocr_profile(profile: Optional[str]):
+    if profile is not None and profile not in PREPROCESSING_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown preprocessing profile '{profile}', expected one of: {', '.join(PREPROCESSING_PROFILES)}"
+        )
+
+
+@router.post("/submit/pdf", response_model=NewsArticleResponse, dependencies=[Depends(require_models_ready)])
 async def submit_pdf(
     file: UploadFile = File(...),
     language: str = Form('eng'),
+    profile: Optional[str] = Form(None),
     db: Session = Depends(get_db)
 ):
     """
     Submit a PDF file for processing
     Supported languages: eng, hin, kan, tam, tel, mar, etc.
+    Preprocessing profiles: none, fast, thorough, auto (default from OCR_PREPROCESSING_PROFILE)
     """
     try:
         # Validate file type
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+        _validate_ocr_profile(profile)
         
         # Read file content
         pdf_bytes = await file.read()
@@ -76,28 +164,35 @@ async def submit_pdf(
             pdf_bytes=pdf_bytes,
             filename=file.filename,
             db=db,
-            language=language
+            language=language,
+            profile=profile
         )
         
         return article
         
     except HTTPException:
         raise
+    except ExecutorOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Processing timed out")
     except Exception as e:
         logger.error(f"Error processing PDF: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
 
 
-@router.post("/submit/image", response_model=NewsArticleResponse)
+@router.post("/submit/image", response_model=NewsArticleResponse, dependencies=[Depends(require_models_ready)])
 async def submit_image(
     file: UploadFile = File(...),
     language: str = Form('eng'),
+    profile: Optional[str] = Form(None),
     db: Session = Depends(get_db)
 ):
     """
     Submit an image file for OCR and processing
     Supported formats: jpg, jpeg, png, bmp, tiff
     Supported languages: eng, hin, kan, tam, tel, mar, etc.
+    Preprocessing profiles: none, fast, thorough, auto (default from OCR_PREPROCESSING_PROFILE)
     """
     try:
         # Validate file type
@@ -107,6 +202,7 @@ async def submit_image(
                 status_code=400, 
                 detail=f"Only image files are allowed: {', '.join(allowed_extensions)}"
             )
+        _validate_ocr_profile(profile)
         
         # Read file content
         image_bytes = await file.read()
@@ -116,13 +212,18 @@ async def submit_image(
             image_bytes=image_bytes,
             filename=file.filename,
             db=db,
-            language=language
+            language=language,
+            profile=profile
         )
         
         return article
         
     except HTTPException:
         raise
+    except ExecutorOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Processing timed out")
     except Exception as e:
         logger.error(f"Error processing image: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process image: {str(e)}")
@@ -262,6 +363,25 @@ def get_analytics(
         raise HTTPException(status_code=500, detail=f"Failed to generate analytics: {str(e)}")
 
 
+@router.get("/system/stats")
+def get_system_stats():
+    """
+    Runtime counters for caches and workers
+    """
+    return {
+        "analysis_cache": analysis_cache.get_stats(),
+        "model_executor": model_executor.get_stats(),
+        "translation": translation_engine.get_stats(),
+        "translation_memory": translation_memory.get_stats(),
+        "translation_worker": translation_worker_client.get_stats() if translation_worker_client.enabled else None,
+        "llm": llm_client.get_stats(),
+        "http_fetcher": http_fetcher.get_stats(),
+        "http_cache": http_cache.get_stats(),
+        "bulk_ingest": bulk_ingest.get_stats(),
+        "feed_poller": feed_poller.get_stats()
+    }
+
+
 @router.delete("/news/{article_id}")
 def delete_article(
     article_id: int,
@@ -26,11 +26,155 @@ class Settings(BaseSettings):
     SENTIMENT_LABEL_ENCODER_PATH: str = "app/models/sentiment_label_encoder.pkl"
     DEPARTMENT_LABEL_ENCODER_PATH: str = "app/models/label_encoder (1).pkl"
     
+    # Model loading
+    ML_PARALLEL_LOAD: bool = True
+    ML_BACKGROUND_LOAD: bool = False  # serve reads while models warm up
+    PRELOAD_INDICTRANS2: bool = False
+    
+    # ML Inference backend: torch | torch-int8 | onnxruntime
+    ML_INFERENCE_BACKEND: str = "torch"
+    ML_ONNX_DIR: str = "app/models/onnx"
+    ML_ONNX_QUANTIZED: bool = False
+    ML_ONNX_THREADS: int = 0  # 0 = onnxruntime default
+    
+    # ML Inference batching
+    ML_BATCH_MAX_SIZE: int = 16
+    ML_BATCH_MAX_WAIT_MS: float = 5.0
+    
+    # Sequence-length buckets ("64,128,256,512"; empty = pad to longest in batch)
+    ML_LENGTH_BUCKETS: str = ""
+    ML_WARMUP: bool = True
+    ML_WARMUP_BATCH_SIZE: int = 4
+    ML_COMPILE_MODE: str = "none"  # none | jit | compile
+    
+    # Long-document mode: classify overlapping token windows instead of truncating
+    ML_LONG_DOCUMENT_MODE: bool = False
+    ML_WINDOW_TOKENS: int = 512
+    ML_WINDOW_OVERLAP_TOKENS: int = 64
+    ML_MAX_WINDOWS: int = 8
+    ML_WINDOW_POOLING: str = "mean"  # mean | max-negative | length-weighted
+    
+    # Model execution layer (CPU-bound work runs off the event loop)
+    MODEL_EXECUTOR_MODE: str = "thread"  # thread | process
+    MODEL_EXECUTOR_WORKERS: int = 2
+    MODEL_EXECUTOR_TORCH_THREADS: int = 0  # 0 = cpu_count / workers
+    MODEL_EXECUTOR_MAX_QUEUE: int = 64
+    MODEL_EXECUTOR_TIMEOUT_SECONDS: float = 300.0
+    
+    # Analysis cache (skip re-inference for duplicate articles)
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_PERSISTENT: bool = True
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 1024
+    ANALYSIS_MODEL_VERSION: str = "1"  # bump to invalidate cached results
+    
     # Tesseract
     TESSERACT_CMD: str = ""
     
-    # Translation
+    # OCR (pages are OCR'd in parallel on a process pool)
+    OCR_ENGINE: str = "auto"  # auto | tesserocr (in-process) | pytesseract (subprocess per call)
+    OCR_TESSDATA_PATH: str = ""  # tessdata directory for tesserocr; empty = libtesseract default
+    OCR_WORKERS: int = 0  # 0 = one per CPU core
+    OCR_THREADS_PER_WORKER: int = 1  # OMP_THREAD_LIMIT for Tesseract in each worker
+    OCR_PAGE_TIMEOUT_SECONDS: float = 120.0
+    OCR_DPI: int = 300
+    OCR_GRAYSCALE: bool = True  # render pages as 8-bit grayscale (a third of RGB memory)
+    OCR_MEMORY_BUDGET_MB: int = 512  # peak memory for rendered pages in flight
+    OCR_TEXT_LAYER_ENABLED: bool = True  # use a PDF's embedded text where it is good enough
+    OCR_TEXT_LAYER_MIN_CHARS: int = 100
+    OCR_TEXT_LAYER_MIN_QUALITY: float = 0.85
+    OCR_PREPROCESSING_PROFILE: str = "auto"  # none | fast | thorough | auto
+    OCR_AUTO_NOISE_THRESHOLD: float = 8.0  # noise sigma at/above which auto picks "thorough"
+    OCR_AUTO_CLEAN_NOISE: float = 3.0  # noise sigma at/below which a straight scan gets "none"
+    OCR_AUTO_MIN_CONTRAST: float = 0.35  # below this auto picks "thorough"
+    OCR_DESKEW_MIN_DEGREES: float = 0.5
+    OCR_MAX_IMAGE_SIDE: int = 4000  # downscale camera images / lower PDF DPI beyond this
+    OCR_MIN_IMAGE_SIDE: int = 1000  # upscale (up to 2x) images smaller than this
+    OCR_LAYOUT_ANALYSIS: bool = True  # OCR only detected text blocks of images, in reading order
+    OCR_LAYOUT_MIN_REGION_AREA: float = 0.002  # drop blocks smaller than this fraction of the image
+    
+    # Groq LLM (OpenAI-compatible API; point GROQ_BASE_URL at scripts/llm_stub_server.py to test offline)
     GROQ_API_KEY: str = ""
+    GROQ_BASE_URL: str = "https://api.groq.com/openai/v1"
+    GROQ_MODEL: str = "llama-3.3-70b-versatile"
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_MAX_CONNECTIONS: int = 8
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 20.0
+    LLM_DEADLINE_SECONDS: float = 45.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    
+    # Page fetching for URL submissions (one pooled client; point URLs at scripts/fixture_http_server.py to test offline)
+    FETCH_HTTP2: bool = True  # used when the h2 package is installed
+    FETCH_MAX_CONNECTIONS: int = 32
+    FETCH_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    FETCH_KEEPALIVE_SECONDS: float = 30.0
+    FETCH_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    FETCH_TIMEOUT_SECONDS: float = 15.0  # per read/write
+    FETCH_DEADLINE_SECONDS: float = 30.0  # whole download, including redirects
+    FETCH_MAX_BYTES: int = 5_000_000
+    FETCH_MAX_REDIRECTS: int = 5
+    FETCH_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    
+    # Article extraction: "lxml" (text/link density, fast) or "newspaper" (newspaper3k); the other is the fallback
+    SCRAPER_ENGINE: str = "lxml"
+    
+    # URL canonicalization and HTTP revalidation cache for scraped pages
+    URL_STRIP_PARAMS: str = ""  # extra comma-separated query params to drop (utm_*, fbclid, ... always are)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_PATH: str = "app/cache/http_cache.sqlite3"
+    HTTP_CACHE_MAX_ENTRIES: int = 50000
+    
+    # Bulk URL ingestion (POST /api/submit/urls)
+    BULK_MAX_URLS: int = 500  # per batch
+    BULK_MAX_CONCURRENT_FETCHES: int = 16
+    BULK_PER_HOST_CONCURRENCY: int = 2
+    BULK_CRAWL_DELAY_SECONDS: float = 1.0  # min spacing between request starts to one host
+    BULK_PROCESS_WORKERS: int = 4  # articles analyzed concurrently (the ML batcher groups them)
+    BULK_QUEUE_SIZE: int = 32  # extracted articles waiting for analysis before fetching pauses
+    BULK_MAX_BATCHES: int = 100  # finished batches kept for polling
+    
+    # RSS/Atom feed and news sitemap polling (new items go through bulk ingestion)
+    FEED_POLLER_ENABLED: bool = True
+    FEED_URLS: str = ""  # comma-separated feed/sitemap URLs
+    FEED_LIST_PATH: str = ""  # optional file with one feed URL per line
+    FEED_TICK_SECONDS: float = 15.0  # how often due feeds are looked up
+    FEED_MAX_CONCURRENT_POLLS: int = 8
+    FEED_DEFAULT_INTERVAL_SECONDS: float = 900.0  # new feeds, and the base for failure backoff
+    FEED_MIN_INTERVAL_SECONDS: float = 120.0
+    FEED_MAX_INTERVAL_SECONDS: float = 21600.0
+    FEED_TARGET_ITEMS_PER_POLL: float = 2.0  # poll about when this many new items are expected
+    FEED_INITIAL_LOOKBACK_HOURS: float = 24.0  # a feed's first poll only ingests items this recent
+    FEED_MAX_ITEMS_PER_POLL: int = 100
+    FEED_SEEN_IDS: int = 500  # item ids remembered per feed for undated entries
+    FEED_MAX_CHILD_SITEMAPS: int = 5  # changed child sitemaps read per sitemap index poll
+    
+    # Translation
+    TRANSLATION_BATCH_SIZE: int = 8
+    TRANSLATION_BATCH_MAX_TOKENS: int = 1024
+    TRANSLATION_MAX_SENTENCE_TOKENS: int = 200
+    TRANSLATION_MAX_DOCUMENT_TOKENS: int = 4096
+    TRANSLATION_MAX_OUTPUT_TOKENS: int = 256
+    
+    # Translation memory (segment-level cache: in-memory LRU + SQLite file)
+    TRANSLATION_MEMORY_ENABLED: bool = True
+    TRANSLATION_MEMORY_PATH: str = "app/cache/translation_memory.sqlite3"
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 20000
+    TRANSLATION_MEMORY_MAX_DISK_ENTRIES: int = 0  # 0 = unbounded
+    TRANSLATION_MEMORY_VERSION: str = "1"  # bump to invalidate stored translations
+    
+    # Translation worker (one IndicTrans2 process per host, shared by all API workers)
+    TRANSLATION_WORKER_ENABLED: bool = True
+    TRANSLATION_WORKER_AUTOSTART: bool = True
+    TRANSLATION_WORKER_HOST: str = "127.0.0.1"
+    TRANSLATION_WORKER_PORT: int = 8765
+    TRANSLATION_WORKER_AUTHKEY: str = ""  # empty = random per-host key in TRANSLATION_WORKER_AUTHKEY_PATH
+    TRANSLATION_WORKER_AUTHKEY_PATH: str = "app/cache/translation_worker.key"
+    TRANSLATION_WORKER_PRELOAD: bool = True
+    TRANSLATION_WORKER_IDLE_UNLOAD_SECONDS: int = 1800  # 0 = keep the model loaded
+    TRANSLATION_WORKER_TIMEOUT_SECONDS: float = 240.0  # capped below MODEL_EXECUTOR_TIMEOUT_SECONDS
     
     class Config:
         env_file = ".env"
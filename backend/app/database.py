@@ -23,4 +23,6 @@ def get_db():
 def init_db():
     """Initialize database tables"""
     import app.models.db_models
+    import app.services.analysis_cache
+    import app.services.feed_poller
     Base.metadata.create_all(bind=engine)
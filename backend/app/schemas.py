@@ -8,6 +8,15 @@ class URLInput(BaseModel):
     url: str = Field(..., description="URL of the news article")
 
 
+class BulkURLInput(BaseModel):
+    urls: List[str] = Field(..., min_length=1, description="URLs of news articles")
+    stream: bool = Field(False, description="Stream per-URL results as NDJSON instead of returning a batch id")
+
+
+class FeedInput(BaseModel):
+    url: str = Field(..., description="URL of an RSS/Atom feed or news sitemap")
+
+
 class TextInput(BaseModel):
     text: str = Field(..., description="Raw text content")
     title: Optional[str] = None
@@ -0,0 +1,272 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Any
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+
+from app.config import get_settings
+from app.database import Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class AnalysisCacheEntry(Base):
+    """Persistent tier of the analysis cache: one row per (content hash, model version)"""
+    __tablename__ = "analysis_cache"
+    __table_args__ = (UniqueConstraint("content_hash", "model_version", name="uq_analysis_cache_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False, index=True)
+    model_version = Column(String(64), nullable=False, index=True)
+    detected_language = Column(String(16))
+    translated_content = Column(Text)
+    translation_performed = Column(Boolean, default=False)
+    sentiment = Column(String(50))
+    sentiment_score = Column(Float)
+    department = Column(String(100))
+    department_score = Column(Float)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.now)
+    last_hit_at = Column(DateTime)
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of language detection, translation and ML results.
+
+    Keys are a hash of the normalized article text, so the same story submitted
+    from different URLs, as pasted text or via OCR maps to one entry. Every
+    entry is tagged with a model version fingerprint; changing model files,
+    backend, translation provider settings or ANALYSIS_MODEL_VERSION makes
+    old entries unreachable, and purge_stale() deletes them. Async callers
+    use aget()/aput() so database lookups stay off the event loop.
+    """
+
+    FIELDS = (
+        "detected_language", "translated_content", "translation_performed",
+        "sentiment", "sentiment_score", "department", "department_score"
+    )
+
+    def __init__(self):
+        self.enabled = settings.ANALYSIS_CACHE_ENABLED
+        self.persistent = settings.ANALYSIS_CACHE_PERSISTENT
+        self.max_entries = max(0, settings.ANALYSIS_CACHE_MAX_ENTRIES)
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_version = None
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+    @property
+    def model_version(self) -> str:
+        if self._model_version is None:
+            self._model_version = self._compute_model_version()
+        return self._model_version
+
+    @staticmethod
+    def normalize_content(text: str) -> str:
+        """Normalize text so trivially different copies of an article hash the same"""
+        text = unicodedata.normalize("NFKC", text or "").casefold()
+        # Punctuation and symbols differ between OCR, scraped HTML and pasted copies
+        text = "".join(" " if unicodedata.category(ch)[0] in "PS" else ch for ch in text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def content_hash(self, text: str) -> str:
+        return hashlib.sha256(self.normalize_content(text).encode("utf-8")).hexdigest()
+
+    def get(self, content: str) -> Optional[Dict[str, Any]]:
+        """Look up cached results for content; memory first, then the database"""
+        if not self.enabled:
+            return None
+
+        content_hash = self.content_hash(content)
+        with self._lock:
+            entry = self._memory.get(content_hash)
+            if entry is not None:
+                self._memory.move_to_end(content_hash)
+                self.stats["memory_hits"] += 1
+                return dict(entry)
+
+        entry = self._get_persistent(content_hash) if self.persistent else None
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["db_hits"] += 1
+        self._remember(content_hash, entry)
+        return dict(entry)
+
+    async def aget(self, content: str) -> Optional[Dict[str, Any]]:
+        """get() for the event loop: memory hits inline, database lookups on a thread"""
+        if not self.enabled:
+            return None
+        content_hash = self.content_hash(content)
+        with self._lock:
+            if content_hash in self._memory:
+                self._memory.move_to_end(content_hash)
+                self.stats["memory_hits"] += 1
+                return dict(self._memory[content_hash])
+        if not self.persistent:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        return await asyncio.to_thread(self.get, content)
+
+    async def aput(self, content: str, results: Dict[str, Any]):
+        """put() for the event loop (the database write runs on a thread)"""
+        if not self.enabled:
+            return
+        if self.persistent:
+            await asyncio.to_thread(self.put, content, results)
+        else:
+            self.put(content, results)
+
+    def put(self, content: str, results: Dict[str, Any]):
+        """Store detection, translation and ML results for content"""
+        if not self.enabled:
+            return
+
+        content_hash = self.content_hash(content)
+        entry = {field: results.get(field) for field in self.FIELDS}
+        self._remember(content_hash, entry)
+        if self.persistent:
+            self._put_persistent(content_hash, entry)
+        with self._lock:
+            self.stats["stores"] += 1
+
+    def purge_stale(self):
+        """Drop entries written under a different model version (call at startup)"""
+        self._model_version = self._compute_model_version()
+        with self._lock:
+            self._memory.clear()
+        if not (self.enabled and self.persistent):
+            return
+
+        db = SessionLocal()
+        try:
+            removed = db.query(AnalysisCacheEntry).filter(
+                AnalysisCacheEntry.model_version != self.model_version
+            ).delete(synchronize_session=False)
+            db.commit()
+            if removed:
+                logger.info(f"✓ Removed {removed} analysis cache entries from older model versions")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to purge stale analysis cache entries: {e}")
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        stats["model_version"] = self.model_version
+        stats["enabled"] = self.enabled
+        return stats
+
+    def _remember(self, content_hash: str, entry: Dict[str, Any]):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._memory[content_hash] = entry
+            self._memory.move_to_end(content_hash)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _get_persistent(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            row = db.query(AnalysisCacheEntry).filter(
+                AnalysisCacheEntry.content_hash == content_hash,
+                AnalysisCacheEntry.model_version == self.model_version
+            ).first()
+            if row is None:
+                return None
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_hit_at = datetime.now()
+            db.commit()
+            return {field: getattr(row, field) for field in self.FIELDS}
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.error(f"Analysis cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _put_persistent(self, content_hash: str, entry: Dict[str, Any]):
+        db = SessionLocal()
+        try:
+            db.add(AnalysisCacheEntry(content_hash=content_hash, model_version=self.model_version, **entry))
+            db.commit()
+        except IntegrityError:
+            # A concurrent request stored the same article first
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.error(f"Analysis cache store failed: {e}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _compute_model_version() -> str:
+        """Fingerprint of everything that changes analysis output for the same text"""
+        def file_signature(path: str):
+            # Directories: every file in them (weights, tokenizer, config); files: the file itself
+            try:
+                if not os.path.isdir(path):
+                    stat = os.stat(path)
+                    return [stat.st_size, int(stat.st_mtime)]
+                signature = []
+                for root, _, files in os.walk(path):
+                    for name in sorted(files):
+                        stat = os.stat(os.path.join(root, name))
+                        signature.append([os.path.relpath(os.path.join(root, name), path), stat.st_size, int(stat.st_mtime)])
+                return sorted(signature)
+            except OSError:
+                return None
+
+        from app.services.language_service import INDICTRANS2_PROVIDER
+
+        payload = {
+            "version": settings.ANALYSIS_MODEL_VERSION,
+            "backend": settings.ML_INFERENCE_BACKEND,
+            "onnx_quantized": settings.ML_ONNX_QUANTIZED,
+            "long_document": [
+                settings.ML_LONG_DOCUMENT_MODE, settings.ML_WINDOW_TOKENS,
+                settings.ML_WINDOW_OVERLAP_TOKENS, settings.ML_MAX_WINDOWS, settings.ML_WINDOW_POOLING
+            ],
+            # Cached entries include the translation, so its provider and settings are part of the key
+            "translation": [
+                INDICTRANS2_PROVIDER, settings.GROQ_MODEL, settings.TRANSLATION_MEMORY_VERSION,
+                settings.TRANSLATION_MAX_OUTPUT_TOKENS, settings.TRANSLATION_MAX_SENTENCE_TOKENS,
+                settings.TRANSLATION_MAX_DOCUMENT_TOKENS
+            ],
+            "paths": {},
+        }
+        paths = [
+            settings.SENTIMENT_MODEL_PATH, settings.DEPARTMENT_MODEL_PATH,
+            settings.SENTIMENT_LABEL_ENCODER_PATH, settings.DEPARTMENT_LABEL_ENCODER_PATH
+        ]
+        if settings.ML_INFERENCE_BACKEND == "onnxruntime":
+            paths.append(settings.ML_ONNX_DIR)
+        for path in paths:
+            payload["paths"][path] = file_signature(path)
+
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# Global instance
+analysis_cache = AnalysisCache()
@@ -0,0 +1,286 @@
+"""
+Bulk URL ingestion.
+
+A batch of URLs is deduplicated by canonical URL, then fetched concurrently
+under a global limit and a per-host limit with a crawl delay. Extracted
+articles go through a bounded queue to a small pool of analysis workers, so
+fetching keeps going while earlier articles are being classified (and the
+ML batcher gets several texts per forward pass). Results are kept per batch
+for polling, and can be streamed as they complete.
+"""
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import logging
+import time
+import uuid
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.http_fetcher import FetchError
+from app.services.processing_pipeline import news_pipeline
+from app.services.scraper_service import scraper_service
+from app.services.url_canonicalizer import canonical_url, url_host
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class HostLimiter:
+    """
+    Politeness per host: at most `concurrency` requests in flight, and request
+    starts spaced at least `delay` seconds apart. Hosts with nothing in flight
+    or waiting whose spacing has elapsed are forgotten, so state stays bounded
+    by the hosts currently being crawled.
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.concurrency = max(1, concurrency)
+        self.delay = max(0.0, delay)
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._users: Dict[str, int] = {}  # callers between acquire() and release(), waiters included
+        self._next_prune = 0.0
+
+    async def acquire(self, host: str):
+        self._prune()
+        slot = self._slots.setdefault(host, asyncio.Semaphore(self.concurrency))
+        self._users[host] = self._users.get(host, 0) + 1
+        acquired = False
+        try:
+            await slot.acquire()
+            acquired = True
+            # Reserve the next start time before sleeping so waiters queue up behind each other
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            if acquired:
+                slot.release()
+            self._users[host] -= 1
+            raise
+
+    def release(self, host: str):
+        self._slots[host].release()
+        self._users[host] -= 1
+
+    def _prune(self):
+        """Drop idle hosts, at most once per crawl delay (and second)"""
+        now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + max(1.0, self.delay)
+        for host in [host for host, users in self._users.items() if users == 0]:
+            if self._next_start.get(host, 0.0) <= now:
+                del self._users[host]
+                del self._slots[host]
+                self._next_start.pop(host, None)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class IngestBatch:
+    """One bulk submission: per-URL results in submission order, plus an event stream"""
+
+    def __init__(self, urls: List[str], stream: bool = False):
+        self.id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.duplicates: List[Dict[str, Any]] = []
+        self.events: Optional[asyncio.Queue] = asyncio.Queue() if stream else None
+        self.task: Optional[asyncio.Task] = None
+
+        for url in urls:
+            canonical = canonical_url(url)
+            if canonical in self.results:
+                self.duplicates.append({"url": url, "canonical_url": canonical, "status": "duplicate"})
+                continue
+            self.results[canonical] = {
+                "url": url,
+                "canonical_url": canonical,
+                "status": "queued",
+                "article_id": None,
+                "title": None,
+                "error": None,
+                "seconds": None,
+            }
+        self.pending = len(self.results)
+
+    @property
+    def done(self) -> bool:
+        return self.pending == 0
+
+    def update(self, canonical: str, **fields):
+        result = self.results[canonical]
+        result.update(fields)
+        if fields.get("status") in ("done", "failed"):
+            self.pending -= 1
+            if self.events is not None:
+                self.events.put_nowait(dict(result))
+            if self.done:
+                self.finished_at = time.time()
+                if self.events is not None:
+                    self.events.put_nowait(None)
+
+    def summary(self) -> Dict[str, Any]:
+        statuses = [result["status"] for result in self.results.values()]
+        return {
+            "batch_id": self.id,
+            "status": "done" if self.done else "running",
+            "total": len(self.results) + len(self.duplicates),
+            "unique": len(self.results),
+            "duplicates": len(self.duplicates),
+            "completed": statuses.count("done"),
+            "failed": statuses.count("failed"),
+            "pending": self.pending,
+            "seconds": round((self.finished_at or time.time()) - self.created_at, 3),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.summary(), "results": list(self.results.values()) + self.duplicates}
+
+
+class BulkIngestService:
+    """
+    Runs bulk batches: one fetch task per unique URL (gated by the global
+    and per-host limits) feeding a shared queue drained by analysis workers
+    """
+
+    def __init__(self):
+        self.max_urls = settings.BULK_MAX_URLS
+        self.process_workers = max(1, settings.BULK_PROCESS_WORKERS)
+        self.max_batches = settings.BULK_MAX_BATCHES
+        self.hosts = HostLimiter(settings.BULK_PER_HOST_CONCURRENCY, settings.BULK_CRAWL_DELAY_SECONDS)
+        self.batches: "OrderedDict[str, IngestBatch]" = OrderedDict()
+        self._fetch_slots: Optional[asyncio.Semaphore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats = {"batches": 0, "urls": 0, "duplicates": 0, "fetched": 0, "processed": 0, "failed": 0}
+
+    def _start(self):
+        """Create the loop-bound primitives and analysis workers on first use"""
+        if self._queue is None:
+            self._fetch_slots = asyncio.Semaphore(max(1, settings.BULK_MAX_CONCURRENT_FETCHES))
+            self._queue = asyncio.Queue(maxsize=max(1, settings.BULK_QUEUE_SIZE))
+            self._workers = [
+                asyncio.create_task(self._process_worker(), name=f"bulk-process-{i}")
+                for i in range(self.process_workers)
+            ]
+            logger.info(f"✓ Bulk ingestion started: {self.process_workers} analysis workers")
+
+    def submit(self, urls: List[str], stream: bool = False) -> IngestBatch:
+        """Register a batch and start fetching; returns immediately"""
+        if len(urls) > self.max_urls:
+            raise ValueError(f"A batch can hold at most {self.max_urls} URLs, got {len(urls)}")
+        self._start()
+
+        batch = IngestBatch(urls, stream=stream)
+        self._remember(batch)
+        self.stats["batches"] += 1
+        self.stats["urls"] += len(urls)
+        self.stats["duplicates"] += len(batch.duplicates)
+        logger.info(f"Bulk batch {batch.id}: {len(batch.results)} URLs ({len(batch.duplicates)} duplicates dropped)")
+
+        if batch.done:
+            batch.finished_at = time.time()
+            if batch.events is not None:
+                batch.events.put_nowait(None)
+        batch.task = asyncio.create_task(self._run(batch))
+        return batch
+
+    def get(self, batch_id: str) -> Optional[IngestBatch]:
+        return self.batches.get(batch_id)
+
+    async def stream(self, batch: IngestBatch) -> AsyncIterator[Dict[str, Any]]:
+        """Per-URL results as they complete (duplicates first), then the batch summary"""
+        for duplicate in batch.duplicates:
+            yield duplicate
+        while True:
+            result = await batch.events.get()
+            if result is None:
+                break
+            yield result
+        yield batch.summary()
+
+    def _remember(self, batch: IngestBatch):
+        self.batches[batch.id] = batch
+        # Forget the oldest finished batches beyond the retention limit
+        for batch_id in list(self.batches):
+            if len(self.batches) <= self.max_batches:
+                break
+            if self.batches[batch_id].done:
+                del self.batches[batch_id]
+
+    async def _run(self, batch: IngestBatch):
+        await asyncio.gather(*(self._fetch(batch, canonical) for canonical in list(batch.results)))
+
+    async def _fetch(self, batch: IngestBatch, canonical: str):
+        url = batch.results[canonical]["url"]
+        host = url_host(canonical)
+        started = time.perf_counter()
+
+        await self.hosts.acquire(host)
+        try:
+            async with self._fetch_slots:
+                batch.update(canonical, status="fetching")
+                extracted = await scraper_service.extract_from_url(url)
+        except (FetchError, ValueError) as e:
+            self.stats["failed"] += 1
+            batch.update(canonical, status="failed", error=str(e), seconds=round(time.perf_counter() - started, 3))
+            return
+        except Exception as e:
+            logger.error(f"Bulk fetch of {url} failed: {e}")
+            self.stats["failed"] += 1
+            batch.update(canonical, status="failed", error=f"{type(e).__name__}: {e}",
+                         seconds=round(time.perf_counter() - started, 3))
+            return
+        finally:
+            self.hosts.release(host)
+
+        self.stats["fetched"] += 1
+        batch.update(canonical, status="extracted", title=extracted.get("title"))
+        # Blocks when analysis falls behind, which throttles fetching
+        await self._queue.put((batch, canonical, extracted, started))
+
+    async def _process_worker(self):
+        while True:
+            batch, canonical, extracted, started = await self._queue.get()
+            url = batch.results[canonical]["url"]
+            batch.update(canonical, status="processing")
+            db = SessionLocal()
+            try:
+                article = await news_pipeline.process_extracted(url, extracted, db)
+                self.stats["processed"] += 1
+                batch.update(canonical, status="done", article_id=article.id,
+                             seconds=round(time.perf_counter() - started, 3))
+            except Exception as e:
+                logger.error(f"Bulk processing of {url} failed: {e}")
+                self.stats["failed"] += 1
+                batch.update(canonical, status="failed", error=f"{type(e).__name__}: {e}",
+                             seconds=round(time.perf_counter() - started, 3))
+            finally:
+                db.close()
+                self._queue.task_done()
+
+    async def shutdown(self):
+        tasks = self._workers + [batch.task for batch in self.batches.values() if batch.task and not batch.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "running_batches": sum(1 for batch in self.batches.values() if not batch.done),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "tracked_hosts": len(self.hosts),
+        }
+
+
+# Global instance
+bulk_ingest = BulkIngestService()
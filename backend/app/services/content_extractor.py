@@ -0,0 +1,286 @@
+"""
+Article extraction on lxml.
+
+The page is parsed once by libxml2, boilerplate elements are dropped at C
+level, and a single walk over the tree accumulates text length and link
+text length bottom-up. Every paragraph-like element scores its parent (and
+half its grandparent) by its length, if it isn't mostly link text. The best
+container, weighted by link density and a class/id hint checked once per
+candidate, is taken as the body, plus any sibling blocks that score
+comparably. Title, authors and date come from meta tags, JSON-LD and
+byline markup via XPath.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import re
+
+from dateutil import parser as date_parser
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+HTML_PARSER = lxml_html.HTMLParser(remove_comments=True, remove_pis=True, no_network=True, encoding="utf-8")
+
+# Never part of the article text
+BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "svg", "iframe", "object", "embed",
+    "form", "button", "select", "textarea", "nav", "footer", "aside",
+)
+PARAGRAPH_TAGS = {"p", "pre", "blockquote", "li", "h2", "h3", "h4", "td", "dd"}
+# Containers whose own loose text counts as a paragraph (<br>-separated layouts)
+LOOSE_TEXT_TAGS = {"div", "section", "article", "main", "td", "span", "font"}
+
+MIN_PARAGRAPH_CHARS = 25
+MAX_PARAGRAPH_LINK_DENSITY = 0.5
+SIBLING_SCORE_RATIO = 0.25
+
+POSITIVE_HINT = re.compile(r"article|body|content|entry|main|post|story|text|blog", re.IGNORECASE)
+NEGATIVE_HINT = re.compile(
+    r"comment|related|share|social|sidebar|footer|header|promo|advert|\bads?\b|ad-|banner|widget|"
+    r"nav|menu|subscribe|newsletter|popup|cookie|breadcrumb|tags|recommend",
+    re.IGNORECASE
+)
+BYLINE_PREFIX = re.compile(r"^\s*(by|from|written by|reported by|द्वारा)\s*[:\-]?\s*", re.IGNORECASE)
+TITLE_SEPARATORS = re.compile(r"\s+[|\-–—»]\s+")
+
+TITLE_XPATHS = (
+    "//meta[@property='og:title']/@content",
+    "//meta[@name='twitter:title']/@content",
+)
+AUTHOR_META_XPATHS = (
+    "//meta[@name='author']/@content",
+    "//meta[@property='article:author']/@content",
+    "//meta[@name='byl']/@content",
+    "//meta[@name='dc.creator' or @name='DC.creator']/@content",
+)
+AUTHOR_MARKUP_XPATH = (
+    "//*[@itemprop='author' or @rel='author' or contains(@class, 'author') or contains(@class, 'byline') "
+    "or contains(@class, 'writer')]"
+)
+DATE_XPATHS = (
+    "//meta[@property='article:published_time']/@content",
+    "//meta[@property='og:published_time']/@content",
+    "//meta[@itemprop='datePublished']/@content",
+    "//meta[@name='pubdate' or @name='publishdate' or @name='publish-date' or @name='date' "
+    "or @name='dc.date' or @name='DC.date.issued' or @name='sailthru.date']/@content",
+    "//*[@itemprop='datePublished']/@datetime",
+    "//time[@datetime]/@datetime",
+)
+ARTICLE_TYPES = {"article", "newsarticle", "reportagenewsarticle", "blogposting", "analysisnewsarticle", "report"}
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join(text.split()) if text else ""
+
+
+def _first(root, xpaths: Tuple[str, ...]) -> Optional[str]:
+    for xpath in xpaths:
+        for value in root.xpath(xpath):
+            value = _normalize(str(value))
+            if value:
+                return value
+    return None
+
+
+def _parse_date(value: Optional[str]):
+    if not value:
+        return None
+    try:
+        return date_parser.parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def _json_ld_article(root) -> Dict[str, Any]:
+    """First schema.org article object in the page's JSON-LD, if any"""
+    for script in root.xpath("//script[@type='application/ld+json']/text()"):
+        try:
+            data = json.loads(script)
+        except ValueError:
+            continue
+        candidates = data if isinstance(data, list) else [data]
+        while candidates:
+            node = candidates.pop(0)
+            if not isinstance(node, dict):
+                continue
+            candidates.extend(node.get("@graph", []) if isinstance(node.get("@graph"), list) else [])
+            types = node.get("@type", [])
+            types = types if isinstance(types, list) else [types]
+            if any(str(t).lower() in ARTICLE_TYPES for t in types):
+                return node
+    return {}
+
+
+def _json_ld_authors(article: Dict[str, Any]) -> List[str]:
+    authors = article.get("author") or []
+    authors = authors if isinstance(authors, list) else [authors]
+    names = []
+    for author in authors:
+        name = author.get("name") if isinstance(author, dict) else author
+        if isinstance(name, str):
+            names.append(name)
+    return names
+
+
+def _clean_authors(candidates: List[str]) -> List[str]:
+    authors = []
+    for candidate in candidates:
+        candidate = BYLINE_PREFIX.sub("", _normalize(candidate))
+        # "Jane Doe and John Roe", "Jane Doe, John Roe"
+        for name in re.split(r"\s*(?:,|\band\b|&|\|)\s*", candidate):
+            name = name.strip(" .")
+            if (
+                2 < len(name) <= 60 and "://" not in name and not any(ch.isdigit() for ch in name)
+                and len(name.split()) <= 5 and name.lower() not in (a.lower() for a in authors)
+            ):
+                authors.append(name)
+    return authors[:5]
+
+
+def _clean_title(title: Optional[str], h1: Optional[str]) -> Optional[str]:
+    """Strip a trailing " | Site name" from a document title (kept when it is the headline itself)"""
+    if not title or (h1 and title == h1):
+        return title
+    if h1 and h1 in title:
+        return h1
+    parts = TITLE_SEPARATORS.split(title)
+    if len(parts) > 1 and len(parts[-1].split()) <= 5 and len(parts[-1]) < len(title) / 2:
+        return title[:title.rindex(parts[-1])].rstrip(" |-–—»")
+    return title
+
+
+class ContentExtractor:
+    """Single-pass text/link density extractor; see the module docstring"""
+
+    def extract(self, html: str, url: str) -> Dict[str, Any]:
+        """
+        Extract article fields from HTML
+        Returns: dict with title, content, authors, published_date, top_image, source_url
+        """
+        # Already decoded: hand libxml2 UTF-8 bytes so a <meta charset> can't mislead it
+        root = lxml_html.document_fromstring(html.encode("utf-8"), parser=HTML_PARSER)
+
+        # Metadata first: JSON-LD lives in <script>, bylines often in <header>/<aside>
+        ld = _json_ld_article(root)
+        headings = root.xpath("//h1")
+        h1 = _normalize(headings[0].text_content()) if headings else None
+        # og:title / JSON-LD headline, else the page's <h1>, else <title> without the site name
+        title = _clean_title(_first(root, TITLE_XPATHS) or _normalize(ld.get("headline")), h1)
+        title = title or h1 or _clean_title(_first(root, ("//title/text()",)), None)
+
+        authors = _clean_authors(
+            [value for xpath in AUTHOR_META_XPATHS for value in root.xpath(xpath) if "://" not in value]
+            + _json_ld_authors(ld)
+        )
+        if not authors:
+            authors = _clean_authors([
+                element.text_content() for element in root.xpath(AUTHOR_MARKUP_XPATH)
+                if element.tag not in ("html", "body", "meta", "link")
+            ])
+
+        published = _parse_date(_first(root, DATE_XPATHS[:4]) or ld.get("datePublished") or _first(root, DATE_XPATHS[4:]))
+        top_image = _first(root, ("//meta[@property='og:image']/@content",))
+        if not top_image and isinstance(ld.get("image"), (str, dict)):
+            top_image = ld["image"] if isinstance(ld["image"], str) else ld["image"].get("url")
+
+        etree.strip_elements(root, *BOILERPLATE_TAGS, with_tail=False)
+        content = self._extract_body(root)
+
+        return {
+            "title": title or "No title",
+            "content": content,
+            "authors": authors,
+            "published_date": published,
+            "top_image": top_image,
+            "source_url": url,
+        }
+
+    def _extract_body(self, root) -> str:
+        # Per element: [chars, link chars, score]; paragraphs keep theirs for the output pass
+        stack: List[List[float]] = []
+        paragraphs: Dict[Any, Tuple[int, int]] = {}
+        candidates: Dict[Any, List[float]] = {}
+
+        for event, element in etree.iterwalk(root, events=("start", "end")):
+            if event == "start":
+                stack.append([len(_normalize(element.text)), 0, 0.0, len(_normalize(element.text))])
+                continue
+
+            chars, links, score, loose = stack.pop()
+            tag = element.tag if isinstance(element.tag, str) else ""
+            if tag == "a":
+                links = chars
+            tail = len(_normalize(element.tail))
+            if stack:
+                parent = stack[-1]
+                parent[0] += chars + tail
+                parent[1] += links
+                parent[3] += tail
+
+            paragraph_chars = chars if tag in PARAGRAPH_TAGS else loose if tag in LOOSE_TEXT_TAGS else 0
+            if paragraph_chars < MIN_PARAGRAPH_CHARS or links > MAX_PARAGRAPH_LINK_DENSITY * max(chars, 1):
+                if score:
+                    candidates[element] = [score, chars, links]
+                continue
+
+            points = 1 + min(3.0, paragraph_chars / 100)
+            if tag in PARAGRAPH_TAGS:
+                paragraphs[element] = (chars, links)
+                if stack:
+                    stack[-1][2] += points
+                    if len(stack) > 1:
+                        stack[-2][2] += points / 2
+            else:
+                # Loose text makes the container itself a paragraph holder
+                score += points
+            if score:
+                candidates[element] = [score, chars, links]
+
+        if not candidates:
+            return ""
+
+        def weighted(element, stats) -> float:
+            score, chars, links = stats
+            hint = f"{element.get('class', '')} {element.get('id', '')}"
+            if POSITIVE_HINT.search(hint):
+                score *= 1.25
+            if NEGATIVE_HINT.search(hint):
+                score *= 0.5
+            return score * (1 - links / max(chars, 1))
+
+        scored = {element: weighted(element, stats) for element, stats in candidates.items()}
+        best = max(scored, key=scored.get)
+
+        blocks = [best]
+        parent = best.getparent()
+        if parent is not None:
+            threshold = scored[best] * SIBLING_SCORE_RATIO
+            blocks = [
+                sibling for sibling in parent
+                if sibling is best or scored.get(sibling, 0) >= threshold
+            ]
+        return "\n".join(line for block in blocks for line in self._block_text(block, paragraphs))
+
+    @staticmethod
+    def _block_text(block, paragraphs: Dict[Any, Tuple[int, int]]) -> List[str]:
+        lines = []
+        taken = set()
+        for element in block.iter():
+            if element not in paragraphs:
+                continue
+            ancestor = element.getparent()
+            while ancestor is not None and ancestor is not block and ancestor not in taken:
+                ancestor = ancestor.getparent()
+            if ancestor is not None and ancestor in taken:
+                continue
+            taken.add(element)
+            lines.append(_normalize(element.text_content()))
+        if not lines:
+            # <br>-separated text straight in the container
+            lines = [line for line in (_normalize(part) for part in block.itertext()) if len(line) >= MIN_PARAGRAPH_CHARS]
+        return lines
+
+
+# Global instance
+content_extractor = ContentExtractor()
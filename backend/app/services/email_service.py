@@ -5,7 +5,7 @@ import logging
 from typing import Dict
 from app.config import get_settings
 from datetime import datetime
-from groq import Groq
+from app.services.llm_client import llm_client, LLMUnavailable
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -21,7 +21,6 @@ class EmailAlertService:
         self.smtp_password = settings.SMTP_PASSWORD
         self.from_email = settings.ALERT_EMAIL_FROM
         self.to_email = settings.ALERT_EMAIL_TO
-        self.groq_client = None
     
     async def send_alert(self, article_data: Dict) -> bool:
         """
@@ -77,11 +76,9 @@ class EmailAlertService:
         Use Groq to generate a summary explaining why the news is negative
         """
         try:
-            if not self.groq_client:
-                if not settings.GROQ_API_KEY:
-                    logger.warning("GROQ_API_KEY not configured, skipping AI summary")
-                    return "AI summary unavailable (Groq API key not configured)"
-                self.groq_client = Groq(api_key=settings.GROQ_API_KEY)
+            if not llm_client.configured:
+                logger.warning("GROQ_API_KEY not configured, skipping AI summary")
+                return "AI summary unavailable (Groq API key not configured)"
             
             content = article_data.get('content', '')[:2000]
             title = article_data.get('title', 'No Title')
@@ -95,17 +92,13 @@ Content:
 
 Provide a concise explanation of why this news is negative:"""
             
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.3,
-                max_tokens=200
-            )
-            
-            summary = response.choices[0].message.content.strip()
+            summary = await llm_client.chat(prompt, temperature=0.3, max_tokens=200)
             logger.info("✓ Generated negative sentiment summary using Groq")
             return summary
             
+        except LLMUnavailable as e:
+            logger.warning(f"Skipping negative summary: {e}")
+            return "AI summary unavailable (Groq is temporarily unreachable)."
         except Exception as e:
             logger.error(f"Failed to generate negative summary: {e}")
             return "Unable to generate AI summary at this time."
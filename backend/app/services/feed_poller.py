@@ -0,0 +1,421 @@
+"""
+Scheduled ingestion from RSS/Atom feeds and news sitemaps.
+
+Each configured feed has a row in feed_state with its conditional-GET
+validators, a high-water mark (newest item date seen), the ids of recently
+seen items (for undated entries) and an adaptive polling interval derived
+from how often the feed publishes. Due feeds are polled on a timer; only
+items past the high-water mark are handed to bulk ingestion, which fetches,
+dedupes and analyzes them like a bulk URL submission.
+"""
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import gzip
+import json
+import logging
+import os
+
+from lxml import etree
+
+from app.config import get_settings
+from app.database import Base, SessionLocal
+from app.services.http_fetcher import http_fetcher
+from app.services.http_cache import http_cache
+from app.services.url_canonicalizer import canonical_url
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Feeds are untrusted XML: no entity expansion, no network access, tolerate sloppy markup
+XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, recover=True, huge_tree=False)
+
+
+class FeedState(Base):
+    """Polling state of one feed or sitemap (all times are naive UTC)"""
+    __tablename__ = "feed_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(1000), nullable=False, unique=True, index=True)
+    kind = Column(String(20))  # rss | atom | sitemap | sitemapindex
+    enabled = Column(Boolean, default=True)
+    etag = Column(String(500))
+    last_modified = Column(String(100))
+    high_water_mark = Column(DateTime)  # newest item date ingested
+    seen_ids = Column(Text)  # JSON list of recent item ids, newest first
+    items_per_hour = Column(Float)  # smoothed publish rate
+    poll_interval_seconds = Column(Float)
+    next_poll_at = Column(DateTime, index=True)
+    last_polled_at = Column(DateTime)
+    last_new_items = Column(Integer, default=0)
+    total_items = Column(Integer, default=0)
+    consecutive_failures = Column(Integer, default=0)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+def _localname(element) -> str:
+    return etree.QName(element).localname.lower() if isinstance(element.tag, str) else ""
+
+
+def _child_text(element, *names: str) -> Optional[str]:
+    for child in element:
+        if _localname(child) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) to naive UTC"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_feed(content: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Parse an RSS, Atom, sitemap or sitemap index document
+    Returns: (kind, items) with items as {id, link, published}; for a sitemap
+    index the items are child sitemaps
+    """
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    root = etree.fromstring(content, parser=XML_PARSER)
+    if root is None:
+        raise ValueError("Not an XML document")
+
+    kind = _localname(root)
+    items = []
+    if kind in ("rss", "rdf"):
+        for item in root.iter():
+            if _localname(item) != "item":
+                continue
+            link = _child_text(item, "link")
+            items.append({
+                "id": _child_text(item, "guid") or link,
+                "link": link,
+                "published": _parse_date(_child_text(item, "pubdate", "date", "published", "updated")),
+            })
+        return "rss", items
+
+    if kind == "feed":
+        for entry in root:
+            if _localname(entry) != "entry":
+                continue
+            link = None
+            for child in entry:
+                if _localname(child) == "link" and child.get("rel", "alternate") == "alternate":
+                    link = child.get("href")
+                    break
+            items.append({
+                "id": _child_text(entry, "id") or link,
+                "link": link,
+                "published": _parse_date(_child_text(entry, "published", "updated")),
+            })
+        return "atom", items
+
+    if kind in ("urlset", "sitemapindex"):
+        entry_name = "url" if kind == "urlset" else "sitemap"
+        for entry in root:
+            if _localname(entry) != entry_name:
+                continue
+            link = _child_text(entry, "loc")
+            published = None
+            for child in entry.iter():
+                # news:publication_date beats lastmod (which moves on every edit)
+                if _localname(child) == "publication_date" and child.text:
+                    published = _parse_date(child.text.strip())
+                    break
+            items.append({
+                "id": link,
+                "link": link,
+                "published": published or _parse_date(_child_text(entry, "lastmod")),
+            })
+        return ("sitemap" if kind == "urlset" else "sitemapindex"), items
+
+    raise ValueError(f"Unsupported feed document <{kind}>")
+
+
+class FeedPoller:
+    """
+    Polls due feeds on a timer and hands new items to bulk ingestion.
+
+    Intervals adapt per feed: the publish rate is measured from item dates
+    (falling back to a smoothed count of new items per hour for undated
+    feeds) and the next poll is scheduled for when about
+    FEED_TARGET_ITEMS_PER_POLL new items are expected, within the min/max
+    bounds. Failing feeds back off exponentially.
+    """
+
+    def __init__(self):
+        self.enabled = settings.FEED_POLLER_ENABLED
+        self.tick_seconds = settings.FEED_TICK_SECONDS
+        self.min_interval = settings.FEED_MIN_INTERVAL_SECONDS
+        self.max_interval = max(self.min_interval, settings.FEED_MAX_INTERVAL_SECONDS)
+        self.default_interval = settings.FEED_DEFAULT_INTERVAL_SECONDS
+        self.target_items = max(0.1, settings.FEED_TARGET_ITEMS_PER_POLL)
+        self.max_items = settings.FEED_MAX_ITEMS_PER_POLL
+        self.seen_ids_limit = settings.FEED_SEEN_IDS
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"polls": 0, "not_modified": 0, "failed": 0, "new_items": 0, "batches": 0}
+
+    def configured_feeds(self) -> List[str]:
+        urls = [url.strip() for url in settings.FEED_URLS.split(",") if url.strip()]
+        if settings.FEED_LIST_PATH and os.path.exists(settings.FEED_LIST_PATH):
+            with open(settings.FEED_LIST_PATH, encoding="utf-8") as f:
+                urls += [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+        return list(dict.fromkeys(urls))
+
+    def add_feed(self, url: str, db) -> FeedState:
+        """Register a feed (idempotent); it is polled on the next tick"""
+        feed = db.query(FeedState).filter(FeedState.url == url).first()
+        if feed is None:
+            feed = FeedState(url=url, poll_interval_seconds=self.default_interval, next_poll_at=datetime.utcnow())
+            db.add(feed)
+            db.commit()
+            db.refresh(feed)
+            logger.info(f"Registered feed {url}")
+        return feed
+
+    def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        db = SessionLocal()
+        try:
+            for url in self.configured_feeds():
+                self.add_feed(url, db)
+        finally:
+            db.close()
+        self._slots = asyncio.Semaphore(max(1, settings.FEED_MAX_CONCURRENT_POLLS))
+        self._task = asyncio.create_task(self._run(), name="feed-poller")
+        logger.info(f"✓ Feed poller started (checking every {self.tick_seconds:.0f}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        from app.services.model_executor import model_executor
+
+        while True:
+            try:
+                # New items are analyzed right away, so wait for the models
+                if model_executor.models_ready():
+                    await self.poll_due()
+            except Exception as e:
+                logger.error(f"Feed poller tick failed: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def poll_due(self) -> int:
+        """Poll every enabled feed whose next_poll_at has passed; returns the number polled"""
+        db = SessionLocal()
+        try:
+            due = [
+                feed_id for (feed_id,) in db.query(FeedState.id).filter(
+                    FeedState.enabled == True,  # noqa: E712 (SQL expression)
+                    FeedState.next_poll_at <= datetime.utcnow()
+                ).order_by(FeedState.next_poll_at).all()
+            ]
+        finally:
+            db.close()
+        await asyncio.gather(*(self._poll_with_slot(feed_id) for feed_id in due))
+        return len(due)
+
+    async def _poll_with_slot(self, feed_id: int):
+        async with self._slots:
+            db = SessionLocal()
+            try:
+                await self.poll(db.get(FeedState, feed_id), db)
+            finally:
+                db.close()
+
+    async def poll(self, feed: FeedState, db) -> List[str]:
+        """Fetch one feed conditionally, enqueue its new items and reschedule it; returns the enqueued links"""
+        now = datetime.utcnow()
+        self.stats["polls"] += 1
+        try:
+            page = await http_fetcher.fetch(feed.url, headers=http_cache.conditional_headers(
+                {"etag": feed.etag, "last_modified": feed.last_modified}
+            ))
+            backlog = False
+            if page["status_code"] == 304:
+                self.stats["not_modified"] += 1
+                new_items = []
+            else:
+                feed.kind, items = parse_feed(page["content"])
+                if feed.kind == "sitemapindex":
+                    items = await self._child_sitemap_items(feed, items)
+                new_items, backlog = self._new_items(feed, items, now)
+                feed.etag = page["headers"].get("etag")
+                feed.last_modified = page["headers"].get("last-modified")
+                self._update_rate(feed, items, new_items, now)
+            feed.consecutive_failures = 0
+            feed.last_error = None
+        except Exception as e:
+            # Anything (a truncated gzip raises EOFError) must still reschedule the feed
+            self.stats["failed"] += 1
+            feed.consecutive_failures = (feed.consecutive_failures or 0) + 1
+            feed.last_error = f"{type(e).__name__}: {e}"[:1000]
+            logger.warning(f"Polling feed {feed.url} failed ({feed.consecutive_failures}x): {feed.last_error}")
+            new_items, backlog = [], False
+
+        links = [item["link"] for item in new_items]
+        if links:
+            self._enqueue(feed, links)
+        feed.last_polled_at = now
+        feed.last_new_items = len(links)
+        feed.total_items = (feed.total_items or 0) + len(links)
+        interval = self._next_interval(feed)
+        # Items left over by FEED_MAX_ITEMS_PER_POLL are picked up on a quick follow-up poll
+        feed.next_poll_at = now + timedelta(seconds=self.min_interval if backlog else interval)
+        db.commit()
+        return links
+
+    async def _child_sitemap_items(self, feed: FeedState, sitemaps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Items of the child sitemaps changed since the high-water mark (newest first, capped)"""
+        changed = [
+            sitemap for sitemap in sitemaps
+            if sitemap["link"] and (feed.high_water_mark is None or sitemap["published"] is None
+                                    or sitemap["published"] >= feed.high_water_mark)
+        ]
+        changed.sort(key=lambda sitemap: sitemap["published"] or datetime.min, reverse=True)
+        items = []
+        for sitemap in changed[:settings.FEED_MAX_CHILD_SITEMAPS]:
+            try:
+                page = await http_fetcher.fetch(sitemap["link"])
+                kind, child_items = parse_feed(page["content"])
+                if kind == "sitemap":
+                    items += child_items
+            except Exception as e:
+                logger.warning(f"Child sitemap {sitemap['link']} of {feed.url} failed: {e}")
+        return items
+
+    def _new_items(self, feed: FeedState, items: List[Dict[str, Any]], now: datetime) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Unseen items dated at or after the high-water mark (or undated), newest
+        first. Items sharing the mark's timestamp (date-only sitemaps) are told
+        apart by seen_ids. A feed's first poll only takes the last
+        FEED_INITIAL_LOOKBACK_HOURS. Beyond FEED_MAX_ITEMS_PER_POLL the oldest
+        items are kept and the mark stops there, so the rest come next poll
+        Returns: (new items, whether some were left for the next poll)
+        """
+        seen = json.loads(feed.seen_ids) if feed.seen_ids else []
+        seen_set = set(seen)
+        if feed.high_water_mark is not None:
+            cutoff = feed.high_water_mark
+        elif feed.seen_ids is None:
+            cutoff = now - timedelta(hours=settings.FEED_INITIAL_LOOKBACK_HOURS)
+        else:
+            cutoff = None
+
+        new_items, skipped, links = [], [], set()
+        for item in sorted(items, key=lambda item: item["published"] or datetime.min, reverse=True):
+            if not item["link"] or item["id"] in seen_set:
+                continue
+            link = canonical_url(item["link"])
+            if link in links:
+                continue
+            if item["published"] is not None and cutoff is not None and item["published"] < cutoff:
+                continue
+            if item["published"] is None and feed.seen_ids is None and feed.high_water_mark is None:
+                # Undated item on the first poll: remember it, don't backfill it
+                skipped.append(item["id"])
+                continue
+            links.add(link)
+            new_items.append(item)
+        backlog = len(new_items) > self.max_items
+        new_items = new_items[-self.max_items:] if self.max_items > 0 else []
+
+        dated = [item["published"] for item in new_items if item["published"] is not None]
+        if dated:
+            feed.high_water_mark = max(dated + ([feed.high_water_mark] if feed.high_water_mark else []))
+        elif feed.high_water_mark is None:
+            # Nothing new on the first poll: start from the newest date in the feed
+            all_dated = [item["published"] for item in items if item["published"] is not None]
+            feed.high_water_mark = max(all_dated) if all_dated else None
+            skipped += [item["id"] for item in items if all_dated and item["published"] == feed.high_water_mark]
+        seen = [item["id"] for item in new_items] + skipped + seen
+        feed.seen_ids = json.dumps(list(dict.fromkeys(seen))[:self.seen_ids_limit])
+        return new_items, backlog
+
+    def _update_rate(self, feed: FeedState, items: List[Dict[str, Any]], new_items: List[Dict[str, Any]], now: datetime):
+        """
+        Publish rate in items/hour: from item dates over the last day when the
+        feed has them, else new items since the last poll; smoothed
+        """
+        window_start = now - timedelta(hours=24)
+        recent = [item for item in items if item["published"] is not None and item["published"] >= window_start]
+        if recent:
+            # Span covered by the recent items (a short feed may list only the last few hours)
+            oldest = min(item["published"] for item in recent)
+            hours = max(1.0, (now - oldest).total_seconds() / 3600)
+            observed = len(recent) / hours
+        elif any(item["published"] is not None for item in items):
+            observed = 0.0
+        elif feed.last_polled_at is not None:
+            hours = max(1 / 60, (now - feed.last_polled_at).total_seconds() / 3600)
+            observed = len(new_items) / hours
+        else:
+            return
+        previous = feed.items_per_hour
+        feed.items_per_hour = observed if previous is None else 0.5 * observed + 0.5 * previous
+
+    def _next_interval(self, feed: FeedState) -> float:
+        if feed.consecutive_failures:
+            interval = self.default_interval * (2 ** min(feed.consecutive_failures - 1, 6))
+        elif feed.items_per_hour:
+            interval = self.target_items / feed.items_per_hour * 3600
+        else:
+            # Quiet feed: back off gradually
+            interval = (feed.poll_interval_seconds or self.default_interval) * 1.5
+        feed.poll_interval_seconds = min(self.max_interval, max(self.min_interval, interval))
+        return feed.poll_interval_seconds
+
+    def _enqueue(self, feed: FeedState, links: List[str]):
+        from app.services.bulk_ingest import bulk_ingest
+
+        for start in range(0, len(links), bulk_ingest.max_urls):
+            bulk_ingest.submit(links[start:start + bulk_ingest.max_urls])
+            self.stats["batches"] += 1
+        self.stats["new_items"] += len(links)
+        logger.info(f"Feed {feed.url}: {len(links)} new items queued for ingestion")
+
+    def list_feeds(self, db) -> List[Dict[str, Any]]:
+        return [
+            {
+                "url": feed.url,
+                "kind": feed.kind,
+                "enabled": feed.enabled,
+                "high_water_mark": feed.high_water_mark,
+                "items_per_hour": round(feed.items_per_hour, 3) if feed.items_per_hour is not None else None,
+                "poll_interval_seconds": round(feed.poll_interval_seconds or 0),
+                "next_poll_at": feed.next_poll_at,
+                "last_polled_at": feed.last_polled_at,
+                "last_new_items": feed.last_new_items,
+                "total_items": feed.total_items,
+                "consecutive_failures": feed.consecutive_failures,
+                "last_error": feed.last_error,
+            }
+            for feed in db.query(FeedState).order_by(FeedState.url).all()
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "running": self._task is not None, **self.stats}
+
+
+# Global instance
+feed_poller = FeedPoller()
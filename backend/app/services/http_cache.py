@@ -0,0 +1,187 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class HTTPCache:
+    """
+    On-disk revalidation cache for scraped pages.
+
+    Per canonical URL it keeps the response validators (ETag, Last-Modified),
+    a hash of the body and the extraction result. A resubmitted URL is
+    fetched with If-None-Match / If-Modified-Since; a 304 (or an identical
+    body from a server without validators) reuses the stored extraction
+    instead of downloading and parsing the page again.
+    """
+
+    def __init__(self):
+        self.enabled = settings.HTTP_CACHE_ENABLED
+        self.path = settings.HTTP_CACHE_PATH
+        self.max_entries = max(0, settings.HTTP_CACHE_MAX_ENTRIES)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"lookups": 0, "revalidated": 0, "unchanged_body": 0, "changed": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+    @staticmethod
+    def body_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached entry for a canonical URL, or None when missing or stored by
+        a different extractor version
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self.stats["lookups"] += 1
+            try:
+                row = self._connection().execute(
+                    "SELECT etag, last_modified, body_hash, canonical_url, extraction, version FROM responses WHERE url = ?",
+                    (url,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.stats["errors"] += 1
+                logger.error(f"HTTP cache lookup failed: {e}")
+                return None
+        if row is None or row[5] != version:
+            return None
+
+        etag, last_modified, body_hash, canonical_url, extraction, _ = row
+        extraction = json.loads(extraction)
+        if extraction.get("published_date"):
+            extraction["published_date"] = datetime.fromisoformat(extraction["published_date"])
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body_hash": body_hash,
+            "canonical_url": canonical_url,
+            "extraction": extraction,
+        }
+
+    def put(self, url: str, page: Dict[str, Any], extraction: Dict[str, Any], version: str):
+        """Store validators, body hash and extraction for a freshly fetched page"""
+        if not self.enabled:
+            return
+        headers = page.get("headers", {})
+        stored = {
+            **extraction,
+            "published_date": extraction["published_date"].isoformat() if extraction.get("published_date") else None
+        }
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, etag, last_modified, body_hash, canonical_url, extraction, version, fetched_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url, headers.get("etag"), headers.get("last-modified"), self.body_hash(page["content"]),
+                        extraction.get("canonical_url"), json.dumps(stored, default=str), version, now, now
+                    )
+                )
+                if self.max_entries:
+                    cursor = conn.execute(
+                        "DELETE FROM responses WHERE url IN ("
+                        "  SELECT url FROM responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?"
+                        ")",
+                        (self.max_entries,)
+                    )
+                    self.stats["evictions"] += max(0, cursor.rowcount)
+                conn.commit()
+                self.stats["stores"] += 1
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                self.stats["errors"] += 1
+                logger.error(f"HTTP cache store failed: {e}")
+
+    def touch(self, url: str, page: Dict[str, Any]):
+        """Mark an entry as revalidated, taking any new validators the server sent"""
+        if not self.enabled:
+            return
+        headers = page.get("headers", {})
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "UPDATE responses SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                    "fetched_at = ?, last_used_at = ? WHERE url = ?",
+                    (headers.get("etag"), headers.get("last-modified"), now, now, url)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                self.stats["errors"] += 1
+                logger.error(f"HTTP cache update failed: {e}")
+
+    def is_unchanged(self, entry: Optional[Dict[str, Any]], page: Dict[str, Any]) -> bool:
+        """304, or the same bytes as last time"""
+        if entry is None:
+            return False
+        if page["status_code"] == 304:
+            self.stats["revalidated"] += 1
+            return True
+        if self.body_hash(page["content"]) == entry["body_hash"]:
+            self.stats["unchanged_body"] += 1
+            return True
+        self.stats["changed"] += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {**self.stats, "enabled": self.enabled}
+        if self.enabled:
+            with self._lock:
+                try:
+                    stats["entries"] = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                except sqlite3.Error:
+                    stats["entries"] = 0
+        return stats
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            # WAL lets several API workers share the file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body_hash TEXT NOT NULL,
+                    canonical_url TEXT,
+                    extraction TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    last_used_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used_at)")
+            self._conn.commit()
+        return self._conn
+
+
+# Global instance
+http_cache = HTTPCache()
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import re
+import time
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="text/html; charset=...">
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+class FetchError(Exception):
+    """The page could not be fetched (network error, HTTP error, too large, too slow)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401 (httpx negotiates HTTP/2 only when h2 is installed)
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPFetcher:
+    """
+    Shared async page fetcher for scraping.
+
+    One pooled httpx.AsyncClient (keep-alive per host, HTTP/2 when the h2
+    package is installed) serves every download. Each fetch has connect/read
+    timeouts plus an overall deadline, and the body is streamed with a size
+    cap so a huge or endless response can't exhaust memory.
+    """
+
+    def __init__(self):
+        self.timeout = settings.FETCH_TIMEOUT_SECONDS
+        self.deadline = settings.FETCH_DEADLINE_SECONDS
+        self.max_bytes = settings.FETCH_MAX_BYTES
+        self.http2 = settings.FETCH_HTTP2 and _http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {"fetches": 0, "failed": 0, "too_large": 0, "bytes": 0, "seconds": 0.0}
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                follow_redirects=True,
+                max_redirects=settings.FETCH_MAX_REDIRECTS,
+                headers={
+                    "User-Agent": settings.FETCH_USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                },
+                timeout=httpx.Timeout(self.timeout, connect=settings.FETCH_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.FETCH_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.FETCH_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.FETCH_KEEPALIVE_SECONDS
+                )
+            )
+            logger.info(f"✓ HTTP fetcher ready (HTTP/2 {'on' if self.http2 else 'off'})")
+        return self._client
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        GET a URL, following redirects
+        Returns: dict with url, final_url, status_code, headers, content (bytes),
+        encoding, http_version and seconds
+
+        Raises FetchError on malformed URLs, network errors, HTTP errors
+        (>= 400), bodies over FETCH_MAX_BYTES and fetches exceeding
+        FETCH_DEADLINE_SECONDS
+        """
+        self.stats["fetches"] += 1
+        started = time.perf_counter()
+        try:
+            page = await asyncio.wait_for(self._fetch(url, headers or {}), self.deadline)
+        except asyncio.TimeoutError:
+            self.stats["failed"] += 1
+            raise FetchError(f"Fetching {url} exceeded its {self.deadline:.0f}s deadline")
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            # InvalidURL (malformed URL) is not an HTTPError subclass
+            self.stats["failed"] += 1
+            raise FetchError(f"Fetching {url} failed ({type(e).__name__}: {e})")
+        except FetchError:
+            self.stats["failed"] += 1
+            raise
+
+        page["seconds"] = round(time.perf_counter() - started, 3)
+        self.stats["bytes"] += len(page["content"])
+        self.stats["seconds"] += page["seconds"]
+        return page
+
+    async def _fetch(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        async with self._http().stream("GET", url, headers=headers) as response:
+            if response.status_code >= 400:
+                raise FetchError(f"Fetching {url} returned HTTP {response.status_code}", response.status_code)
+
+            declared = response.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                self.stats["too_large"] += 1
+                raise FetchError(f"{url} is {int(declared)} bytes, over the {self.max_bytes} byte cap")
+
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_bytes:
+                    self.stats["too_large"] += 1
+                    raise FetchError(f"{url} exceeded the {self.max_bytes} byte cap")
+                chunks.append(chunk)
+
+            return {
+                "url": url,
+                "final_url": str(response.url),
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "content": b"".join(chunks),
+                "encoding": response.charset_encoding,
+                "http_version": response.http_version,
+            }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            **self.stats,
+            "seconds": round(self.stats["seconds"], 3)
+        }
+
+
+def decode_html(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Decode an HTML body: the Content-Type charset, else a <meta> charset in
+    the first 2 KB, else UTF-8 (undecodable bytes are replaced)
+    """
+    if not encoding:
+        match = META_CHARSET_PATTERN.search(content[:2048])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+# Global instance
+http_fetcher = HTTPFetcher()
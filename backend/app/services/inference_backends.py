@@ -0,0 +1,108 @@
+from transformers import AutoConfig, AutoModelForSequenceClassification
+import torch
+from types import SimpleNamespace
+from typing import Dict
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_BACKENDS = ("torch", "torch-int8", "onnxruntime")
+
+
+def onnx_model_path(onnx_dir: str, name: str, quantized: bool = False) -> str:
+    """Location of an exported classifier graph, e.g. app/models/onnx/sentiment.int8.onnx"""
+    suffix = ".int8.onnx" if quantized else ".onnx"
+    return os.path.join(onnx_dir, f"{name}{suffix}")
+
+
+class OnnxSequenceClassifier:
+    """
+    ONNX Runtime session that quacks like AutoModelForSequenceClassification
+    for inference: call it with tokenizer encodings, read `.logits` and `.config`
+    """
+
+    def __init__(self, onnx_path: str, model_path: str, num_threads: int = 0):
+        import onnxruntime as ort
+
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(
+                f"ONNX graph not found at {onnx_path}; run `python -m scripts.export_onnx` first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.config = AutoConfig.from_pretrained(model_path)
+        self.onnx_path = onnx_path
+
+    def __call__(self, **encodings: torch.Tensor) -> SimpleNamespace:
+        feed = {
+            name: encodings[name].cpu().numpy().astype("int64")
+            for name in self.input_names
+            if name in encodings
+        }
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self):
+        return self
+
+
+def load_sequence_classifier(model_path: str, name: str, backend: str, device: str,
+                             onnx_dir: str = "", onnx_quantized: bool = False, onnx_threads: int = 0):
+    """
+    Load a sequence classifier for the selected backend:
+    - torch: fp32 PyTorch model (default)
+    - torch-int8: PyTorch model with dynamically quantized Linear layers (CPU only)
+    - onnxruntime: exported ONNX graph, fp32 or int8
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {INFERENCE_BACKENDS}")
+
+    if backend == "onnxruntime":
+        path = onnx_model_path(onnx_dir, name, onnx_quantized)
+        logger.info(f"Loading {name} ONNX graph from {path}")
+        return OnnxSequenceClassifier(path, model_path, onnx_threads)
+
+    # safetensors checkpoints are memory-mapped instead of read and copied
+    use_safetensors = True if has_safetensors(model_path) else None
+    if use_safetensors is None and os.path.isdir(model_path):
+        logger.warning(f"No safetensors weights in {model_path}; run `python -m scripts.convert_safetensors`")
+    model = AutoModelForSequenceClassification.from_pretrained(model_path, use_safetensors=use_safetensors)
+    model.eval()
+
+    if backend == "torch-int8":
+        if device != "cpu":
+            logger.warning(f"torch-int8 runs on CPU only, ignoring device {device} for {name}")
+        return quantize_dynamic_int8(model)
+
+    return model.to(device)
+
+
+def has_safetensors(model_path: str) -> bool:
+    """True when a local model directory ships safetensors weights"""
+    if not os.path.isdir(model_path):
+        return False
+    return any(name.endswith(".safetensors") for name in os.listdir(model_path))
+
+
+def quantize_dynamic_int8(model):
+    """Dynamic int8 quantization of all Linear layers (weights int8, activations quantized on the fly)"""
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def backend_device(backend: str, device: str) -> str:
+    """Device that input tensors must live on for the given backend"""
+    return device if backend == "torch" else "cpu"
+
+
+def describe_backend(backend: str, onnx_quantized: bool) -> Dict[str, str]:
+    """Short description of the active backend for health output"""
+    if backend == "onnxruntime":
+        return {"backend": backend, "precision": "int8" if onnx_quantized else "fp32"}
+    return {"backend": backend, "precision": "int8" if backend == "torch-int8" else "fp32"}
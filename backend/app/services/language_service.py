@@ -1,15 +1,59 @@
-from langdetect import detect, LangDetectException
+from langdetect import detect, detect_langs, DetectorFactory, LangDetectException
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import os
-from groq import Groq
 from app.config import get_settings
+from app.services.translation_engine import translation_engine, split_sentences, join_sentences
+from app.services.translation_memory import translation_memory
+from app.services.translation_worker import translation_worker_client
+from app.services.llm_client import llm_client
 from transformers import pipeline
 import torch
-import re
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+INDICTRANS2_PROVIDER = "hf/indictrans2-indic-en-1B-pipeline"
+GROQ_PROVIDER = "groq/llama-3.3-70b-versatile"
+
+# Make langdetect deterministic (it samples n-grams randomly unless seeded)
+DetectorFactory.seed = 0
+
+# Unicode blocks used by the script histogram: (script, first codepoint, last codepoint)
+SCRIPT_BLOCKS: List[Tuple[str, int, int]] = [
+    ('latin', 0x0041, 0x005A),
+    ('latin', 0x0061, 0x007A),
+    ('latin', 0x00C0, 0x024F),
+    ('arabic', 0x0600, 0x06FF),
+    ('arabic', 0x0750, 0x077F),
+    ('devanagari', 0x0900, 0x097F),
+    ('bengali', 0x0980, 0x09FF),
+    ('gurmukhi', 0x0A00, 0x0A7F),
+    ('gujarati', 0x0A80, 0x0AFF),
+    ('odia', 0x0B00, 0x0B7F),
+    ('tamil', 0x0B80, 0x0BFF),
+    ('telugu', 0x0C00, 0x0C7F),
+    ('kannada', 0x0C80, 0x0CFF),
+    ('malayalam', 0x0D00, 0x0D7F),
+]
+
+# Scripts used by exactly one of our supported languages
+UNAMBIGUOUS_SCRIPTS = {
+    'tamil': 'ta',
+    'telugu': 'te',
+    'kannada': 'kn',
+    'malayalam': 'ml',
+    'bengali': 'bn',
+    'gujarati': 'gu',
+    'gurmukhi': 'pa',
+    'odia': 'or',
+    'arabic': 'ur',
+}
+
+# Candidate languages for scripts that need the statistical model
+DEVANAGARI_LANGUAGES = ('hi', 'mr', 'ne')
+
 
 class LanguageService:
     """Service for language detection and translation"""
@@ -32,34 +76,46 @@ class LanguageService:
             'ur': 'Urdu'
         }
         
-        # IndicTrans2 pipeline and Groq client will be loaded on demand
+        # IndicTrans2 pipeline will be loaded on demand
         self.translator = None
         self.settings = get_settings()
         self.indic_pipeline = None
-        self.groq_client = None
+        # The translation worker process switches this off for itself
+        self.use_translation_worker = self.settings.TRANSLATION_WORKER_ENABLED
         
-        # Indic script regex for detection
-        self.indic_pattern = re.compile(r'[\u0900-\u097F\u0980-\u09FF\u0A00-\u0A7F\u0A80-\u0AFF\u0B00-\u0B7F\u0B80-\u0BFF\u0C00-\u0C7F\u0C80-\u0CFF\u0D00-\u0D7F]')
+        # Script histogram lookup tables (block starts sorted for searchsorted)
+        self.script_names = sorted({name for name, _, _ in SCRIPT_BLOCKS})
+        self._block_starts = np.array([start for _, start, _ in SCRIPT_BLOCKS], dtype=np.uint32)
+        self._block_ends = np.array([end for _, _, end in SCRIPT_BLOCKS], dtype=np.uint32)
+        self._block_script = np.array(
+            [self.script_names.index(name) for name, _, _ in SCRIPT_BLOCKS], dtype=np.int64
+        )
+        self.detection_sample_chars = 2000
+        self.min_script_chars = 10
     
     def detect_language(self, text: str) -> Optional[str]:
         """
         Detect the language of the given text
         Returns: language code (e.g., 'hi', 'en', 'ta')
+        
+        A Unicode script histogram decides directly for scripts that belong to a
+        single language; only Devanagari and Latin text go to langdetect.
         """
         try:
             if not text or len(text.strip()) < 10:
                 logger.warning("Text too short for reliable language detection")
                 return 'en'
             
-            # Check for Indic scripts first
-            if self.indic_pattern.search(text[:500]):
-                # Contains Indic characters, force non-English
-                lang_code = detect(text[:500])
-                if lang_code == 'en':
-                    # Override misdetection - default to Hindi if unsure
-                    lang_code = 'hi'
-                    logger.info(f"Indic script detected but langdetect said 'en', forcing to: {lang_code}")
+            sample = text[:self.detection_sample_chars]
+            script, share = self.dominant_script(sample)
+            
+            if script in UNAMBIGUOUS_SCRIPTS:
+                lang_code = UNAMBIGUOUS_SCRIPTS[script]
+                logger.debug(f"Script histogram: {script} ({share:.0%}) -> {lang_code}")
+            elif script == 'devanagari':
+                lang_code = self._detect_devanagari_language(sample)
             else:
+                # Latin or no recognizable script: statistical model
                 lang_code = detect(text[:500])
             
             lang_name = self.language_map.get(lang_code, lang_code)
@@ -73,6 +129,49 @@ class LanguageService:
             logger.error(f"Unexpected error in language detection: {e}")
             return 'en'
     
+    def script_histogram(self, text: str) -> Dict[str, int]:
+        """
+        Count characters per script in one vectorized pass over the codepoints
+        Returns: {script_name: count} for scripts present in the text
+        """
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+        if codepoints.size == 0:
+            return {}
+        
+        block = np.searchsorted(self._block_starts, codepoints, side='right') - 1
+        in_block = (block >= 0) & (codepoints <= self._block_ends[np.clip(block, 0, None)])
+        counts = np.bincount(self._block_script[block[in_block]], minlength=len(self.script_names))
+        return {self.script_names[i]: int(c) for i, c in enumerate(counts) if c}
+    
+    def dominant_script(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Returns: (most frequent script, its share of script characters);
+        (None, 0.0) when the text has too few recognizable letters
+        """
+        histogram = self.script_histogram(text)
+        total = sum(histogram.values())
+        if total < self.min_script_chars:
+            return None, 0.0
+        
+        # Any real amount of Indic script outweighs embedded Latin acronyms/URLs
+        indic = {k: v for k, v in histogram.items() if k != 'latin'}
+        if indic and sum(indic.values()) >= max(self.min_script_chars, 0.2 * total):
+            script = max(indic, key=indic.get)
+        else:
+            script = max(histogram, key=histogram.get)
+        return script, histogram[script] / total
+    
+    def _detect_devanagari_language(self, text: str) -> str:
+        """Hindi vs Marathi (vs Nepali) needs the statistical model; default to Hindi"""
+        try:
+            for candidate in detect_langs(text[:500]):
+                if candidate.lang in DEVANAGARI_LANGUAGES:
+                    return candidate.lang
+        except LangDetectException as e:
+            logger.warning(f"langdetect failed on Devanagari text: {e}")
+        logger.info("Devanagari text without a confident Hindi/Marathi call, defaulting to 'hi'")
+        return 'hi'
+    
     def translate_to_english(self, text: str, source_lang: Optional[str] = None) -> Dict[str, Any]:
         """
         Translate text to English using IndicTrans2.
@@ -82,30 +181,35 @@ class LanguageService:
             source_lang: Source language code (auto-detect if None)
         
         Returns: dict with translated text and detected language
+        
+        Runs on the model workers. When IndicTrans2 fails the result has
+        translation_performed=False and the caller can await
+        translate_with_groq() as a fallback on the event loop.
         """
         try:
             # Detect language if not provided
             if not source_lang:
                 source_lang = self.detect_language(text)
             
+            # Tag sentences by script so the English spans of code-mixed text stay as they are
+            segments = self.tag_segments(text, source_lang)
+            indic_languages = {lang for _, _, lang in segments if lang != 'en'}
+            
             # If already English, no translation needed
-            if source_lang == 'en':
+            if not indic_languages and source_lang == 'en':
                 return {
                     "translated_text": text,
                     "source_language": source_lang,
                     "translation_performed": False
                 }
             
-            # Use IndicTrans2 first, fallback to Groq if needed
-            logger.info(f"Translating {source_lang} text using IndicTrans2 with Groq fallback...")
-            result = self._translate_with_indictrans2(text, source_lang or 'hi')
-            
-            # If IndicTrans2 failed, try Groq
-            if not result.get('translation_performed'):
-                logger.info("IndicTrans2 failed, trying Groq fallback...")
-                result = self._translate_with_groq(text, source_lang or 'hi')
+            if len(indic_languages) > 1 or (indic_languages and any(lang == 'en' for _, _, lang in segments)):
+                return self._translate_mixed(segments, source_lang)
             
-            return result
+            if indic_languages:
+                source_lang = indic_languages.pop()
+            logger.info(f"Translating {source_lang} text using IndicTrans2...")
+            return self._translate_indic(text, source_lang or 'hi')
             
         except Exception as e:
             logger.error(f"Translation error: {e}")
@@ -116,6 +220,167 @@ class LanguageService:
                 "error": str(e)
             }
     
+    def split_script_runs(self, sentence: str) -> List[str]:
+        """
+        Split a sentence into runs of whitespace-separated words in one script
+        Returns: [sentence] unless two scripts each have enough letters to call
+        
+        Words without letters (numbers, punctuation) stay with the run they are
+        in; runs too short to call (a Latin acronym in Hindi, one Hindi word in
+        English) are merged into the run before them.
+        """
+        histogram = self.script_histogram(sentence)
+        if sum(1 for count in histogram.values() if count >= self.min_script_chars) < 2:
+            return [sentence]
+        
+        # [script, words, letters]
+        runs: List[List[Any]] = []
+        for word in sentence.split():
+            word_histogram = self.script_histogram(word)
+            script = max(word_histogram, key=word_histogram.get) if word_histogram else None
+            if runs and script in (None, runs[-1][0]):
+                runs[-1][1].append(word)
+                runs[-1][2] += sum(word_histogram.values())
+            else:
+                runs.append([script, [word], sum(word_histogram.values())])
+        
+        merged: List[List[Any]] = []
+        for run in runs:
+            if not merged:
+                merged.append(run)
+            elif run[0] == merged[-1][0] or run[2] < self.min_script_chars:
+                merged[-1][1].extend(run[1])
+                merged[-1][2] += run[2]
+            elif merged[-1][2] < self.min_script_chars:
+                # Short leading run: it belongs to this one
+                run[1][:0] = merged[-1][1]
+                run[2] += merged[-1][2]
+                merged[-1] = run
+            else:
+                merged.append(run)
+        return [" ".join(words) for _, words, _ in merged]
+    
+    def tag_segments(self, text: str, source_lang: Optional[str] = None) -> List[Tuple[int, str, str]]:
+        """
+        Tag each sentence with a language from its script histogram
+        Returns: list of (paragraph_index, segment, lang_code) in document order
+        
+        Latin-script sentences are tagged 'en'. Mixed-script sentences (a Hindi
+        quote in an English sentence) are split into same-script runs first, so
+        only the Indic run is translated. Sentences with too few letters to call
+        (numbers, bylines) take the language of their neighbours.
+        """
+        sentences = [
+            (paragraph_idx, run)
+            for paragraph_idx, sentence in split_sentences(text)
+            for run in self.split_script_runs(sentence)
+        ]
+        scripts = [self.dominant_script(sentence)[0] for _, sentence in sentences]
+        
+        devanagari_lang = source_lang if source_lang in DEVANAGARI_LANGUAGES else None
+        if devanagari_lang is None and 'devanagari' in scripts:
+            devanagari_lang = self._detect_devanagari_language(
+                " ".join(sentence for (_, sentence), script in zip(sentences, scripts) if script == 'devanagari')
+            )
+        
+        tags: List[Optional[str]] = []
+        for script in scripts:
+            if script is None:
+                tags.append(None)
+            elif script == 'latin':
+                tags.append('en')
+            elif script == 'devanagari':
+                tags.append(devanagari_lang)
+            else:
+                tags.append(UNAMBIGUOUS_SCRIPTS.get(script, source_lang))
+        
+        # Fill untagged sentences from the previous tag, then the next one
+        fallback = source_lang or 'en'
+        for order in (range(len(tags)), reversed(range(len(tags)))):
+            last = None
+            for i in order:
+                if tags[i] is None:
+                    tags[i] = last
+                else:
+                    last = tags[i]
+        
+        return [
+            (paragraph_idx, sentence, tag or fallback)
+            for (paragraph_idx, sentence), tag in zip(sentences, tags)
+        ]
+    
+    def _translate_mixed(self, segments: List[Tuple[int, str, str]], source_lang: Optional[str]) -> Dict[str, Any]:
+        """
+        Code-mixed text: translate only the non-English sentences, one
+        IndicTrans2 call per language, and stitch them back in order
+        """
+        groups: Dict[str, List[int]] = {}
+        for idx, (_, _, lang) in enumerate(segments):
+            if lang != 'en':
+                groups.setdefault(lang, []).append(idx)
+        
+        outputs = [sentence for _, sentence, _ in segments]
+        truncated = False
+        for lang, indices in groups.items():
+            logger.info(f"Translating {len(indices)}/{len(segments)} {lang} sentences of code-mixed text using IndicTrans2...")
+            result = self._translate_indic_sentences([segments[i][1] for i in indices], lang)
+            if not result.get('translation_performed'):
+                return {
+                    "translated_text": join_sentences([(p, sentence) for p, sentence, _ in segments]),
+                    "source_language": source_lang,
+                    "translation_performed": False,
+                    "error": result.get('error', 'translation failed')
+                }
+            for i, output in zip(indices, result['translations']):
+                if output is not None:
+                    outputs[i] = output
+            truncated = truncated or result['truncated']
+        
+        segment_languages: Dict[str, int] = {}
+        for _, _, lang in segments:
+            segment_languages[lang] = segment_languages.get(lang, 0) + 1
+        
+        return {
+            "translated_text": join_sentences([(p, output) for (p, _, _), output in zip(segments, outputs)]),
+            "source_language": source_lang,
+            "translation_performed": True,
+            "provider": INDICTRANS2_PROVIDER,
+            "code_mixed": True,
+            "segment_languages": segment_languages,
+            "sentences": sum(len(indices) for indices in groups.values()),
+            "truncated": truncated
+        }
+    
+    def _translate_indic_sentences(self, sentences: List[str], source_lang: str) -> Dict[str, Any]:
+        """Sentence-list variant of _translate_indic (used for code-mixed text)"""
+        if not self.use_translation_worker:
+            return self._translate_sentences_with_indictrans2(sentences, source_lang)
+        
+        try:
+            return translation_worker_client.translate_sentences(sentences, source_lang)
+        except Exception as e:
+            logger.error(f"Translation worker request failed: {e}")
+            return {"translation_performed": False, "error": str(e)}
+    
+    def _translate_indic(self, text: str, source_lang: str) -> Dict[str, Any]:
+        """
+        IndicTrans2 translation, via the shared translation worker when enabled
+        so the weights are loaded once per host rather than in every API worker
+        """
+        if not self.use_translation_worker:
+            return self._translate_with_indictrans2(text, source_lang)
+        
+        try:
+            return translation_worker_client.translate(text, source_lang)
+        except Exception as e:
+            logger.error(f"Translation worker request failed: {e}")
+            return {
+                "translated_text": text,
+                "source_language": source_lang,
+                "translation_performed": False,
+                "error": str(e)
+            }
+    
     def _load_indictrans2(self):
         """
         Load IndicTrans2 model using Hugging Face pipeline
@@ -143,7 +408,8 @@ class LanguageService:
     
     def _translate_with_indictrans2(self, text: str, source_lang: str) -> Dict[str, Any]:
         """
-        Translate using IndicTrans2 pipeline
+        Translate the full document with the IndicTrans2 pipeline: sentence
+        segmentation, token-budgeted batches, in-order reassembly
         """
         try:
             self._load_indictrans2()
@@ -151,24 +417,23 @@ class LanguageService:
             if self.indic_pipeline is None:
                 raise RuntimeError("IndicTrans2 pipeline failed to load")
             
-            # Use pipeline for translation (automatically handles tokenization and generation)
-            result = self.indic_pipeline(text[:1000], max_length=256)
-            
-            # Extract translated text from pipeline output
-            if isinstance(result, list) and len(result) > 0:
-                translated = result[0].get('translation_text', text)
-            elif isinstance(result, dict):
-                translated = result.get('translation_text', text)
-            else:
-                translated = str(result)
+            result = translation_engine.translate_document(
+                text,
+                translate_batch=self._indictrans2_batch,
+                count_tokens=self._indictrans2_token_count,
+                source_lang=source_lang,
+                provider=f"{INDICTRANS2_PROVIDER}:{self.settings.TRANSLATION_MAX_OUTPUT_TOKENS}"
+            )
             
             logger.info(f"✓ Translation complete using IndicTrans2 pipeline")
             
             return {
-                "translated_text": translated,
+                "translated_text": result["translated_text"],
                 "source_language": source_lang,
                 "translation_performed": True,
-                "provider": "hf/indictrans2-indic-en-1B-pipeline"
+                "provider": INDICTRANS2_PROVIDER,
+                "sentences": result["sentences"],
+                "truncated": result["truncated"]
             }
             
         except Exception as e:
@@ -180,15 +445,62 @@ class LanguageService:
                 "error": str(e)
             }
     
-    def _translate_with_groq(self, text: str, source_lang: str) -> Dict[str, Any]:
+    def _translate_sentences_with_indictrans2(self, sentences: List[str], source_lang: str) -> Dict[str, Any]:
         """
-        Translate using Groq Mixtral as fallback
+        Translate a list of sentences with the IndicTrans2 pipeline
+        Returns: dict with one translation per sentence (None past the token cap)
         """
         try:
-            if not self.groq_client:
-                if not self.settings.GROQ_API_KEY:
-                    raise ValueError("GROQ_API_KEY not configured")
-                self.groq_client = Groq(api_key=self.settings.GROQ_API_KEY)
+            self._load_indictrans2()
+            
+            if self.indic_pipeline is None:
+                raise RuntimeError("IndicTrans2 pipeline failed to load")
+            
+            result = translation_engine.translate_sentences(
+                sentences,
+                translate_batch=self._indictrans2_batch,
+                count_tokens=self._indictrans2_token_count,
+                source_lang=source_lang,
+                provider=f"{INDICTRANS2_PROVIDER}:{self.settings.TRANSLATION_MAX_OUTPUT_TOKENS}"
+            )
+            return {"translation_performed": True, **result}
+            
+        except Exception as e:
+            logger.error(f"IndicTrans2 pipeline translation failed: {e}")
+            return {"translation_performed": False, "error": str(e)}
+    
+    def _indictrans2_batch(self, sentences: List[str]) -> List[str]:
+        """Translate one batch of sentences in a single pipeline call"""
+        results = self.indic_pipeline(
+            sentences,
+            max_length=self.settings.TRANSLATION_MAX_OUTPUT_TOKENS,
+            batch_size=len(sentences)
+        )
+        return [
+            (r[0] if isinstance(r, list) else r).get('translation_text', source)
+            for r, source in zip(results, sentences)
+        ]
+    
+    def _indictrans2_token_count(self, sentence: str) -> int:
+        return len(self.indic_pipeline.tokenizer.encode(sentence, add_special_tokens=False))
+    
+    async def translate_with_groq(self, text: str, source_lang: str) -> Dict[str, Any]:
+        """
+        Translate using Groq as fallback (async, through the shared LLM client)
+        """
+        try:
+            # Groq translates the document in one prompt, so it is memorized as a single segment
+            # (SQLite lookups and writes run on a thread, off the event loop)
+            source = text[:1500]
+            cached = await asyncio.to_thread(translation_memory.get_many, [source], source_lang, GROQ_PROVIDER)
+            if cached:
+                logger.info("✓ Translation served from translation memory (Groq)")
+                return {
+                    "translated_text": cached[0],
+                    "source_language": source_lang,
+                    "translation_performed": True,
+                    "provider": GROQ_PROVIDER
+                }
             
             lang_name = self.language_map.get(source_lang, source_lang)
             
@@ -196,25 +508,19 @@ class LanguageService:
 Provide ONLY the English translation without any explanations or additional text.
 
 Text to translate:
-{text[:1500]}
+{source}
 
 English translation:"""
             
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.3-70b-versatile",
-                temperature=0.1,
-                max_tokens=1000
-            )
-            
-            translated = response.choices[0].message.content.strip()
+            translated = await llm_client.chat(prompt, temperature=0.1, max_tokens=1000)
             logger.info(f"✓ Translation complete using Groq")
+            await asyncio.to_thread(translation_memory.put_many, [source], [translated], source_lang, GROQ_PROVIDER)
             
             return {
                 "translated_text": translated,
                 "source_language": source_lang,
                 "translation_performed": True,
-                "provider": "groq/mixtral-8x7b"
+                "provider": GROQ_PROVIDER
             }
             
         except Exception as e:
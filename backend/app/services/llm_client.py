@@ -0,0 +1,240 @@
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Worth retrying: rate limiting and provider-side failures
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """The LLM call failed (bad request, retries exhausted, deadline exceeded)"""
+
+
+class LLMUnavailable(LLMError):
+    """The provider is not configured or the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls pass. After `failure_threshold` consecutive failures the
+    breaker opens and calls fail fast for `reset_seconds`; then it half-opens
+    and lets a single probe through, closing again if the probe succeeds
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_started: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = "half_open"
+            self._probe_started = None
+        # half_open: one probe at a time (a probe that never reported back is abandoned after reset_seconds)
+        now = time.monotonic()
+        if self._probe_started is not None and now - self._probe_started < self.reset_seconds:
+            return False
+        self._probe_started = now
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_started = None
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"LLM circuit breaker opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class LLMClient:
+    """
+    Shared async client for the Groq (OpenAI-compatible) chat completions API.
+
+    One pooled httpx.AsyncClient serves every caller. A semaphore bounds
+    concurrent calls, each call's attempts share a deadline (time spent
+    queued for a slot is bounded separately and never counts against the
+    provider), transient failures are retried with jittered exponential
+    backoff, and a circuit breaker fails fast while the provider is down.
+    """
+
+    def __init__(self):
+        self.base_url = settings.GROQ_BASE_URL.rstrip("/")
+        self.api_key = settings.GROQ_API_KEY
+        self.model = settings.GROQ_MODEL
+        self.request_timeout = settings.LLM_REQUEST_TIMEOUT_SECONDS
+        self.deadline = settings.LLM_DEADLINE_SECONDS
+        self.max_retries = max(0, settings.LLM_MAX_RETRIES)
+        self.retry_base = settings.LLM_RETRY_BASE_SECONDS
+        self.retry_max = settings.LLM_RETRY_MAX_SECONDS
+        self.max_concurrency = max(1, settings.LLM_MAX_CONCURRENCY)
+        self.breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self.stats = {"calls": 0, "succeeded": 0, "failed": 0, "retries": 0, "timeouts": 0, "queue_timeouts": 0, "short_circuited": 0}
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(self.request_timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def chat(
+        self,
+        prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+        model: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """
+        Single-turn chat completion
+        Returns: the assistant message text
+
+        Raises LLMUnavailable when not configured or while the breaker is open,
+        LLMError when the call fails or exceeds its deadline
+        """
+        if not self.configured:
+            raise LLMUnavailable("GROQ_API_KEY not configured")
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            raise LLMUnavailable("LLM provider circuit breaker is open")
+
+        self.stats["calls"] += 1
+        payload = {
+            "model": model or self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        budget = deadline or self.deadline
+        client = self._http()
+        try:
+            # Waiting for a slot is local load, not the provider's fault: bounded, but never charged to the breaker
+            await asyncio.wait_for(self._semaphore.acquire(), budget)
+        except asyncio.TimeoutError:
+            self.stats["queue_timeouts"] += 1
+            self.stats["failed"] += 1
+            raise LLMError(f"No LLM slot free within {budget:.0f}s ({self.max_concurrency} calls in flight)")
+
+        try:
+            # The deadline covers every attempt and the backoff between them
+            content = await asyncio.wait_for(self._call_with_retries(client, payload), budget)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            self.stats["failed"] += 1
+            self.breaker.record_failure()
+            raise LLMError(f"LLM call exceeded its {budget:.0f}s deadline")
+        except LLMError:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._semaphore.release()
+        self.stats["succeeded"] += 1
+        return content
+
+    async def _call_with_retries(self, client: httpx.AsyncClient, payload: Dict[str, Any]) -> str:
+        """Attempts against the provider; the caller holds a concurrency slot"""
+        self._in_flight += 1
+        try:
+            for attempt in range(self.max_retries + 1):
+                retry_after = None
+                try:
+                    response = await client.post("/chat/completions", json=payload)
+                    if response.status_code < 400:
+                        content = _message_content(response)
+                        self.breaker.record_success()
+                        return content
+                    if response.status_code not in RETRYABLE_STATUS:
+                        # Our request is wrong; the provider is fine, so the breaker is not charged
+                        self.breaker.record_success()
+                        raise LLMError(f"LLM request rejected ({response.status_code}): {response.text[:200]}")
+                    error = f"HTTP {response.status_code}"
+                    retry_after = _retry_after_seconds(response)
+                except httpx.RequestError as e:
+                    error = f"{type(e).__name__}: {e}"
+
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    raise LLMError(f"LLM call failed after {attempt + 1} attempts ({error})")
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                self.stats["retries"] += 1
+                logger.warning(f"LLM call attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        finally:
+            self._in_flight -= 1
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+        return random.uniform(0, min(self.retry_max, self.retry_base * (2 ** attempt)))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "configured": self.configured,
+            "base_url": self.base_url,
+            "breaker_state": self.breaker.state,
+            "breaker_opened": self.breaker.times_opened,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            **self.stats
+        }
+
+
+def _message_content(response: httpx.Response) -> str:
+    try:
+        return response.json()["choices"][0]["message"]["content"].strip()
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        raise httpx.DecodingError(f"Malformed chat completion response: {e}")
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Honour a numeric Retry-After header, capped so one call can't stall for long"""
+    try:
+        return min(float(response.headers["retry-after"]), settings.LLM_RETRY_MAX_SECONDS)
+    except (KeyError, ValueError):
+        return None
+
+
+# Global instance
+llm_client = LLMClient()
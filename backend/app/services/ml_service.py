@@ -1,13 +1,29 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+from transformers import AutoTokenizer, pipeline
 import joblib
 import torch
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
+import asyncio
+import hashlib
+import json
 import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from app.config import get_settings
+from app.services.model_executor import model_executor, analyze_batch_task
+from app.services.inference_backends import load_sequence_classifier, backend_device, describe_backend
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+WINDOW_POOLING_RULES = ("mean", "max-negative", "length-weighted")
+COMPILE_MODES = ("none", "jit", "compile")
+
+
+def parse_length_buckets(value: str) -> List[int]:
+    """Parse ML_LENGTH_BUCKETS ("64,128,256,512") into sorted sequence lengths"""
+    return sorted({int(part) for part in value.split(",") if part.strip()})
+
 
 class MLInferenceService:
     """Service for loading and running sentiment + department classification models"""
@@ -23,101 +39,673 @@ class MLInferenceService:
         self.department_pipeline = None
         self.department_label_encoder = None
         
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Using device: {self.device}")
+        # True when both tokenizers share a vocabulary, so one encoding feeds both models
+        self.shared_encodings = False
+        
+        # Long-document mode settings
+        self.long_document_mode = settings.ML_LONG_DOCUMENT_MODE
+        self.window_pooling = settings.ML_WINDOW_POOLING
+        if self.window_pooling not in WINDOW_POOLING_RULES:
+            logger.warning(f"Unknown ML_WINDOW_POOLING '{self.window_pooling}', using 'mean'")
+            self.window_pooling = "mean"
+        self.sentiment_negative_index = None
+        
+        # Sequence-length buckets: inputs are padded up to the nearest bucket so
+        # the models only ever see a few fixed shapes
+        self.length_buckets = parse_length_buckets(settings.ML_LENGTH_BUCKETS)
+        self.compile_mode = settings.ML_COMPILE_MODE
+        if self.compile_mode not in COMPILE_MODES:
+            logger.warning(f"Unknown ML_COMPILE_MODE '{self.compile_mode}', using 'none'")
+            self.compile_mode = "none"
+        # Traced / compiled variants keyed by (id(model), bucket); bucket is None for torch.compile
+        self._compiled: Dict[Tuple[int, Optional[int]], any] = {}
+        self.warmup_seconds: Dict[int, float] = {}
+        
+        # Per-model load progress: state is pending | loading | ready | failed
+        self.load_state: Dict[str, Dict[str, any]] = {}
+        
+        self.backend = settings.ML_INFERENCE_BACKEND
+        self.device = backend_device(self.backend, "cuda" if torch.cuda.is_available() else "cpu")
+        logger.info(f"Using device: {self.device} (backend: {self.backend})")
     
     def load_models(self):
-        """Load both sentiment and department models at startup"""
+        """
+        Load sentiment and department models (and optionally IndicTrans2)
+        concurrently, recording per-model state and load time
+        """
+        loaders = {
+            "sentiment": self._load_sentiment_model,
+            "department": self._load_department_model,
+        }
+        if settings.PRELOAD_INDICTRANS2:
+            loaders["indictrans2"] = self._load_translation_model
+        
+        for name in loaders:
+            self.load_state[name] = {"state": "pending", "load_seconds": None, "error": None}
+        
+        started = time.perf_counter()
+        workers = len(loaders) if settings.ML_PARALLEL_LOAD else 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model-loader") as pool:
+            for future in [pool.submit(self._timed_load, name, loader) for name, loader in loaders.items()]:
+                future.result()
+        
+        failed = [name for name in ("sentiment", "department") if self.load_state[name]["state"] != "ready"]
+        if failed:
+            errors = "; ".join(f"{name}: {self.load_state[name]['error']}" for name in failed)
+            logger.error(f"Error loading models: {errors}")
+            raise RuntimeError(f"Failed to load models: {errors}")
+        
+        self._detect_shared_encodings()
+        self.sentiment_negative_index = self._find_negative_index()
+        if self.long_document_mode:
+            logger.info(
+                f"Long-document mode on: {settings.ML_WINDOW_TOKENS}-token windows, "
+                f"overlap {settings.ML_WINDOW_OVERLAP_TOKENS}, max {settings.ML_MAX_WINDOWS} "
+                f"windows/article, pooling={self.window_pooling}"
+            )
+        logger.info(f"✓ Models loaded in {time.perf_counter() - started:.1f}s ({workers} loader threads)")
+        
+        if self.length_buckets:
+            self._compile_models()
+            if settings.ML_WARMUP:
+                self._warm_up()
+    
+    def _timed_load(self, name: str, loader):
+        """Run one loader, recording its state; errors are stored rather than raised"""
+        self.load_state[name]["state"] = "loading"
+        started = time.perf_counter()
         try:
-            # Load sentiment model
-            logger.info(f"Loading sentiment model from {settings.SENTIMENT_MODEL_PATH}")
-            self.sentiment_tokenizer = AutoTokenizer.from_pretrained(settings.SENTIMENT_MODEL_PATH)
-            self.sentiment_model = AutoModelForSequenceClassification.from_pretrained(
-                settings.SENTIMENT_MODEL_PATH
-            ).to(self.device)
-            self.sentiment_pipeline = pipeline(
-                "text-classification",
-                model=self.sentiment_model,
-                tokenizer=self.sentiment_tokenizer,
-                device=0 if self.device == "cuda" else -1
+            loader()
+            self.load_state[name].update(state="ready", load_seconds=round(time.perf_counter() - started, 2))
+        except Exception as e:
+            logger.error(f"Error loading {name} model: {e}")
+            self.load_state[name].update(
+                state="failed", load_seconds=round(time.perf_counter() - started, 2), error=str(e)
             )
-            self.sentiment_label_encoder = joblib.load(settings.SENTIMENT_LABEL_ENCODER_PATH)
-            logger.info("✓ Sentiment model loaded successfully")
-            
-            # Load department model
-            logger.info(f"Loading department model from {settings.DEPARTMENT_MODEL_PATH}")
-            self.department_tokenizer = AutoTokenizer.from_pretrained(settings.DEPARTMENT_MODEL_PATH)
-            self.department_model = AutoModelForSequenceClassification.from_pretrained(
-                settings.DEPARTMENT_MODEL_PATH
-            ).to(self.device)
-            self.department_pipeline = pipeline(
-                "text-classification",
-                model=self.department_model,
-                tokenizer=self.department_tokenizer,
-                device=0 if self.device == "cuda" else -1
+    
+    def _load_sentiment_model(self):
+        logger.info(f"Loading sentiment model from {settings.SENTIMENT_MODEL_PATH}")
+        self.sentiment_tokenizer = AutoTokenizer.from_pretrained(settings.SENTIMENT_MODEL_PATH)
+        self.sentiment_model = self._load_classifier(settings.SENTIMENT_MODEL_PATH, "sentiment")
+        self.sentiment_pipeline = self._build_pipeline(self.sentiment_model, self.sentiment_tokenizer)
+        self.sentiment_label_encoder = joblib.load(settings.SENTIMENT_LABEL_ENCODER_PATH)
+        logger.info("✓ Sentiment model loaded successfully")
+    
+    def _load_department_model(self):
+        logger.info(f"Loading department model from {settings.DEPARTMENT_MODEL_PATH}")
+        self.department_tokenizer = AutoTokenizer.from_pretrained(settings.DEPARTMENT_MODEL_PATH)
+        self.department_model = self._load_classifier(settings.DEPARTMENT_MODEL_PATH, "department")
+        self.department_pipeline = self._build_pipeline(self.department_model, self.department_tokenizer)
+        self.department_label_encoder = joblib.load(settings.DEPARTMENT_LABEL_ENCODER_PATH)
+        logger.info("✓ Department model loaded successfully")
+    
+    @staticmethod
+    def _load_translation_model():
+        from app.services.language_service import language_service
+        if language_service.use_translation_worker:
+            # Preload in the shared translation worker instead of this process
+            from app.services.translation_worker import translation_worker_client
+            if not translation_worker_client.ensure_running(preload=True):
+                raise RuntimeError("Translation worker is not available")
+            return
+        language_service._load_indictrans2()
+    
+    def is_ready(self) -> bool:
+        """True once both classifiers are loaded"""
+        return all(
+            self.load_state.get(name, {}).get("state") == "ready"
+            for name in ("sentiment", "department")
+        )
+    
+    def get_load_state(self) -> Dict[str, Dict[str, any]]:
+        return {name: dict(state) for name, state in self.load_state.items()}
+    
+    def _load_classifier(self, model_path: str, name: str):
+        """Load a classifier through the configured ML_INFERENCE_BACKEND"""
+        return load_sequence_classifier(
+            model_path,
+            name,
+            self.backend,
+            self.device,
+            onnx_dir=settings.ML_ONNX_DIR,
+            onnx_quantized=settings.ML_ONNX_QUANTIZED,
+            onnx_threads=settings.ML_ONNX_THREADS
+        )
+    
+    def _build_pipeline(self, model, tokenizer):
+        """HF pipelines only wrap PyTorch models; other backends use the direct encoding path"""
+        if self.backend == "onnxruntime":
+            return None
+        return pipeline(
+            "text-classification",
+            model=model,
+            tokenizer=tokenizer,
+            device=0 if self.device == "cuda" else -1
+        )
+    
+    @property
+    def backend_info(self) -> Dict[str, str]:
+        """Active backend and precision, for health checks"""
+        return describe_backend(self.backend, settings.ML_ONNX_QUANTIZED)
+    
+    @property
+    def inference_path(self) -> str:
+        """Name of the active analysis path, for logs and health checks"""
+        path = "shared-encodings" if self.shared_encodings else "separate-pipelines"
+        return f"{path}+windowed" if self.long_document_mode else path
+    
+    def _detect_shared_encodings(self):
+        """
+        Enable the tokenize-once path when both tokenizers are interchangeable
+        (same class, vocab hash and special tokens)
+        """
+        sentiment_hash = self._tokenizer_fingerprint(self.sentiment_tokenizer)
+        department_hash = self._tokenizer_fingerprint(self.department_tokenizer)
+        self.shared_encodings = sentiment_hash == department_hash
+        
+        if self.shared_encodings:
+            logger.info(f"✓ Tokenizers compatible (vocab hash {sentiment_hash[:12]}), using {self.inference_path}")
+        else:
+            logger.info(
+                f"Tokenizers differ ({sentiment_hash[:12]} vs {department_hash[:12]}), "
+                f"using {self.inference_path}"
             )
-            self.department_label_encoder = joblib.load(settings.DEPARTMENT_LABEL_ENCODER_PATH)
-            logger.info("✓ Department model loaded successfully")
-            
-        except Exception as e:
-            logger.error(f"Error loading models: {e}")
-            raise
+    
+    @staticmethod
+    def _tokenizer_fingerprint(tokenizer) -> str:
+        """Hash everything that decides the input tensors a tokenizer produces"""
+        payload = json.dumps({
+            "class": type(tokenizer).__name__,
+            "vocab": sorted(tokenizer.get_vocab().items()),
+            "special_tokens": tokenizer.special_tokens_map,
+            "do_lower_case": getattr(tokenizer, "do_lower_case", None),
+            "model_max_length": tokenizer.model_max_length,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
     
     def predict_sentiment(self, text: str) -> Tuple[str, float]:
         """
         Predict sentiment for given text
         Returns: (sentiment_label, confidence_score)
         """
-        try:
-            result = self.sentiment_pipeline(text[:512])[0]  # Truncate to 512 tokens
-            label = result['label']
-            confidence = result['score']
-            
-            # Check if label is already a string (e.g., 'Positive', 'Negative')
-            if label.startswith('LABEL_'):
-                # Extract index and use label encoder
-                label_idx = int(label.split('_')[-1])
-                sentiment_label = self.sentiment_label_encoder.inverse_transform([label_idx])[0]
-            else:
-                # Label is already the sentiment name
-                sentiment_label = label
-            
-            return sentiment_label, confidence
-        except Exception as e:
-            logger.error(f"Error predicting sentiment: {e}")
-            return "unknown", 0.0
+        return self.predict_sentiment_batch([text])[0]
     
     def predict_department(self, text: str) -> Tuple[str, float]:
         """
         Predict department/category for given text
         Returns: (department_label, confidence_score)
         """
+        return self.predict_department_batch([text])[0]
+    
+    def predict_sentiment_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Predict sentiment for a list of texts in one padded batch
+        Returns: list of (sentiment_label, confidence_score), one per text
+        """
+        if self.long_document_mode:
+            return self._predict_windowed(
+                self.sentiment_tokenizer, self.sentiment_model, texts,
+                self._decode_sentiment_label, self.sentiment_negative_index, "sentiment"
+            )
+        if self.sentiment_pipeline is None or self.length_buckets:
+            return self._predict_direct(
+                self.sentiment_tokenizer, self.sentiment_model, texts, self._decode_sentiment_label, "sentiment"
+            )
         try:
-            result = self.department_pipeline(text[:512])[0]
-            label_idx = int(result['label'].split('_')[-1])
-            department_label = self.department_label_encoder.inverse_transform([label_idx])[0]
-            confidence = result['score']
-            
-            return department_label, confidence
+            results = self.sentiment_pipeline(
+                [text[:512] for text in texts],  # Truncate to 512 tokens
+                batch_size=len(texts)
+            )
+            return [(self._decode_sentiment_label(r['label']), r['score']) for r in results]
+        except Exception as e:
+            logger.error(f"Error predicting sentiment: {e}")
+            return [("unknown", 0.0)] * len(texts)
+    
+    def predict_department_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Predict department/category for a list of texts in one padded batch
+        Returns: list of (department_label, confidence_score), one per text
+        """
+        if self.long_document_mode:
+            return self._predict_windowed(
+                self.department_tokenizer, self.department_model, texts,
+                self._decode_department_label, None, "department"
+            )
+        if self.department_pipeline is None or self.length_buckets:
+            return self._predict_direct(
+                self.department_tokenizer, self.department_model, texts, self._decode_department_label, "department"
+            )
+        try:
+            results = self.department_pipeline(
+                [text[:512] for text in texts],
+                batch_size=len(texts)
+            )
+            return [(self._decode_department_label(r['label']), r['score']) for r in results]
         except Exception as e:
             logger.error(f"Error predicting department: {e}")
-            return "unknown", 0.0
+            return [("unknown", 0.0)] * len(texts)
+    
+    def _predict_direct(self, tokenizer, model, texts: List[str], decode, task: str) -> List[Tuple[str, float]]:
+        """Tokenize and classify without an HF pipeline (non-PyTorch backends, length buckets)"""
+        try:
+            encodings = self._tokenize(tokenizer, texts)
+            return [(decode(label), score) for label, score in self._classify_encodings(model, encodings)]
+        except Exception as e:
+            logger.error(f"Error predicting {task}: {e}")
+            return [("unknown", 0.0)] * len(texts)
+    
+    def _predict_with_shared_encodings(self, texts: List[str]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """
+        Tokenize the batch once and feed the same input tensors to both models
+        Returns: (sentiment predictions, department predictions)
+        """
+        try:
+            encodings = self._tokenize(self.sentiment_tokenizer, texts)
+        except Exception as e:
+            logger.error(f"Error tokenizing batch: {e}")
+            unknown = [("unknown", 0.0)] * len(texts)
+            return unknown, list(unknown)
+        
+        try:
+            sentiments = [
+                (self._decode_sentiment_label(label), score)
+                for label, score in self._classify_encodings(self.sentiment_model, encodings)
+            ]
+        except Exception as e:
+            logger.error(f"Error predicting sentiment: {e}")
+            sentiments = [("unknown", 0.0)] * len(texts)
+        
+        try:
+            departments = [
+                (self._decode_department_label(label), score)
+                for label, score in self._classify_encodings(self.department_model, encodings)
+            ]
+        except Exception as e:
+            logger.error(f"Error predicting department: {e}")
+            departments = [("unknown", 0.0)] * len(texts)
+        
+        return sentiments, departments
+    
+    def _tokenize(self, tokenizer, texts: List[str]) -> Dict[str, torch.Tensor]:
+        """Tokenize a batch (character-truncated as before) and pad it to its length bucket"""
+        encodings = tokenizer(
+            [text[:512] for text in texts],
+            padding=True,
+            truncation=True,
+            return_tensors="pt"
+        )
+        return {key: value.to(self.device) for key, value in self._pad_to_bucket(encodings, tokenizer).items()}
+    
+    def _pad_to_bucket(self, encodings, tokenizer) -> Dict[str, torch.Tensor]:
+        """Pad every tensor on the sequence axis up to the smallest bucket that fits"""
+        encodings = dict(encodings)
+        if not self.length_buckets:
+            return encodings
+        
+        seq_len = encodings["input_ids"].shape[1]
+        bucket = next((b for b in self.length_buckets if b >= seq_len), None)
+        if bucket is None or bucket == seq_len:
+            return encodings
+        
+        extra = bucket - seq_len
+        pad = (extra, 0) if tokenizer.padding_side == "left" else (0, extra)
+        pad_values = {"input_ids": tokenizer.pad_token_id or 0}
+        return {
+            key: torch.nn.functional.pad(value, pad, value=pad_values.get(key, 0))
+            for key, value in encodings.items()
+        }
+    
+    def _classify_encodings(self, model, encodings) -> List[Tuple[str, float]]:
+        """Run a sequence classifier on pre-built encodings, returning (raw_label, score) per row"""
+        scores, indices = self._class_probabilities(model, encodings).max(dim=-1)
+        return [
+            (model.config.id2label[int(idx)], float(score))
+            for idx, score in zip(indices.tolist(), scores.tolist())
+        ]
+    
+    def _class_probabilities(self, model, encodings) -> torch.Tensor:
+        """Softmax class probabilities for every row of the encodings"""
+        with torch.no_grad():
+            logits = self._forward(model, encodings)
+        return torch.softmax(logits, dim=-1)
+    
+    def _forward(self, model, encodings) -> torch.Tensor:
+        """Logits from the traced/compiled variant for this shape when one exists, else the eager model"""
+        seq_len = encodings["input_ids"].shape[1]
+        compiled = self._compiled.get((id(model), seq_len)) or self._compiled.get((id(model), None))
+        if compiled is not None:
+            try:
+                outputs = compiled(**encodings)
+                return outputs["logits"] if isinstance(outputs, dict) else outputs.logits
+            except Exception as e:
+                # e.g. a trace that does not generalize to this batch size
+                logger.warning(f"Compiled model failed for shape {tuple(encodings['input_ids'].shape)}, using eager: {e}")
+        return model(**encodings).logits
+    
+    def _compile_models(self):
+        """Optionally build a torch.jit trace per bucket, or one torch.compile module, per classifier"""
+        if self.compile_mode == "none":
+            return
+        if self.backend != "torch":
+            logger.warning(f"ML_COMPILE_MODE={self.compile_mode} needs the torch backend, skipping")
+            return
+        
+        for name, model, tokenizer in (
+            ("sentiment", self.sentiment_model, self.sentiment_tokenizer),
+            ("department", self.department_model, self.department_tokenizer),
+        ):
+            try:
+                if self.compile_mode == "compile":
+                    self._compiled[(id(model), None)] = torch.compile(model, dynamic=False)
+                    continue
+                for bucket in self.length_buckets:
+                    example = self._synthetic_batch(tokenizer, bucket, settings.ML_WARMUP_BATCH_SIZE)
+                    self._compiled[(id(model), bucket)] = torch.jit.trace(
+                        model, example_kwarg_inputs=example, strict=False
+                    )
+                logger.info(f"✓ Traced {name} model for buckets {self.length_buckets}")
+            except Exception as e:
+                logger.warning(f"Could not {self.compile_mode} {name} model, using eager mode: {e}")
+    
+    def _warm_up(self):
+        """Run a synthetic batch per bucket through both models to pay one-time costs before traffic"""
+        for bucket in self.length_buckets:
+            started = time.perf_counter()
+            for model, tokenizer in (
+                (self.sentiment_model, self.sentiment_tokenizer),
+                (self.department_model, self.department_tokenizer),
+            ):
+                try:
+                    self._class_probabilities(
+                        model, self._synthetic_batch(tokenizer, bucket, settings.ML_WARMUP_BATCH_SIZE)
+                    )
+                except Exception as e:
+                    logger.warning(f"Warm-up failed for bucket {bucket}: {e}")
+            self.warmup_seconds[bucket] = round(time.perf_counter() - started, 3)
+        logger.info(f"✓ Warm-up complete (seconds per bucket: {self.warmup_seconds})")
+    
+    def _synthetic_batch(self, tokenizer, seq_len: int, batch_size: int) -> Dict[str, torch.Tensor]:
+        """Full-length dummy encodings of shape (batch_size, seq_len)"""
+        encodings = tokenizer(
+            ["warm up " * seq_len] * max(1, batch_size),
+            max_length=seq_len,
+            truncation=True,
+            padding="max_length",
+            return_tensors="pt"
+        )
+        return {key: value.to(self.device) for key, value in encodings.items()}
+    
+    def _predict_windowed(self, tokenizer, model, texts: List[str], decode, negative_index: Optional[int],
+                          task: str) -> List[Tuple[str, float]]:
+        """
+        Classify full articles: all windows of all texts run as one batch and
+        window scores are pooled back to one prediction per text
+        """
+        try:
+            encodings, sample_map = self._encode_windows(tokenizer, texts)
+            probs = self._class_probabilities(model, encodings)
+            pooled = self._pool_windows(probs, encodings["attention_mask"], sample_map, len(texts), negative_index)
+            return self._decode_pooled(model, pooled, decode)
+        except Exception as e:
+            logger.error(f"Error predicting {task} (windowed): {e}")
+            return [("unknown", 0.0)] * len(texts)
+    
+    def _predict_windowed_shared(self, texts: List[str]) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """Windowed prediction where one set of window encodings feeds both models"""
+        try:
+            encodings, sample_map = self._encode_windows(self.sentiment_tokenizer, texts)
+        except Exception as e:
+            logger.error(f"Error tokenizing windows: {e}")
+            unknown = [("unknown", 0.0)] * len(texts)
+            return unknown, list(unknown)
+        
+        results = []
+        for model, decode, negative_index, task in (
+            (self.sentiment_model, self._decode_sentiment_label, self.sentiment_negative_index, "sentiment"),
+            (self.department_model, self._decode_department_label, None, "department"),
+        ):
+            try:
+                probs = self._class_probabilities(model, encodings)
+                pooled = self._pool_windows(probs, encodings["attention_mask"], sample_map, len(texts), negative_index)
+                results.append(self._decode_pooled(model, pooled, decode))
+            except Exception as e:
+                logger.error(f"Error predicting {task} (windowed): {e}")
+                results.append([("unknown", 0.0)] * len(texts))
+        
+        return results[0], results[1]
+    
+    def _encode_windows(self, tokenizer, texts: List[str]) -> Tuple[Dict[str, torch.Tensor], List[int]]:
+        """
+        Split every text into overlapping token windows, keeping at most
+        ML_MAX_WINDOWS per text (evenly spaced across the article)
+        Returns: (window encodings on device, text index of each window)
+        """
+        window_tokens = min(settings.ML_WINDOW_TOKENS, tokenizer.model_max_length)
+        encodings = tokenizer(
+            texts,
+            max_length=window_tokens,
+            stride=min(settings.ML_WINDOW_OVERLAP_TOKENS, window_tokens // 2),
+            truncation=True,
+            return_overflowing_tokens=True,
+            padding=True,
+            return_tensors="pt"
+        )
+        sample_map = encodings.pop("overflow_to_sample_mapping").tolist()
+        
+        keep = self._select_windows(sample_map, max(1, settings.ML_MAX_WINDOWS))
+        if len(keep) < len(sample_map):
+            index = torch.tensor(keep)
+            encodings = {key: value[index] for key, value in encodings.items()}
+            sample_map = [sample_map[i] for i in keep]
+        
+        encodings = self._pad_to_bucket(encodings, tokenizer)
+        return {key: value.to(self.device) for key, value in encodings.items()}, sample_map
+    
+    @staticmethod
+    def _select_windows(sample_map: List[int], max_windows: int) -> List[int]:
+        """Pick up to max_windows window rows per text, always including the first and last"""
+        rows_by_text = defaultdict(list)
+        for row, text_idx in enumerate(sample_map):
+            rows_by_text[text_idx].append(row)
+        
+        keep = []
+        for rows in rows_by_text.values():
+            if len(rows) <= max_windows:
+                keep.extend(rows)
+            elif max_windows == 1:
+                keep.append(rows[0])
+            else:
+                step = (len(rows) - 1) / (max_windows - 1)
+                keep.extend(rows[round(i * step)] for i in range(max_windows))
+        return sorted(keep)
+    
+    def _pool_windows(self, probs: torch.Tensor, attention_mask: torch.Tensor, sample_map: List[int],
+                      num_texts: int, negative_index: Optional[int]) -> torch.Tensor:
+        """
+        Combine window probabilities into one distribution per text using ML_WINDOW_POOLING:
+        - mean: plain average over windows
+        - length-weighted: average weighted by real (non-padding) tokens per window
+        - max-negative: the window most confident in the negative class decides;
+          for models without a negative class this falls back to length-weighted
+        """
+        lengths = attention_mask.sum(dim=-1).to(probs.dtype)
+        map_tensor = torch.tensor(sample_map, device=probs.device)
+        
+        pooled = []
+        for text_idx in range(num_texts):
+            rows = (map_tensor == text_idx).nonzero(as_tuple=True)[0]
+            window_probs = probs[rows]
+            if self.window_pooling == "max-negative" and negative_index is not None:
+                pooled.append(window_probs[window_probs[:, negative_index].argmax()])
+            elif self.window_pooling in ("length-weighted", "max-negative"):
+                weights = lengths[rows]
+                pooled.append((window_probs * weights.unsqueeze(-1)).sum(dim=0) / weights.sum())
+            else:
+                pooled.append(window_probs.mean(dim=0))
+        return torch.stack(pooled)
+    
+    @staticmethod
+    def _decode_pooled(model, pooled: torch.Tensor, decode) -> List[Tuple[str, float]]:
+        scores, indices = pooled.max(dim=-1)
+        return [
+            (decode(model.config.id2label[int(idx)]), float(score))
+            for idx, score in zip(indices.tolist(), scores.tolist())
+        ]
+    
+    def _find_negative_index(self) -> Optional[int]:
+        """Class index of the negative sentiment label, used by max-negative pooling"""
+        for idx, label in self.sentiment_model.config.id2label.items():
+            try:
+                if self._decode_sentiment_label(label).lower() in ('negative', 'neg'):
+                    return int(idx)
+            except Exception:
+                continue
+        return None
+    
+    def _decode_sentiment_label(self, label: str) -> str:
+        """Map a raw model label to the sentiment name"""
+        # Check if label is already a string (e.g., 'Positive', 'Negative')
+        if label.startswith('LABEL_'):
+            # Extract index and use label encoder
+            label_idx = int(label.split('_')[-1])
+            return self.sentiment_label_encoder.inverse_transform([label_idx])[0]
+        # Label is already the sentiment name
+        return label
+    
+    def _decode_department_label(self, label: str) -> str:
+        """Map a raw model label to the department name"""
+        label_idx = int(label.split('_')[-1])
+        return self.department_label_encoder.inverse_transform([label_idx])[0]
     
     def analyze_text(self, text: str) -> Dict[str, any]:
         """
         Perform complete analysis: sentiment + department classification
         Returns: dict with both predictions
         """
-        sentiment, sentiment_score = self.predict_sentiment(text)
-        department, department_score = self.predict_department(text)
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+        """
+        Perform complete analysis for several texts, running each model once
+        over the whole batch instead of once per text
+        Returns: list of prediction dicts, in the same order as texts
+        """
+        if not texts:
+            return []
         
-        return {
-            "sentiment": sentiment,
-            "sentiment_score": float(sentiment_score),
-            "department": department,
-            "department_score": float(department_score)
-        }
+        if self.shared_encodings and self.long_document_mode:
+            sentiments, departments = self._predict_windowed_shared(texts)
+        elif self.shared_encodings:
+            sentiments, departments = self._predict_with_shared_encodings(texts)
+        else:
+            sentiments = self.predict_sentiment_batch(texts)
+            departments = self.predict_department_batch(texts)
+        
+        return [
+            {
+                "sentiment": sentiment,
+                "sentiment_score": float(sentiment_score),
+                "department": department,
+                "department_score": float(department_score)
+            }
+            for (sentiment, sentiment_score), (department, department_score) in zip(sentiments, departments)
+        ]
+
+
+class InferenceBatcher:
+    """
+    Async micro-batcher in front of MLInferenceService.analyze_batch.
+    
+    Concurrent callers are collected for up to max_wait_ms (or until
+    max_batch_size texts are waiting) and analyzed as one batch; each caller
+    gets its own result back on its own future.
+    """
+    
+    def __init__(self, service: MLInferenceService, max_batch_size: int, max_wait_ms: float):
+        self.service = service
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, text: str) -> Dict[str, any]:
+        """Queue a text for analysis and wait for its result"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def stop(self):
+        """Cancel the batching worker (pending callers get CancelledError)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+            self._queue = None
+    
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+    
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one request, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            # Anything already queued joins without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            # Drop callers that gave up while waiting
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            
+            texts = [text for text, _ in batch]
+            try:
+                # Forward passes are CPU-bound; run them on the model worker pool
+                results = await model_executor.run(analyze_batch_task, texts)
+            except Exception as e:
+                logger.error(f"Batched inference failed for {len(texts)} texts: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            logger.debug(f"Analyzed micro-batch of {len(texts)} texts")
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
 
 
 # Global instance
 ml_service = MLInferenceService()
+ml_batcher = InferenceBatcher(
+    ml_service,
+    max_batch_size=settings.ML_BATCH_MAX_SIZE,
+    max_wait_ms=settings.ML_BATCH_MAX_WAIT_MS
+)
@@ -0,0 +1,246 @@
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ExecutorOverloaded(Exception):
+    """Raised when the model execution queue is full"""
+
+
+def _torch_threads_per_worker(workers: int) -> int:
+    configured = settings.MODEL_EXECUTOR_TORCH_THREADS
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _init_thread_worker(torch_threads: int):
+    """Thread mode: intra-op threads are process-wide, so this caps all workers together"""
+    import torch
+    torch.set_num_threads(torch_threads)
+
+
+def _init_process_worker(torch_threads: int):
+    """Process mode: pin intra-op threads and load the models once per worker process"""
+    import logging as worker_logging
+    worker_logging.basicConfig(
+        level=worker_logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # Keep BLAS/OpenMP pools in step with torch so workers don't oversubscribe cores
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+
+    import torch
+    torch.set_num_threads(torch_threads)
+
+    from app.services.ml_service import ml_service
+    ml_service.load_models()
+
+
+# Task functions run inside the workers; they are module-level so process
+# pools can pickle them, and import services lazily to avoid import cycles.
+
+def analyze_batch_task(texts: List[str]) -> List[Dict[str, Any]]:
+    from app.services.ml_service import ml_service
+    return ml_service.analyze_batch(texts)
+
+
+def detect_and_translate_task(content: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    from app.services.language_service import language_service
+    detected_lang = language_service.detect_language(content)
+    return detected_lang, language_service.translate_to_english(content, detected_lang)
+
+
+def _worker_ready_task() -> Dict[str, Any]:
+    from app.services.ml_service import ml_service
+    return {
+        "pid": os.getpid(),
+        "models": ml_service.get_load_state(),
+        "inference_path": ml_service.inference_path,
+        "backend": ml_service.backend_info,
+    }
+
+
+class ModelExecutor:
+    """
+    Runs CPU-bound model work (inference, translation) off the event loop.
+
+    MODEL_EXECUTOR_MODE selects a thread pool sharing the models loaded in the
+    API process, or a process pool where each worker loads its own copy once.
+    Calls beyond MODEL_EXECUTOR_MAX_QUEUE in flight are rejected with
+    ExecutorOverloaded, and each call is bounded by a timeout.
+    """
+
+    def __init__(self):
+        self.mode = settings.MODEL_EXECUTOR_MODE
+        if self.mode not in ("thread", "process"):
+            logger.warning(f"Unknown MODEL_EXECUTOR_MODE '{self.mode}', using 'thread'")
+            self.mode = "thread"
+        self.workers = max(1, settings.MODEL_EXECUTOR_WORKERS)
+        self.torch_threads = _torch_threads_per_worker(self.workers)
+        self.max_queue = max(1, settings.MODEL_EXECUTOR_MAX_QUEUE)
+        self.timeout = settings.MODEL_EXECUTOR_TIMEOUT_SECONDS
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        # Process mode: model load state reported by each worker
+        self.worker_load_state: Dict[int, Dict[str, Any]] = {}
+        # Process mode: inference path and backend as resolved inside the workers
+        self.worker_backend: Dict[int, Dict[str, Any]] = {}
+        self._workers_ready = False
+        self._load_error: Optional[str] = None
+        self.stats = {"completed": 0, "failed": 0, "timeouts": 0, "rejected": 0}
+
+    @property
+    def loads_models_in_workers(self) -> bool:
+        return self.mode == "process"
+
+    def start(self):
+        """Create the worker pool (idempotent)"""
+        if self._executor is not None:
+            return
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(self.torch_threads,)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="model-worker",
+                initializer=_init_thread_worker,
+                initargs=(self.torch_threads,)
+            )
+        logger.info(
+            f"✓ Model executor started: {self.workers} {self.mode} workers, "
+            f"{self.torch_threads} torch threads each, queue limit {self.max_queue}"
+        )
+
+    async def load_models(self):
+        """
+        Load the models wherever inference runs: in the API process for thread
+        mode, or once in every worker for process mode
+        """
+        try:
+            if self.mode == "process":
+                await self._warm_up_workers()
+            else:
+                from app.services.ml_service import ml_service
+                await asyncio.to_thread(ml_service.load_models)
+        except Exception as e:
+            self._load_error = str(e)
+            raise
+
+    async def _warm_up_workers(self):
+        """Spawn every worker now so model loading happens before traffic"""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        workers = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _worker_ready_task) for _ in range(self.workers)
+        ])
+        for worker in workers:
+            self.worker_load_state[worker["pid"]] = worker["models"]
+            self.worker_backend[worker["pid"]] = {
+                "inference_path": worker["inference_path"],
+                "backend": worker["backend"],
+            }
+        self._workers_ready = True
+        logger.info(
+            f"✓ Model workers ready (pids {sorted(self.worker_load_state)}) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    @property
+    def load_error(self) -> Optional[str]:
+        return self._load_error
+
+    def models_ready(self) -> bool:
+        """True once the classifiers can serve requests"""
+        if self.mode == "process":
+            return self._workers_ready
+        from app.services.ml_service import ml_service
+        return ml_service.is_ready()
+
+    def backend_state(self) -> Dict[str, Any]:
+        """
+        Inference path and backend where inference actually runs: the API
+        process in thread mode, the workers in process mode (where the API
+        process never loads the models)
+        """
+        if self.mode == "thread":
+            from app.services.ml_service import ml_service
+            return {"inference_path": ml_service.inference_path, "backend": ml_service.backend_info}
+        if not self.worker_backend:
+            return {"inference_path": None, "backend": None}
+        states = list(self.worker_backend.values())
+        if all(state == states[0] for state in states):
+            return dict(states[0])
+        return {"inference_path": "mixed", "backend": "mixed", "workers": {str(pid): state for pid, state in self.worker_backend.items()}}
+
+    def load_state(self) -> Dict[str, Any]:
+        """Per-model load state and load times, for the readiness endpoint"""
+        if self.mode == "process":
+            state = {"workers": {str(pid): models for pid, models in self.worker_load_state.items()}}
+        else:
+            from app.services.ml_service import ml_service
+            state = {"models": ml_service.get_load_state()}
+        if self._load_error:
+            state["error"] = self._load_error
+        return {"mode": self.mode, **state}
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run fn(*args) on a model worker and await its result"""
+        if self._executor is None:
+            self.start()
+        if self._in_flight >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise ExecutorOverloaded(
+                f"Model executor queue is full ({self._in_flight} calls in flight), try again later"
+            )
+
+        self._in_flight += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            result = await asyncio.wait_for(future, timeout or self.timeout)
+            self.stats["completed"] += 1
+            return result
+        except asyncio.TimeoutError:
+            # The worker finishes the call in the background; its result is discarded
+            self.stats["timeouts"] += 1
+            logger.error(f"{getattr(fn, '__name__', fn)} timed out after {timeout or self.timeout}s")
+            raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "torch_threads_per_worker": self.torch_threads,
+            "in_flight": self._in_flight,
+            "max_queue": self.max_queue,
+            **self.stats
+        }
+
+
+# Global instance
+model_executor = ModelExecutor()
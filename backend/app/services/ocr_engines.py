@@ -0,0 +1,88 @@
+import numpy as np
+from PIL import Image
+from typing import Dict, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+OCR_ENGINES = ("auto", "tesserocr", "pytesseract")
+
+
+class PytesseractEngine:
+    """
+    Tesseract CLI via pytesseract: every call writes a temp image, starts a
+    tesseract process and reloads the traineddata. Always available
+    """
+
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd: str = ""):
+        import pytesseract
+        self._pytesseract = pytesseract
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def image_to_string(self, image: np.ndarray, lang: str, psm: int = 6) -> str:
+        return self._pytesseract.image_to_string(image, lang=lang, config=f'--psm {psm}')
+
+
+class TesserocrEngine:
+    """
+    In-process Tesseract via tesserocr. Initialized API handles are kept per
+    thread and per (language, page segmentation mode), so traineddata is
+    loaded once per worker instead of once per page, and pixels are handed
+    over in memory
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata_path: str = ""):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.tessdata_path = tessdata_path or None
+        self._local = threading.local()
+
+    def _api(self, lang: str, psm: int):
+        apis: Dict[Tuple[str, int], object] = self._local.__dict__.setdefault("apis", {})
+        key = (lang, psm)
+        if key not in apis:
+            kwargs = {"lang": lang, "psm": psm}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            apis[key] = self._tesserocr.PyTessBaseAPI(**kwargs)
+            logger.info(f"Initialized Tesseract API for {lang} (psm {psm}) in {threading.current_thread().name}")
+        return apis[key]
+
+    def image_to_string(self, image: np.ndarray, lang: str, psm: int = 6) -> str:
+        api = self._api(lang, psm)
+        if image.ndim == 2:
+            pixels = np.ascontiguousarray(image, dtype=np.uint8)
+            height, width = pixels.shape
+            api.SetImageBytes(pixels.tobytes(), width, height, 1, width)
+        else:
+            api.SetImage(Image.fromarray(image))
+        try:
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+
+def create_ocr_engine(name: str, tesseract_cmd: str = "", tessdata_path: str = ""):
+    """
+    Build the configured OCR engine:
+    - tesserocr: in-process API handles (requires the optional tesserocr package)
+    - pytesseract: tesseract subprocess per call
+    - auto: tesserocr when importable, else pytesseract
+    """
+    if name not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR engine '{name}', expected one of {OCR_ENGINES}")
+
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine(tessdata_path)
+        except ImportError:
+            log = logger.warning if name == "tesserocr" else logger.info
+            log("tesserocr is not installed, using the pytesseract engine")
+
+    return PytesseractEngine(tesseract_cmd)
@@ -1,25 +1,118 @@
-import pytesseract
-from pdf2image import convert_from_path, convert_from_bytes
-from PIL import Image
+from pdf2image import convert_from_path, convert_from_bytes, pdfinfo_from_path, pdfinfo_from_bytes
+from PIL import Image, ImageOps
 import cv2
 import numpy as np
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import io
 import logging
-from typing import List, Dict
+import multiprocessing
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import os
 from app.config import get_settings
+from app.services.ocr_engines import create_ocr_engine, PytesseractEngine
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# pdfinfo reports e.g. "595.276 x 841.89 pts (A4)"; A4 is assumed when it doesn't
+PAGE_SIZE_PATTERN = re.compile(r'([\d.]+)\s*x\s*([\d.]+)\s*pts')
+A4_POINTS = (595.0, 842.0)
+
+
+def _init_ocr_worker(threads: int):
+    """One Tesseract/OpenCV thread per worker so parallel pages don't oversubscribe cores"""
+    os.environ["OMP_THREAD_LIMIT"] = str(threads)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    cv2.setNumThreads(threads)
+
+
+def ocr_page_task(page_number: int, image: np.ndarray, language: str, profile: str = "auto") -> Dict[str, any]:
+    """
+    OCR a single page inside an OCR worker. Errors are returned, not raised,
+    so one bad page doesn't fail the document
+    """
+    started = time.perf_counter()
+    engine = None
+    try:
+        engine = ocr_service.engine.name
+        text, profile = ocr_service._ocr_image(image, language, profile)
+        error = None
+    except Exception as e:
+        text, error = "", f"{type(e).__name__}: {e}"
+    return {
+        "page": page_number,
+        "text": text,
+        "seconds": round(time.perf_counter() - started, 3),
+        "error": error,
+        "method": "ocr",
+        "profile": profile,
+        "engine": engine
+    }
+
+
+# Layout analysis runs on a copy downscaled to this long side
+LAYOUT_ANALYSIS_SIDE = 1600
+
+
+# Preprocessing profiles: none (grayscale only), fast (deskew + adaptive
+# threshold), thorough (deskew + NL-means denoise + adaptive threshold), or
+# auto (picked per image from noise, contrast and skew)
+PREPROCESSING_PROFILES = ("none", "fast", "thorough", "auto")
+
+# Unicode ranges a text layer should contain for each Tesseract language.
+# Legacy (non-Unicode) Indic fonts extract as Latin gibberish, so a Hindi PDF
+# whose text layer has no Devanagari is treated as unreadable.
+LANGUAGE_SCRIPT_RANGES = {
+    'hin': (0x0900, 0x097F),
+    'mar': (0x0900, 0x097F),
+    'ben': (0x0980, 0x09FF),
+    'pan': (0x0A00, 0x0A7F),
+    'guj': (0x0A80, 0x0AFF),
+    'tam': (0x0B80, 0x0BFF),
+    'tel': (0x0C00, 0x0C7F),
+    'kan': (0x0C80, 0x0CFF),
+    'mal': (0x0D00, 0x0D7F),
+}
+# Characters typical of broken extraction: replacement char, private use area, "(cid:NN)" glyph ids
+BAD_EXTRACTION_PATTERN = re.compile(r'[\ufffd\ue000-\uf8ff]|\(cid:\d+\)')
+
+
+def text_layer_quality(text: str, language: str = 'eng') -> float:
+    """
+    Score (0-1) how usable an extracted PDF text layer is: share of
+    printable word characters, minus broken glyphs, and zero when the
+    expected script for the language is missing
+    """
+    visible = [ch for ch in text if not ch.isspace()]
+    if not visible:
+        return 0.0
+    
+    bad = sum(len(match) for match in BAD_EXTRACTION_PATTERN.findall(text))
+    readable = sum(1 for ch in visible if ch.isalnum() or ch in '.,;:!?()[]\'"‘’“”-–—/%&₹@#*•' or 0x0900 <= ord(ch) <= 0x0D7F)
+    score = max(0.0, (readable - bad) / len(visible))
+    
+    script_range = LANGUAGE_SCRIPT_RANGES.get(language)
+    if script_range and not any(script_range[0] <= ord(ch) <= script_range[1] for ch in visible):
+        return 0.0
+    return score
+
 
 class OCRService:
     """Service for extracting text from PDFs and images using Tesseract OCR"""
     
     def __init__(self):
-        # Set Tesseract path if specified in config
-        if settings.TESSERACT_CMD:
-            pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
+        # Recognition engine (tesserocr / pytesseract), created per process on first use
+        self.engine_name = settings.OCR_ENGINE
+        self._engine = None
+        self._fallback_engine = None
+        self._engine_lock = threading.Lock()
         
         # Supported Indian languages in Tesseract
         # Make sure these language packs are installed: tesseract-ocr-hin, tesseract-ocr-kan, etc.
@@ -35,8 +128,41 @@ class OCRService:
             'mal',  # Malayalam
             'pan',  # Punjabi
         ]
+        
+        # Page-parallel OCR pool, created on first use
+        self.workers = settings.OCR_WORKERS if settings.OCR_WORKERS > 0 else (os.cpu_count() or 1)
+        self.threads_per_worker = max(1, settings.OCR_THREADS_PER_WORKER)
+        self.page_timeout = settings.OCR_PAGE_TIMEOUT_SECONDS
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        
+        # Born-digital pages use their embedded text layer instead of OCR
+        self.text_layer_enabled = settings.OCR_TEXT_LAYER_ENABLED
+        self.text_layer_min_chars = settings.OCR_TEXT_LAYER_MIN_CHARS
+        self.text_layer_min_quality = settings.OCR_TEXT_LAYER_MIN_QUALITY
+        
+        # Preprocessing profile selection and image size limits
+        self.default_profile = settings.OCR_PREPROCESSING_PROFILE
+        if self.default_profile not in PREPROCESSING_PROFILES:
+            logger.warning(f"Unknown OCR_PREPROCESSING_PROFILE '{self.default_profile}', using 'auto'")
+            self.default_profile = "auto"
+        self.noisy_threshold = settings.OCR_AUTO_NOISE_THRESHOLD
+        self.clean_threshold = settings.OCR_AUTO_CLEAN_NOISE
+        self.min_contrast = settings.OCR_AUTO_MIN_CONTRAST
+        self.deskew_min_degrees = settings.OCR_DESKEW_MIN_DEGREES
+        self.max_image_side = settings.OCR_MAX_IMAGE_SIDE
+        self.min_image_side = settings.OCR_MIN_IMAGE_SIDE
+        
+        # Layout analysis: OCR only the text blocks of uploaded images, in reading order
+        self.layout_enabled = settings.OCR_LAYOUT_ANALYSIS
+        self.layout_min_region_area = settings.OCR_LAYOUT_MIN_REGION_AREA
+        
+        # Rasterization: pages are rendered in windows sized to the memory budget
+        self.dpi = settings.OCR_DPI
+        self.grayscale = settings.OCR_GRAYSCALE
+        self.memory_budget_bytes = max(1, settings.OCR_MEMORY_BUDGET_MB) * 1024 * 1024
     
-    def extract_text_from_pdf(self, pdf_path: str, language: str = 'eng') -> Dict[str, any]:
+    def extract_text_from_pdf(self, pdf_path: str, language: str = 'eng', profile: Optional[str] = None) -> Dict[str, any]:
         """
         Extract text from PDF file using OCR
         Args:
@@ -45,85 +171,214 @@ class OCRService:
         Returns: dict with extracted text
         """
         try:
-            # Convert PDF to images
             logger.info(f"Converting PDF to images: {pdf_path}")
-            images = convert_from_path(pdf_path, dpi=300)
-            
-            # Extract text from each page
-            all_text = []
-            for i, image in enumerate(images):
-                logger.info(f"Processing page {i+1}/{len(images)}")
-                
-                # Preprocess image for better OCR
-                processed_image = self._preprocess_image(np.array(image))
-                
-                # Perform OCR with language support
-                lang_codes = '+'.join([language, 'eng'])  # Always include English
-                text = pytesseract.image_to_string(
-                    processed_image,
-                    lang=lang_codes,
-                    config='--psm 6'  # Assume uniform block of text
-                )
-                all_text.append(text)
-            
-            combined_text = '\n\n'.join(all_text)
+            result = self._collect_pages(self.iter_pdf_path_pages(pdf_path, language, profile), language)
             
-            logger.info(f"✓ Extracted {len(combined_text)} characters from PDF")
-            
-            return {
-                "text": combined_text,
-                "num_pages": len(images),
-                "language": language
-            }
+            logger.info(f"✓ Extracted {len(result['text'])} characters from PDF")
+            return result
             
         except Exception as e:
             logger.error(f"Error extracting text from PDF {pdf_path}: {e}")
             raise
     
-    def extract_text_from_pdf_bytes(self, pdf_bytes: bytes, language: str = 'eng') -> Dict[str, any]:
+    def extract_text_from_pdf_bytes(self, pdf_bytes: bytes, language: str = 'eng', profile: Optional[str] = None) -> Dict[str, any]:
         """
         Extract text from PDF bytes (for uploaded files)
         """
         try:
-            images = convert_from_bytes(pdf_bytes, dpi=300)
-            
-            all_text = []
-            for i, image in enumerate(images):
-                processed_image = self._preprocess_image(np.array(image))
-                lang_codes = '+'.join([language, 'eng'])
-                text = pytesseract.image_to_string(
-                    processed_image,
-                    lang=lang_codes,
-                    config='--psm 6'
-                )
-                all_text.append(text)
-            
-            combined_text = '\n\n'.join(all_text)
-            
-            return {
-                "text": combined_text,
-                "num_pages": len(images),
-                "language": language
-            }
+            return self._collect_pages(self.iter_pdf_pages(pdf_bytes, language, profile), language)
             
         except Exception as e:
             logger.error(f"Error extracting text from PDF bytes: {e}")
             raise
     
-    def extract_text_from_image(self, image_path: str, language: str = 'eng') -> str:
+    def iter_pdf_pages(self, pdf_bytes: bytes, language: str = 'eng', profile: Optional[str] = None) -> Iterator[Dict[str, any]]:
         """
-        Extract text from image file
+        Extract an uploaded PDF, yielding one result per page in page order
+        ({"page", "text", "seconds", "error", "method"}) as soon as it is ready.
+        method is "text_layer" for pages read from the embedded text, "ocr"
+        for pages that were rasterized and OCR'd
         """
-        try:
-            image = Image.open(image_path)
-            processed_image = self._preprocess_image(np.array(image))
+        info = pdfinfo_from_bytes(pdf_bytes)
+        text_layer = self._extract_text_layer_bytes(pdf_bytes) if self.text_layer_enabled else None
+        render = lambda first, last, dpi: convert_from_bytes(
+            pdf_bytes, dpi=dpi, first_page=first, last_page=last, grayscale=self.grayscale
+        )
+        return self._iter_pages(render, info, language, text_layer, profile)
+    
+    def iter_pdf_path_pages(self, pdf_path: str, language: str = 'eng', profile: Optional[str] = None) -> Iterator[Dict[str, any]]:
+        """Same as iter_pdf_pages for a PDF on disk"""
+        info = pdfinfo_from_path(pdf_path)
+        text_layer = self._extract_text_layer(pdf_path) if self.text_layer_enabled else None
+        render = lambda first, last, dpi: convert_from_path(
+            pdf_path, dpi=dpi, first_page=first, last_page=last, grayscale=self.grayscale
+        )
+        return self._iter_pages(render, info, language, text_layer, profile)
+    
+    def _iter_pages(
+        self,
+        render: Callable[[int, int, int], List[Image.Image]],
+        info: Dict,
+        language: str,
+        text_layer: Optional[List[str]] = None,
+        profile: Optional[str] = None
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Yield pages in order: pages whose text layer passes the quality check
+        directly, the rest rendered a window at a time and OCR'd on the page
+        pool in parallel. At most `window` rendered pages are alive at once
+        (waiting for or inside OCR); each is released as soon as its result
+        is yielded
+        """
+        num_pages = int(info.get("Pages", 0))
+        dpi = self._page_dpi(info)
+        window = self._window_size(info, dpi)
+        profile = profile or self.default_profile
+        
+        text_pages = self._usable_text_layer_pages(text_layer, num_pages, language)
+        ocr_pages = [number for number in range(1, num_pages + 1) if number not in text_pages]
+        logger.info(
+            f"PDF has {num_pages} pages: {len(text_pages)} from the text layer, "
+            f"{len(ocr_pages)} to OCR ({window} in flight at {dpi} DPI, profile {profile})"
+        )
+        
+        pending: "deque[tuple]" = deque()
+        next_ocr = 0
+        for number in range(1, num_pages + 1):
+            # Keep the pool busy: render the next run of consecutive OCR pages that fits the window
+            while next_ocr < len(ocr_pages) and len(pending) < window:
+                first_page = last_page = ocr_pages[next_ocr]
+                while (next_ocr + 1 < len(ocr_pages) and ocr_pages[next_ocr + 1] == last_page + 1
+                       and last_page - first_page + 1 < window - len(pending)):
+                    next_ocr += 1
+                    last_page = ocr_pages[next_ocr]
+                next_ocr += 1
+                try:
+                    images = render(first_page, last_page, dpi)
+                    render_error = "render returned no image for this page (truncated or damaged PDF?)"
+                except Exception as e:
+                    images, render_error = [], f"{type(e).__name__}: {e}"
+                # A damaged PDF can render fewer pages than asked for: those pages fail alone
+                for page_number in range(first_page, last_page + 1):
+                    if page_number - first_page < len(images):
+                        image = np.asarray(images[page_number - first_page])
+                        pending.append((page_number, self._submit(ocr_page_task, page_number, image, language, profile)))
+                    else:
+                        pending.append((page_number, render_error))
+                del images
             
-            lang_codes = '+'.join([language, 'eng'])
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang=lang_codes,
-                config='--psm 6'
+            if number in text_pages:
+                yield {"page": number, "text": text_pages[number], "seconds": 0.0, "error": None, "method": "text_layer"}
+            else:
+                page_number, future = pending.popleft()
+                if isinstance(future, str):
+                    yield {"page": page_number, "text": "", "seconds": None, "error": future, "method": "ocr"}
+                else:
+                    yield self._page_result(page_number, future)
+    
+    def _usable_text_layer_pages(self, text_layer: Optional[List[str]], num_pages: int, language: str) -> Dict[int, str]:
+        """Page number -> embedded text for pages whose text layer is good enough to skip OCR"""
+        if not text_layer:
+            return {}
+        usable = {}
+        for number, text in enumerate(text_layer[:num_pages], start=1):
+            if len(text.strip()) >= self.text_layer_min_chars and text_layer_quality(text, language) >= self.text_layer_min_quality:
+                usable[number] = text.strip()
+        return usable
+    
+    def _extract_text_layer_bytes(self, pdf_bytes: bytes) -> Optional[List[str]]:
+        # pdftotext needs a seekable file
+        handle, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                f.write(pdf_bytes)
+            return self._extract_text_layer(path)
+        finally:
+            os.unlink(path)
+    
+    def _extract_text_layer(self, pdf_path: str) -> Optional[List[str]]:
+        """
+        Embedded text of every page via poppler's pdftotext (installed with
+        pdf2image's poppler dependency); pages are separated by form feeds.
+        Returns None when the tool is missing or fails
+        """
+        try:
+            completed = subprocess.run(
+                ["pdftotext", "-enc", "UTF-8", pdf_path, "-"],
+                capture_output=True,
+                timeout=60
             )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"pdftotext unavailable, OCR'ing every page: {e}")
+            return None
+        if completed.returncode != 0:
+            logger.warning(f"pdftotext failed ({completed.returncode}): {completed.stderr[:200]!r}")
+            return None
+        return completed.stdout.decode("utf-8", errors="replace").split("\f")
+    
+    @staticmethod
+    def _page_points(info: Dict) -> Tuple[float, float]:
+        match = PAGE_SIZE_PATTERN.search(str(info.get("Page size", "")))
+        return (float(match.group(1)), float(match.group(2))) if match else A4_POINTS
+    
+    def _page_dpi(self, info: Dict) -> int:
+        """
+        Rendering DPI: OCR_DPI, lowered for large-format pages (broadsheets,
+        posters) so the long side stays within OCR_MAX_IMAGE_SIDE pixels
+        """
+        long_side_inches = max(self._page_points(info)) / 72
+        return max(72, min(self.dpi, int(self.max_image_side / long_side_inches)))
+    
+    def _window_size(self, info: Dict, dpi: int) -> int:
+        """Pages that fit in the memory budget at the given DPI, capped at two per worker"""
+        width_pts, height_pts = self._page_points(info)
+        channels = 1 if self.grayscale else 3
+        # x2: the rendered image plus the array copy handed to the pool
+        page_bytes = (width_pts / 72 * dpi) * (height_pts / 72 * dpi) * channels * 2
+        return max(1, min(int(self.memory_budget_bytes // page_bytes), self.workers * 2))
+    
+    def _page_result(self, number: int, future: Future) -> Dict[str, any]:
+        try:
+            return future.result(timeout=self.page_timeout)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._reset_pool()
+            return {"page": number, "text": "", "seconds": None, "error": f"{type(e).__name__}: {e}", "method": "ocr"}
+    
+    def _collect_pages(self, pages_iter: Iterator[Dict[str, any]], language: str) -> Dict[str, any]:
+        """Drain a page iterator into the combined result dict"""
+        started = time.perf_counter()
+        pages = list(pages_iter)
+        
+        failed = [page["page"] for page in pages if page["error"]]
+        if failed:
+            logger.warning(f"OCR failed on pages {failed}: {[page['error'] for page in pages if page['error']]}")
+        if pages and len(failed) == len(pages):
+            raise RuntimeError(f"OCR failed on every page: {pages[0]['error']}")
+        
+        elapsed = time.perf_counter() - started
+        ocr_count = sum(1 for page in pages if page["method"] == "ocr")
+        logger.info(f"✓ Extracted {len(pages)} pages in {elapsed:.1f}s ({ocr_count} OCR'd on {self.workers} workers)")
+        
+        return {
+            "text": '\n\n'.join(page["text"] for page in pages),
+            "num_pages": len(pages),
+            "language": language,
+            "pages": [
+                {key: page.get(key) for key in ("page", "method", "profile", "engine", "seconds", "error")}
+                for page in pages
+            ],
+            "ocr_seconds": round(elapsed, 3)
+        }
+    
+    def extract_text_from_image(self, image_path: str, language: str = 'eng', profile: Optional[str] = None) -> str:
+        """
+        Extract text from image file
+        """
+        try:
+            profile = profile or self.default_profile
+            crops = self.text_region_crops(self._load_image(Image.open(image_path)), profile)
+            text = '\n\n'.join(self._ocr_image(crop, language, profile)[0].strip() for crop in crops)
             
             logger.info(f"✓ Extracted {len(text)} characters from image")
             return text
@@ -132,57 +387,383 @@ class OCRService:
             logger.error(f"Error extracting text from image {image_path}: {e}")
             raise
     
-    def extract_text_from_image_bytes(self, image_bytes: bytes, language: str = 'eng') -> str:
+    def extract_text_from_image_bytes(self, image_bytes: bytes, language: str = 'eng', profile: Optional[str] = None) -> str:
         """
-        Extract text from image bytes (for uploaded files)
+        Extract text from image bytes (for uploaded files). Detected text
+        regions are OCR'd in parallel on the OCR pool and joined in reading order
         """
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            processed_image = self._preprocess_image(np.array(image))
+            profile = profile or self.default_profile
+            crops = self.text_region_crops(self._load_image(Image.open(io.BytesIO(image_bytes))), profile)
+            futures = [
+                self._submit(ocr_page_task, number, crop, language, profile)
+                for number, crop in enumerate(crops, start=1)
+            ]
+            regions = [self._page_result(number, future) for number, future in enumerate(futures, start=1)]
             
-            lang_codes = '+'.join([language, 'eng'])
-            text = pytesseract.image_to_string(
-                processed_image,
-                lang=lang_codes,
-                config='--psm 6'
-            )
+            failed = [region for region in regions if region["error"]]
+            if len(failed) == len(regions):
+                raise RuntimeError(failed[0]["error"])
+            if failed:
+                logger.warning(f"OCR failed on {len(failed)} of {len(regions)} image regions: {failed[0]['error']}")
             
-            return text
+            return '\n\n'.join(region["text"].strip() for region in regions if region["text"].strip())
             
         except Exception as e:
             logger.error(f"Error extracting text from image bytes: {e}")
             raise
     
-    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
+    def _ocr_image(self, image: np.ndarray, language: str, profile: str = "auto") -> Tuple[str, str]:
         """
-        Preprocess image for better OCR accuracy
-        - Convert to grayscale
-        - Apply thresholding
-        - Denoise
+        Preprocess and OCR one page image
+        Returns: (text, profile actually applied)
         """
+        processed_image, profile, _ = self.prepare_image(image, profile)
+        lang_codes = '+'.join(dict.fromkeys([language, 'eng']))  # Always include English
+        text = self.recognize(processed_image, lang_codes, psm=6)  # Assume uniform block of text
+        return text, profile
+    
+    @property
+    def engine(self):
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = create_ocr_engine(
+                        self.engine_name, settings.TESSERACT_CMD, settings.OCR_TESSDATA_PATH
+                    )
+                    logger.info(f"✓ OCR engine: {self._engine.name}")
+        return self._engine
+    
+    def recognize(self, image: np.ndarray, lang_codes: str, psm: int = 6) -> str:
+        """
+        Run Tesseract on an already preprocessed image with the configured
+        engine, falling back to pytesseract if the in-process engine fails
+        (e.g. it can't find the traineddata for this language combination)
+        """
+        engine = self.engine
+        try:
+            return engine.image_to_string(image, lang_codes, psm)
+        except Exception as e:
+            if isinstance(engine, PytesseractEngine):
+                raise
+            logger.warning(f"{engine.name} failed for {lang_codes} ({e}), falling back to pytesseract")
+            if self._fallback_engine is None:
+                self._fallback_engine = PytesseractEngine(settings.TESSERACT_CMD)
+            return self._fallback_engine.image_to_string(image, lang_codes, psm)
+    
+    def _load_image(self, image: Image.Image) -> np.ndarray:
+        """
+        Decode an uploaded image as grayscale, upright (EXIF orientation) and,
+        for JPEGs, already reduced toward OCR_MAX_IMAGE_SIDE while decoding
+        """
+        if image.format == "JPEG":
+            image.draft("L", (self.max_image_side, self.max_image_side))
+        image = ImageOps.exif_transpose(image)
+        return np.asarray(image.convert("L"))
+    
+    def _submit(self, fn, *args):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                    initargs=(self.threads_per_worker,)
+                )
+                logger.info(f"✓ OCR pool started: {self.workers} workers, {self.threads_per_worker} threads each")
+            return self._pool.submit(fn, *args)
+    
+    def _reset_pool(self):
+        """Drop a broken pool (a worker crashed); the next call starts a fresh one"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+    
+    def shutdown(self):
+        self._reset_pool()
+    
+    def text_region_crops(self, image: np.ndarray, profile: str = "auto") -> List[np.ndarray]:
+        """
+        Split an image into its text blocks, in reading order. Falls back to
+        the whole image when layout analysis is off, finds nothing, or the
+        blocks cover nearly all of it
+        """
+        if not self.layout_enabled:
+            return [image]
+        
+        gray = self._to_gray(image)
+        if profile != "none":
+            # Deskew the page first: tilted lines would merge across columns
+            skew = self._estimate_skew(gray)
+            if abs(skew) >= self.deskew_min_degrees:
+                gray = self._rotate(gray, skew)
+        
         try:
-            # Convert to grayscale if needed
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            regions = self.detect_text_regions(gray)
+        except Exception as e:
+            logger.warning(f"Layout analysis failed: {e}, OCR'ing the whole image")
+            return [gray]
+        
+        covered = sum(w * h for _, _, w, h in regions) / float(gray.shape[0] * gray.shape[1])
+        if not regions or covered > 0.9:
+            return [gray]
+        
+        logger.info(f"Layout analysis: {len(regions)} text regions covering {covered:.0%} of the image")
+        return [gray[y:y + h, x:x + w] for x, y, w, h in regions]
+    
+    def detect_text_regions(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Find text blocks with morphology: binarize a downscaled copy, estimate
+        the character height, close gaps between characters and words (but
+        not column gutters) and between lines, then keep the connected blocks
+        that look like text rather than photos or rules
+        Returns: (x, y, w, h) boxes in full-image coordinates, in reading order
+        """
+        h, w = gray.shape[:2]
+        scale = min(1.0, LAYOUT_ANALYSIS_SIDE / max(h, w))
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+        _, ink = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        
+        char_height = self._char_height(ink)
+        if char_height is None:
+            return []
+        
+        # Bridge letter and word spacing of body text, then join the words of
+        # larger type (headlines) relative to their own height
+        words = cv2.morphologyEx(
+            ink, cv2.MORPH_CLOSE,
+            cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, int(char_height * 1.2)), 1))
+        )
+        contours, _ = cv2.findContours(words, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        lines = np.zeros_like(ink)
+        for x, y, bw, bh in self._merge_line_boxes([cv2.boundingRect(contour) for contour in contours]):
+            cv2.rectangle(lines, (x, y), (x + bw - 1, y + bh - 1), 255, -1)
+        
+        # Bridge line spacing to get blocks
+        blocks = cv2.morphologyEx(
+            lines, cv2.MORPH_CLOSE,
+            cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(3, int(char_height * 1.5))))
+        )
+        contours, _ = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        min_area = self.layout_min_region_area * small.shape[0] * small.shape[1]
+        boxes = []
+        for contour in contours:
+            x, y, bw, bh = cv2.boundingRect(contour)
+            if bw * bh < min_area or bh < char_height * 0.6 or bw < char_height:
+                continue
+            if self._looks_like_text(ink[y:y + bh, x:x + bw], char_height):
+                boxes.append((x, y, bw, bh))
+        
+        # Back to full resolution, with a margin so glyph edges aren't clipped
+        pad = char_height / 2
+        regions = []
+        for x, y, bw, bh in self._reading_order(boxes):
+            x0, y0 = max(0, int((x - pad) / scale)), max(0, int((y - pad) / scale))
+            x1, y1 = min(w, int((x + bw + pad) / scale)), min(h, int((y + bh + pad) / scale))
+            regions.append((x0, y0, x1 - x0, y1 - y0))
+        return regions
+    
+    @staticmethod
+    def _char_height(ink: np.ndarray) -> Optional[float]:
+        """Median height of glyph-sized connected components, None if there are too few"""
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        glyphs = heights[(heights >= 4) & (heights <= ink.shape[0] / 20) & (widths <= heights * 3)]
+        if len(glyphs) < 20:
+            return None
+        return float(np.median(glyphs))
+    
+    @staticmethod
+    def _merge_line_boxes(boxes: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        """
+        Merge boxes that sit on the same line with a gap under ~0.6 of their
+        height: word spacing scales with type size, column gutters don't
+        """
+        merged: List[List[int]] = []
+        for x, y, w, h in sorted(boxes):
+            for box in reversed(merged):
+                mx, my, mw, mh = box
+                overlap = min(y + h, my + mh) - max(y, my)
+                if overlap >= 0.5 * min(h, mh) and x - (mx + mw) <= 0.6 * min(h, mh):
+                    box[:] = [mx, min(y, my), max(x + w, mx + mw) - mx, max(y + h, my + mh) - min(y, my)]
+                    break
             else:
-                gray = image
+                merged.append([x, y, w, h])
+        return [tuple(box) for box in merged]
+    
+    @staticmethod
+    def _looks_like_text(ink: np.ndarray, char_height: float) -> bool:
+        """
+        Text blocks are sparse ink arranged in lines: moderate ink density and,
+        past a couple of lines, blank rows between the lines. Photos are
+        dense or have no line structure; rules are a few rows of solid ink
+        """
+        density = cv2.countNonZero(ink) / float(ink.size)
+        if not 0.03 <= density <= 0.55:
+            return False
+        if ink.shape[0] <= char_height * 4:
+            return True
+        row_ink = np.count_nonzero(ink, axis=1) / float(ink.shape[1])
+        gap_rows = np.count_nonzero(row_ink < 0.02) / float(len(row_ink))
+        return gap_rows >= 0.08
+    
+    @classmethod
+    def _reading_order(cls, boxes: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        """
+        Recursive XY-cut: split into columns at vertical gutters first, then
+        into rows at horizontal gaps, so a headline spanning the columns comes
+        first and each column is read top to bottom before the next
+        """
+        if len(boxes) <= 1:
+            return boxes
+        columns = cls._split_on_gaps(boxes, 0)
+        if len(columns) > 1:
+            return [box for column in columns for box in cls._reading_order(column)]
+        rows = cls._split_on_gaps(boxes, 1)
+        if len(rows) == 1:
+            return sorted(boxes, key=lambda box: (box[1], box[0]))
+        
+        # Consecutive multi-column rows are one band of columns whose paragraph
+        # breaks happen to line up: read the band column by column
+        ordered, band = [], []
+        for row in rows + [None]:
+            if row is not None and len(cls._split_on_gaps(row, 0)) > 1:
+                band.extend(row)
+                continue
+            if band:
+                band_columns = cls._split_on_gaps(band, 0)
+                parts = band_columns if len(band_columns) > 1 else cls._split_on_gaps(band, 1)
+                ordered.extend(box for part in parts for box in cls._reading_order(part))
+                band = []
+            if row is not None:
+                ordered.extend(cls._reading_order(row))
+        return ordered
+    
+    @staticmethod
+    def _split_on_gaps(boxes: List[Tuple[int, int, int, int]], axis: int) -> List[List[Tuple[int, int, int, int]]]:
+        """Group boxes whose extents overlap along an axis (0 = x, 1 = y), ordered along it"""
+        groups, end = [], None
+        for box in sorted(boxes, key=lambda box: box[axis]):
+            start, stop = box[axis], box[axis] + box[axis + 2]
+            if end is None or start >= end:
+                groups.append([box])
+                end = stop
+            else:
+                groups[-1].append(box)
+                end = max(end, stop)
+        return groups
+    
+    def prepare_image(self, image: np.ndarray, profile: str = "auto") -> Tuple[np.ndarray, str, Dict[str, float]]:
+        """
+        Grayscale, rescale and preprocess an image for OCR
+        Returns: (processed image, profile applied, image statistics)
+        """
+        gray = self._rescale(self._to_gray(image))
+        stats = self.image_statistics(gray)
+        if profile not in PREPROCESSING_PROFILES or profile == "auto":
+            profile = self.choose_profile(stats)
+        return self._preprocess_image(gray, profile, stats), profile, stats
+    
+    def image_statistics(self, gray: np.ndarray) -> Dict[str, float]:
+        """
+        Cheap statistics that drive the auto profile:
+        - noise: robust sigma estimate from the median Laplacian response on a
+          central crop (text edges are sparse, so they barely move the median)
+        - contrast: 5th-95th percentile intensity spread, 0-1
+        - skew: dominant text angle in degrees, from a downscaled binarized copy
+        """
+        h, w = gray.shape[:2]
+        crop = gray[max(0, h // 2 - 512):h // 2 + 512, max(0, w // 2 - 512):w // 2 + 512].astype(np.float32)
+        kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+        laplacian = cv2.filter2D(crop, -1, kernel)[1:-1, 1:-1]
+        # The kernel's response to Gaussian noise has std 6 * sigma; MAD -> sigma via 0.6745
+        noise = float(np.median(np.abs(laplacian)) / (0.6745 * 6)) if laplacian.size else 0.0
+        
+        low, high = np.percentile(gray[::4, ::4], (5, 95))
+        contrast = float(high - low) / 255.0
+        
+        return {"noise": round(noise, 2), "contrast": round(contrast, 3), "skew": round(self._estimate_skew(gray), 2)}
+    
+    def choose_profile(self, stats: Dict[str, float]) -> str:
+        """Noisy or washed-out images get the thorough profile, clean straight scans none, the rest fast"""
+        if stats["noise"] >= self.noisy_threshold or stats["contrast"] < self.min_contrast:
+            return "thorough"
+        if stats["noise"] <= self.clean_threshold and abs(stats["skew"]) < self.deskew_min_degrees:
+            return "none"
+        return "fast"
+    
+    def _preprocess_image(self, gray: np.ndarray, profile: str = "thorough", stats: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Preprocess image for better OCR accuracy
+        - none: grayscale only (Tesseract binarizes internally)
+        - fast: deskew, adaptive thresholding
+        - thorough: deskew, NL-means denoise, adaptive thresholding
+        """
+        try:
+            if profile == "none":
+                return gray
+            
+            skew = (stats or {}).get("skew", 0.0)
+            if abs(skew) >= self.deskew_min_degrees:
+                gray = self._rotate(gray, skew)
+            
+            if profile == "thorough":
+                gray = cv2.fastNlMeansDenoising(gray, h=10)
             
             # Apply adaptive thresholding
-            thresh = cv2.adaptiveThreshold(
+            return cv2.adaptiveThreshold(
                 gray, 255,
                 cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                 cv2.THRESH_BINARY,
                 11, 2
             )
             
-            # Denoise
-            denoised = cv2.fastNlMeansDenoising(thresh, h=10)
-            
-            return denoised
-            
         except Exception as e:
             logger.warning(f"Image preprocessing failed: {e}, using original")
+            return gray
+    
+    @staticmethod
+    def _to_gray(image: np.ndarray) -> np.ndarray:
+        if image.ndim == 2:
             return image
+        if image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    
+    def _rescale(self, gray: np.ndarray) -> np.ndarray:
+        """Downscale huge camera images to OCR_MAX_IMAGE_SIDE, upscale tiny ones toward OCR_MIN_IMAGE_SIDE"""
+        long_side = max(gray.shape[:2])
+        if long_side > self.max_image_side:
+            scale, interpolation = self.max_image_side / long_side, cv2.INTER_AREA
+        elif 0 < long_side < self.min_image_side:
+            scale, interpolation = min(2.0, self.min_image_side / long_side), cv2.INTER_CUBIC
+        else:
+            return gray
+        return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+    
+    @staticmethod
+    def _estimate_skew(gray: np.ndarray) -> float:
+        """Angle of the minimum-area rectangle around the dark (text) pixels; 0 if implausible"""
+        scale = min(1.0, 1000 / max(gray.shape[:2]))
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+        _, ink = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        coords = cv2.findNonZero(ink)
+        if coords is None or len(coords) < 100:
+            return 0.0
+        # The reported range differs across OpenCV versions ([-90, 0) or (0, 90]); fold into (-45, 45]
+        angle = cv2.minAreaRect(coords)[-1] % 90
+        if angle > 45:
+            angle -= 90
+        return float(angle) if abs(angle) <= 10 else 0.0
+    
+    @staticmethod
+    def _rotate(gray: np.ndarray, angle: float) -> np.ndarray:
+        h, w = gray.shape[:2]
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        return cv2.warpAffine(gray, matrix, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
 
 
 # Global instance
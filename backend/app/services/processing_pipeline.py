@@ -1,14 +1,20 @@
 from sqlalchemy.orm import Session
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Optional
+import asyncio
 import logging
 from datetime import datetime
 
 from app.models.db_models import NewsArticle, AlertHistory
 from app.services.scraper_service import scraper_service
-from app.services.ocr_service import ocr_service
+from app.services.url_canonicalizer import canonical_url
+from app.services.ml_service import ml_batcher
 from app.services.language_service import language_service
-from app.services.ml_service import ml_service
+from app.services.ocr_service import ocr_service
 from app.services.email_service import email_alert_service
+from app.services.analysis_cache import analysis_cache
+from app.services.model_executor import (
+    model_executor, detect_and_translate_task
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,37 +37,64 @@ class NewsProcessingPipeline:
             logger.info(f"Processing URL: {url}")
             
             # Step 1: Extract content
-            extracted_data = scraper_service.extract_from_url(url)
+            extracted_data = await scraper_service.extract_from_url(url)
             
             # Step 2: Process content
-            article = await self._process_content(
-                content=extracted_data['content'],
-                title=extracted_data.get('title'),
-                source_type='url',
-                source_url=url,
-                published_date=extracted_data.get('published_date'),
-                authors=extracted_data.get('authors'),
-                db=db
-            )
-            
-            logger.info(f"✓ URL processed successfully: {article.id}")
-            return article
+            return await self.process_extracted(url, extracted_data, db)
             
         except Exception as e:
             logger.error(f"Error processing URL {url}: {e}")
             raise
     
-    async def process_pdf(self, pdf_bytes: bytes, filename: str, db: Session, language: str = 'eng') -> NewsArticle:
+    async def process_extracted(self, url: str, extracted_data: Dict, db: Session) -> NewsArticle:
+        """
+        Process an article already extracted by scraper_service (bulk ingestion
+        fetches ahead). An unchanged page returns its existing article
+        """
+        source_url = extracted_data.get('canonical_url') or canonical_url(url)
+        existing = self._find_unchanged_article(url, source_url, extracted_data, db)
+        if existing:
+            logger.info(f"✓ {url} unchanged, reusing article {existing.id}")
+            return existing
+        
+        article = await self._process_content(
+            content=extracted_data['content'],
+            title=extracted_data.get('title'),
+            source_type='url',
+            source_url=source_url,
+            published_date=extracted_data.get('published_date'),
+            authors=extracted_data.get('authors'),
+            db=db
+        )
+        
+        logger.info(f"✓ URL processed successfully: {article.id}")
+        return article
+    
+    def _find_unchanged_article(self, url: str, source_url: str, extracted_data: Dict, db: Session) -> Optional[NewsArticle]:
+        """
+        Latest article stored for this page (by canonical URL, or the raw URL
+        for rows saved before canonicalization) if the page hasn't changed:
+        the fetch revalidated, or the extracted text is identical
+        """
+        article = db.query(NewsArticle).filter(
+            NewsArticle.source_type == 'url',
+            NewsArticle.source_url.in_({source_url, canonical_url(url), url})
+        ).order_by(NewsArticle.id.desc()).first()
+        if article and (extracted_data.get('unchanged') or article.content == extracted_data['content']):
+            return article
+        return None
+    
+    async def process_pdf(self, pdf_bytes: bytes, filename: str, db: Session, language: str = 'eng', profile: Optional[str] = None) -> NewsArticle:
         """Process news article from PDF file"""
         try:
             logger.info(f"Processing PDF: {filename}")
             
-            # Step 1: Extract text using OCR
-            ocr_result = ocr_service.extract_text_from_pdf_bytes(pdf_bytes, language)
+            # Step 1: Extract text using OCR, page by page as pages are rendered and recognized
+            page_texts = [text async for text in self._pdf_page_texts(pdf_bytes, language, profile)]
             
             # Step 2: Process content
             article = await self._process_content(
-                content=ocr_result['text'],
+                content='\n\n'.join(page_texts),
                 title=filename,
                 source_type='pdf',
                 source_file_name=filename,
@@ -75,13 +108,35 @@ class NewsProcessingPipeline:
             logger.error(f"Error processing PDF {filename}: {e}")
             raise
     
-    async def process_image(self, image_bytes: bytes, filename: str, db: Session, language: str = 'eng') -> NewsArticle:
+    async def _pdf_page_texts(self, pdf_bytes: bytes, language: str, profile: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Page texts in page order from the streaming OCR iterator, advanced on a
+        worker thread so the event loop never waits on rendering or OCR
+        """
+        pages = await asyncio.to_thread(ocr_service.iter_pdf_pages, pdf_bytes, language, profile)
+        num_pages, failed = 0, []
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+            num_pages += 1
+            if page['error']:
+                failed.append(page['page'])
+                logger.warning(f"OCR failed on page {page['page']}: {page['error']}")
+                continue
+            logger.info(f"PDF page {page['page']} extracted via {page['method']} ({page.get('profile') or '-'}) in {page['seconds']}s")
+            yield page['text']
+        
+        if num_pages and len(failed) == num_pages:
+            raise RuntimeError("OCR failed on every page of the PDF")
+    
+    async def process_image(self, image_bytes: bytes, filename: str, db: Session, language: str = 'eng', profile: Optional[str] = None) -> NewsArticle:
         """Process news article from image file"""
         try:
             logger.info(f"Processing image: {filename}")
             
             # Step 1: Extract text using OCR
-            extracted_text = ocr_service.extract_text_from_image_bytes(image_bytes, language)
+            extracted_text = await asyncio.to_thread(ocr_service.extract_text_from_image_bytes, image_bytes, language, profile)
             
             # Step 2: Process content
             article = await self._process_content(
@@ -133,17 +188,39 @@ class NewsProcessingPipeline:
         Core processing logic for any content type
         """
         try:
-            # Step 1: Detect language
-            detected_lang = language_service.detect_language(content)
-            
-            # Step 2: Translate if needed
-            translation_result = language_service.translate_to_english(content, detected_lang)
-            translated_content = translation_result['translated_text']
-            
-            # Step 3: Run ML models (sentiment + department)
-            # Use translated content if available, otherwise original
-            analysis_text = translated_content if translation_result['translation_performed'] else content
-            ml_results = ml_service.analyze_text(analysis_text)
+            # Reuse stored results when the same article was analyzed before
+            cached = await analysis_cache.aget(content)
+            if cached:
+                logger.info("✓ Analysis cache hit, skipping detection, translation and inference")
+                detected_lang = cached['detected_language']
+                translation_result = {
+                    'translated_text': cached['translated_content'] or content,
+                    'translation_performed': bool(cached['translation_performed'])
+                }
+                translated_content = translation_result['translated_text']
+                ml_results = {key: cached[key] for key in ('sentiment', 'sentiment_score', 'department', 'department_score')}
+            else:
+                # Step 1 + 2: Detect language and translate if needed (on the model workers)
+                detected_lang, translation_result = await model_executor.run(detect_and_translate_task, content)
+                if not translation_result['translation_performed'] and 'error' in translation_result:
+                    logger.info("IndicTrans2 failed, trying Groq fallback...")
+                    translation_result = await language_service.translate_with_groq(content, detected_lang)
+                translated_content = translation_result['translated_text']
+                
+                # Step 3: Run ML models (sentiment + department)
+                # Use translated content if available, otherwise original
+                analysis_text = translated_content if translation_result['translation_performed'] else content
+                # Concurrent submissions share one batched forward pass per model
+                ml_results = await ml_batcher.submit(analysis_text)
+                
+                # Don't cache degraded results (model or translation errors)
+                if 'unknown' not in (ml_results['sentiment'], ml_results['department']) and 'error' not in translation_result:
+                    await analysis_cache.aput(content, {
+                        'detected_language': detected_lang,
+                        'translated_content': translated_content if translation_result['translation_performed'] else None,
+                        'translation_performed': translation_result['translation_performed'],
+                        **ml_results
+                    })
             
             # Step 4: Create database record
             article = NewsArticle(
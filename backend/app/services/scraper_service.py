@@ -1,103 +1,114 @@
 from newspaper import Article, ArticleException
-from bs4 import BeautifulSoup
-import requests
 from typing import Dict, Optional
+import asyncio
 import logging
 from datetime import datetime
 
+from app.config import get_settings
+from app.services.content_extractor import content_extractor
+from app.services.http_fetcher import http_fetcher, decode_html
+from app.services.http_cache import http_cache
+from app.services.url_canonicalizer import canonical_url, find_rel_canonical
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when extraction changes so cached extractions are redone
+EXTRACTION_VERSION = "2"
+
+SCRAPER_ENGINES = ("lxml", "newspaper")
+# Shorter bodies mean the engine missed the article; the other engine gets a try
+MIN_CONTENT_CHARS = 100
 
 
 class WebScraperService:
     """Service for extracting content from news URLs"""
     
     def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.engine = settings.SCRAPER_ENGINE
+        if self.engine not in SCRAPER_ENGINES:
+            logger.warning(f"Unknown SCRAPER_ENGINE '{self.engine}', using 'lxml'")
+            self.engine = "lxml"
     
-    def extract_from_url(self, url: str) -> Dict[str, any]:
+    async def extract_from_url(self, url: str) -> Dict[str, any]:
         """
-        Extract article content from URL using newspaper3k
-        Returns: dict with title, content, authors, publish_date, etc.
+        Download the page once through the shared fetcher and extract the
+        article from that HTML (parsing runs off the event loop). A page we
+        have seen before is revalidated with a conditional GET; if it is
+        unchanged the stored extraction is returned with unchanged=True
+        Returns: dict with title, content, authors, publish_date, canonical_url, etc.
         """
-        try:
-            # Try newspaper3k first (best for news articles)
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            # Extract metadata
-            result = {
-                "title": article.title or "No title",
-                "content": article.text or "",
-                "authors": article.authors or [],
-                "published_date": article.publish_date,
-                "top_image": article.top_image,
-                "source_url": url
-            }
-            
-            # If content is empty, try BeautifulSoup fallback
-            if not result["content"] or len(result["content"]) < 100:
-                logger.warning(f"newspaper3k failed for {url}, trying BeautifulSoup")
-                result = self._extract_with_bs4(url)
-            
-            logger.info(f"✓ Extracted article from {url}: {result['title'][:50]}")
-            return result
-            
-        except ArticleException as e:
-            logger.error(f"newspaper3k error for {url}: {e}")
-            return self._extract_with_bs4(url)
-        except Exception as e:
-            logger.error(f"Error extracting from {url}: {e}")
-            raise
+        key = canonical_url(url)
+        # The cache is SQLite: every read and write runs off the event loop
+        cached = await asyncio.to_thread(http_cache.get, key, EXTRACTION_VERSION)
+        page = await http_fetcher.fetch(url, headers=http_cache.conditional_headers(cached))
+        
+        if http_cache.is_unchanged(cached, page):
+            await asyncio.to_thread(http_cache.touch, key, page)
+            logger.info(f"✓ {url} unchanged since last fetch, reusing extraction")
+            return {**cached["extraction"], "source_url": url, "unchanged": True}
+        
+        html = decode_html(page["content"], page["encoding"])
+        result = await asyncio.to_thread(self.extract_from_html, html, url)
+        # Prefer the page's own rel=canonical, else the URL we ended up at after redirects
+        result["canonical_url"] = find_rel_canonical(html, page["final_url"]) or canonical_url(page["final_url"])
+        await asyncio.to_thread(http_cache.put, key, page, result, EXTRACTION_VERSION)
+        return {**result, "unchanged": False}
     
-    def _extract_with_bs4(self, url: str) -> Dict[str, any]:
+    def extract_from_html(self, html: str, url: str) -> Dict[str, any]:
         """
-        Fallback method using BeautifulSoup for difficult websites
+        Extract article content from already downloaded HTML with the
+        configured engine, falling back to the other one on the same HTML
+        when the first finds no article body
         """
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Try to find title
-            title = None
-            if soup.find('h1'):
-                title = soup.find('h1').get_text(strip=True)
-            elif soup.find('title'):
-                title = soup.find('title').get_text(strip=True)
-            
-            # Try to find main content
-            content = ""
-            
-            # Look for common article containers
-            article_tags = soup.find_all(['article', 'div'], class_=lambda x: x and any(
-                keyword in str(x).lower() for keyword in ['article', 'content', 'story', 'post']
-            ))
-            
-            if article_tags:
-                # Get text from paragraphs
-                paragraphs = article_tags[0].find_all('p')
-                content = '\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20])
-            else:
-                # Fallback: get all paragraphs
-                paragraphs = soup.find_all('p')
-                content = '\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20])
-            
-            return {
-                "title": title or "No title",
-                "content": content or "No content extracted",
-                "authors": [],
-                "published_date": None,
-                "top_image": None,
-                "source_url": url
-            }
-            
-        except Exception as e:
-            logger.error(f"BeautifulSoup extraction failed for {url}: {e}")
+        engines = [self._extract_with_lxml, self._extract_with_newspaper]
+        if self.engine == "newspaper":
+            engines.reverse()
+        
+        result = None
+        for extract in engines:
+            try:
+                candidate = extract(html, url)
+            except ArticleException as e:
+                logger.error(f"newspaper3k error for {url}: {e}")
+                continue
+            except Exception as e:
+                logger.error(f"{extract.__name__} failed for {url}: {e}")
+                continue
+            if result is None or len(candidate["content"]) > len(result["content"]):
+                result = candidate
+            if len(result["content"]) >= MIN_CONTENT_CHARS:
+                break
+            logger.warning(f"{extract.__name__} found no article body in {url}")
+        
+        if result is None:
             raise ValueError(f"Could not extract content from URL: {url}")
+        if not result["content"]:
+            result["content"] = "No content extracted"
+        logger.info(f"✓ Extracted article from {url}: {result['title'][:50]}")
+        return result
+    
+    def _extract_with_lxml(self, html: str, url: str) -> Dict[str, any]:
+        """
+        Text/link density extraction on lxml (see content_extractor)
+        """
+        return content_extractor.extract(html, url)
+    
+    def _extract_with_newspaper(self, html: str, url: str) -> Dict[str, any]:
+        """
+        newspaper3k on the same HTML (no second download)
+        """
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()
+        return {
+            "title": article.title or "No title",
+            "content": article.text or "",
+            "authors": article.authors or [],
+            "published_date": article.publish_date,
+            "top_image": article.top_image,
+            "source_url": url
+        }
 
 
 # Global instance
@@ -0,0 +1,225 @@
+from typing import Callable, Dict, List, Any, Optional, Tuple
+import logging
+import re
+import threading
+import time
+
+from app.config import get_settings
+from app.services.translation_memory import translation_memory
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Sentence terminators: Latin . ! ?, Devanagari danda / double danda (shared by
+# Bengali, Odia, Gurmukhi...), Urdu full stop and question mark
+SENTENCE_END = re.compile(r'(?<=[.!?।॥۔؟])\s+')
+# Clause boundaries used to break up over-long sentences
+CLAUSE_BREAK = re.compile(r'(?<=[,;:،])\s+')
+PARAGRAPH_BREAK = re.compile(r'\s*\n+\s*')
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """
+    Split a document into sentences with script-aware punctuation rules
+    Returns: list of (paragraph_index, sentence) in document order
+    """
+    sentences = []
+    for paragraph_idx, paragraph in enumerate(PARAGRAPH_BREAK.split(text.strip())):
+        for sentence in SENTENCE_END.split(paragraph):
+            if sentence.strip():
+                sentences.append((paragraph_idx, sentence.strip()))
+    return sentences
+
+
+def join_sentences(sentences: List[Tuple[int, str]]) -> str:
+    """Reassemble (paragraph_index, sentence) pairs, keeping paragraph breaks"""
+    paragraphs: Dict[int, List[str]] = {}
+    for paragraph_idx, sentence in sentences:
+        paragraphs.setdefault(paragraph_idx, []).append(sentence)
+    return "\n".join(" ".join(parts) for _, parts in sorted(paragraphs.items()))
+
+
+class TranslationEngine:
+    """
+    Full-document translation: sentence segmentation, token-budgeted batches
+    through a batch translator (e.g. the IndicTrans2 pipeline) and in-order
+    reassembly, with a per-document token cap and throughput metrics.
+    Sentences already in the translation memory are reused; only misses are
+    sent to the translator.
+    """
+
+    def __init__(self):
+        self.batch_size = max(1, settings.TRANSLATION_BATCH_SIZE)
+        self.batch_max_tokens = max(1, settings.TRANSLATION_BATCH_MAX_TOKENS)
+        self.max_sentence_tokens = max(8, settings.TRANSLATION_MAX_SENTENCE_TOKENS)
+        self.max_document_tokens = max(1, settings.TRANSLATION_MAX_DOCUMENT_TOKENS)
+        self._lock = threading.Lock()
+        self.stats = {
+            "documents": 0, "sentences": 0, "sentences_from_memory": 0, "tokens": 0,
+            "batches": 0, "seconds": 0.0, "truncated_documents": 0
+        }
+
+    def translate_document(
+        self,
+        text: str,
+        translate_batch: Callable[[List[str]], List[str]],
+        count_tokens: Callable[[str], int],
+        source_lang: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Translate a whole document sentence by sentence
+
+        Args:
+            text: Source document
+            translate_batch: Translates a list of sentences, returning one output per input
+            count_tokens: Source-side token count of a sentence
+            source_lang, provider: Translation memory key parts (memory is skipped if provider is None)
+
+        Returns: dict with translated text, sentence count and whether the token cap cut the document short
+        """
+        sentences = split_sentences(text)
+        result = self.translate_sentences(
+            [sentence for _, sentence in sentences], translate_batch, count_tokens, source_lang, provider
+        )
+        translated = [
+            (paragraph_idx, output)
+            for (paragraph_idx, _), output in zip(sentences, result["translations"])
+            if output is not None
+        ]
+        if result["truncated"]:
+            logger.warning(f"Document exceeded {self.max_document_tokens} tokens, translated the first {len(translated)} sentences")
+
+        return {
+            "translated_text": join_sentences(translated),
+            "sentences": len(translated),
+            "truncated": result["truncated"],
+        }
+
+    def translate_sentences(
+        self,
+        sentences: List[str],
+        translate_batch: Callable[[List[str]], List[str]],
+        count_tokens: Callable[[str], int],
+        source_lang: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Translate a list of sentences (e.g. the spans of one language in a
+        code-mixed document) in token-budgeted batches
+
+        Returns: dict with one translation per input sentence (None for
+        sentences past the document token cap) and whether the cap was hit
+        """
+        started = time.perf_counter()
+        pieces, truncated = self._budget_sentences(list(enumerate(sentences)), count_tokens)
+
+        outputs_by_index: Dict[int, str] = {}
+        if provider:
+            outputs_by_index = translation_memory.get_many([s for _, s, _ in pieces], source_lang, provider)
+        from_memory = len(outputs_by_index)
+
+        misses = [(idx, item) for idx, item in enumerate(pieces) if idx not in outputs_by_index]
+        batches = self._make_batches(misses)
+        for batch in batches:
+            sources = [sentence for _, (_, sentence, _) in batch]
+            outputs = [output.strip() for output in translate_batch(sources)]
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"Translator returned {len(outputs)} outputs for {len(batch)} sentences")
+            outputs_by_index.update((idx, output) for (idx, _), output in zip(batch, outputs))
+            if provider:
+                translation_memory.put_many(sources, outputs, source_lang, provider)
+
+        # Reassemble sentences that were split into several pieces
+        translations: List[Optional[str]] = [None] * len(sentences)
+        for idx, (sentence_idx, _, _) in enumerate(pieces):
+            previous = translations[sentence_idx]
+            translations[sentence_idx] = f"{previous} {outputs_by_index[idx]}" if previous else outputs_by_index[idx]
+
+        elapsed = time.perf_counter() - started
+        tokens = sum(tokens for _, (_, _, tokens) in misses)
+        with self._lock:
+            self.stats["documents"] += 1
+            self.stats["sentences"] += len(misses)
+            self.stats["sentences_from_memory"] += from_memory
+            self.stats["tokens"] += tokens
+            self.stats["batches"] += len(batches)
+            self.stats["seconds"] += elapsed
+            self.stats["truncated_documents"] += int(truncated)
+
+        logger.info(
+            f"✓ Translated {len(misses)} sentences in {len(batches)} batches "
+            f"({len(misses) / elapsed if elapsed else 0:.1f} sentences/sec), "
+            f"{from_memory} from translation memory"
+        )
+
+        return {"translations": translations, "truncated": truncated}
+
+    def _budget_sentences(self, sentences: List[Tuple[int, str]], count_tokens: Callable[[str], int]) -> Tuple[List[Tuple[int, str, int]], bool]:
+        """
+        Split over-long sentences into (sentence_idx, piece, tokens) and stop
+        before the first sentence that would exceed the document token cap
+        """
+        budgeted, total = [], 0
+        for sentence_idx, sentence in sentences:
+            pieces = [(piece, count_tokens(piece)) for piece in self._split_long_sentence(sentence, count_tokens)]
+            sentence_tokens = sum(tokens for _, tokens in pieces)
+            if total + sentence_tokens > self.max_document_tokens:
+                return budgeted, True
+            budgeted.extend((sentence_idx, piece, tokens) for piece, tokens in pieces)
+            total += sentence_tokens
+        return budgeted, False
+
+    def _split_long_sentence(self, sentence: str, count_tokens: Callable[[str], int]) -> List[str]:
+        """Break a sentence over TRANSLATION_MAX_SENTENCE_TOKENS at clause boundaries, then at spaces"""
+        if count_tokens(sentence) <= self.max_sentence_tokens:
+            return [sentence]
+
+        pieces = []
+        for clause in self._pack(CLAUSE_BREAK.split(sentence), count_tokens):
+            if count_tokens(clause) <= self.max_sentence_tokens:
+                pieces.append(clause)
+            else:
+                pieces.extend(self._pack(clause.split(), count_tokens))
+        return pieces
+
+    def _pack(self, units: List[str], count_tokens: Callable[[str], int]) -> List[str]:
+        """Greedily join consecutive units while they stay under the sentence token limit"""
+        pieces, current = [], ""
+        for unit in units:
+            candidate = f"{current} {unit}".strip()
+            if current and count_tokens(candidate) > self.max_sentence_tokens:
+                pieces.append(current)
+                current = unit
+            else:
+                current = candidate
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _make_batches(self, sentences: List[Tuple[int, Tuple[int, str, int]]]) -> List[List[Tuple[int, Tuple[int, str, int]]]]:
+        """Group consecutive (index, sentence) items into batches bounded by sentence count and total tokens"""
+        batches, current, current_tokens = [], [], 0
+        for item in sentences:
+            tokens = item[1][2]
+            if current and (len(current) >= self.batch_size or current_tokens + tokens > self.batch_max_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        seconds = stats["seconds"]
+        stats["seconds"] = round(seconds, 3)
+        stats["sentences_per_sec"] = round(stats["sentences"] / seconds, 2) if seconds else 0.0
+        stats["tokens_per_sec"] = round(stats["tokens"] / seconds, 2) if seconds else 0.0
+        return stats
+
+
+# Global instance
+translation_engine = TranslationEngine()
@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class TranslationMemory:
+    """
+    Segment-level translation memory.
+
+    Keys are (normalized sentence hash, source language, provider/model
+    version). A bounded in-memory LRU sits in front of a SQLite file, so
+    repeated sentences from press releases and syndicated stories are
+    translated once per host and reused across restarts.
+    """
+
+    def __init__(self):
+        self.enabled = settings.TRANSLATION_MEMORY_ENABLED
+        self.path = settings.TRANSLATION_MEMORY_PATH
+        self.version = settings.TRANSLATION_MEMORY_VERSION
+        self.max_memory_entries = max(0, settings.TRANSLATION_MEMORY_MAX_ENTRIES)
+        self.max_disk_entries = max(0, settings.TRANSLATION_MEMORY_MAX_DISK_ENTRIES)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "disk_evictions": 0, "errors": 0}
+
+    @staticmethod
+    def normalize_segment(segment: str) -> str:
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", segment)).strip()
+
+    def segment_key(self, segment: str, source_lang: str, provider: str) -> str:
+        digest = hashlib.sha256(self.normalize_segment(segment).encode("utf-8")).hexdigest()
+        return f"{digest}:{source_lang}:{provider}@{self.version}"
+
+    def get_many(self, segments: List[str], source_lang: str, provider: str) -> Dict[int, str]:
+        """
+        Look up translations for a list of segments
+        Returns: {segment index: cached translation} for the hits
+        """
+        if not self.enabled or not segments:
+            return {}
+
+        keys = [self.segment_key(segment, source_lang, provider) for segment in segments]
+        found: Dict[int, str] = {}
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for idx, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[idx] = self._memory[key]
+                    self.stats["memory_hits"] += 1
+                else:
+                    missing.setdefault(key, []).append(idx)
+
+            if missing:
+                disk = self._disk_get(list(missing))
+                for key, translation in disk.items():
+                    for idx in missing[key]:
+                        found[idx] = translation
+                    self.stats["disk_hits"] += len(missing[key])
+                    self._remember(key, translation)
+                self.stats["misses"] += sum(len(missing[key]) for key in missing if key not in disk)
+
+        return found
+
+    def put_many(self, segments: List[str], translations: List[str], source_lang: str, provider: str):
+        """Store translations for segments (same order)"""
+        if not self.enabled or not segments:
+            return
+
+        rows = []
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            for segment, translation in zip(segments, translations):
+                key = self.segment_key(segment, source_lang, provider)
+                self._remember(key, translation)
+                rows.append((key, source_lang, provider, translation, len(translation.encode("utf-8")), now, now))
+            self._disk_put(rows)
+            self.stats["stores"] += len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+            if self.enabled:
+                stats.update(self._disk_usage())
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        return stats
+
+    def _remember(self, key: str, translation: str):
+        """Insert into the LRU (caller holds the lock)"""
+        if self.max_memory_entries == 0:
+            return
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            # WAL lets several processes (API workers, translation worker) share the file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS segments (
+                    key TEXT PRIMARY KEY,
+                    source_lang TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_used_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments (last_used_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, str]:
+        try:
+            conn = self._connection()
+            found = {}
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(conn.execute(
+                    f"SELECT key, translation FROM segments WHERE key IN ({placeholders})", chunk
+                ).fetchall())
+            if found:
+                now = datetime.now().isoformat(timespec="seconds")
+                conn.executemany("UPDATE segments SET last_used_at = ? WHERE key = ?", [(now, key) for key in found])
+                conn.commit()
+            return found
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.error(f"Translation memory lookup failed: {e}")
+            return {}
+
+    def _disk_put(self, rows: List[tuple]):
+        try:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO segments (key, source_lang, provider, translation, bytes, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if self.max_disk_entries:
+                # Drop the least recently used rows beyond the cap
+                cursor = conn.execute(
+                    "DELETE FROM segments WHERE key IN ("
+                    "  SELECT key FROM segments ORDER BY last_used_at DESC LIMIT -1 OFFSET ?"
+                    ")",
+                    (self.max_disk_entries,)
+                )
+                self.stats["disk_evictions"] += max(0, cursor.rowcount)
+            conn.commit()
+        except sqlite3.Error as e:
+            self.stats["errors"] += 1
+            logger.error(f"Translation memory store failed: {e}")
+
+    def _disk_usage(self) -> Dict[str, int]:
+        try:
+            entries, stored = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM segments"
+            ).fetchone()
+            return {"disk_entries": entries, "bytes_stored": stored}
+        except sqlite3.Error:
+            return {"disk_entries": 0, "bytes_stored": 0}
+
+
+# Global instance
+translation_memory = TranslationMemory()
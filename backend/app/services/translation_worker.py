@@ -0,0 +1,337 @@
+"""
+Dedicated IndicTrans2 translation worker.
+
+One worker process per host holds the IndicTrans2 weights; every API worker
+talks to it over an authenticated local socket. The worker can preload the
+model at startup and unloads it after TRANSLATION_WORKER_IDLE_UNLOAD_SECONDS
+without requests.
+
+Run it standalone (from backend/):
+    python -m app.services.translation_worker [--preload]
+or let the API start it (TRANSLATION_WORKER_AUTOSTART=True).
+"""
+from multiprocessing.connection import Listener, Client
+from typing import Any, Dict, List, Optional
+import argparse
+import gc
+import logging
+import os
+import queue
+import secrets
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _worker_address():
+    return (settings.TRANSLATION_WORKER_HOST, settings.TRANSLATION_WORKER_PORT)
+
+
+# The old shipped default; multiprocessing unpickles what it receives, so a known key is never accepted
+INSECURE_AUTHKEYS = {"change-me-translation-worker"}
+_authkey: Optional[bytes] = None
+
+# Fraction of MODEL_EXECUTOR_TIMEOUT_SECONDS a worker request may take
+EXECUTOR_TIMEOUT_SHARE = 0.8
+
+
+def _worker_authkey() -> bytes:
+    """
+    TRANSLATION_WORKER_AUTHKEY if set, else a random per-host key kept in
+    TRANSLATION_WORKER_AUTHKEY_PATH (created 0600 by whichever process gets
+    there first, and refused if other users can read it)
+    """
+    global _authkey
+    if _authkey is not None:
+        return _authkey
+    if settings.TRANSLATION_WORKER_AUTHKEY:
+        if settings.TRANSLATION_WORKER_AUTHKEY in INSECURE_AUTHKEYS:
+            raise RuntimeError("TRANSLATION_WORKER_AUTHKEY is the published default; set a secret or leave it empty")
+        _authkey = settings.TRANSLATION_WORKER_AUTHKEY.encode("utf-8")
+        return _authkey
+
+    path = settings.TRANSLATION_WORKER_AUTHKEY_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        logger.info(f"✓ Generated translation worker key at {path}")
+    except FileExistsError:
+        pass
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise RuntimeError(f"{path} must be owned by this user and not accessible to others (chmod 600)")
+    with open(path, encoding="utf-8") as f:
+        key = f.read().strip()
+    if not key:
+        raise RuntimeError(f"{path} is empty")
+    _authkey = key.encode("utf-8")
+    return _authkey
+
+
+class TranslationWorkerServer:
+    """
+    Accepts requests from API workers on a local socket and runs them one at a
+    time on a single inference thread that owns the IndicTrans2 pipeline
+    """
+
+    def __init__(self, preload: bool = False):
+        from app.services.language_service import language_service
+        self.language_service = language_service
+        # This process is the worker: translate in-process, never via the client
+        self.language_service.use_translation_worker = False
+        self.preload = preload
+        self.idle_unload_seconds = settings.TRANSLATION_WORKER_IDLE_UNLOAD_SECONDS
+        self.jobs: "queue.Queue" = queue.Queue()
+        self.last_used = time.monotonic()
+        self.stats = {"requests": 0, "failed": 0, "loads": 0, "unloads": 0, "busy_seconds": 0.0}
+
+    @property
+    def model_loaded(self) -> bool:
+        return self.language_service.indic_pipeline is not None
+
+    def serve_forever(self):
+        try:
+            authkey = _worker_authkey()
+        except (RuntimeError, OSError) as e:
+            logger.error(f"Translation worker not started: {e}")
+            return
+        try:
+            listener = Listener(_worker_address(), authkey=authkey)
+        except OSError as e:
+            # Another API worker already started the shared translation worker
+            logger.info(f"Translation worker address {_worker_address()} in use ({e}), exiting")
+            return
+
+        logger.info(f"✓ Translation worker listening on {_worker_address()} (pid {os.getpid()})")
+        threading.Thread(target=self._inference_loop, name="translation-inference", daemon=True).start()
+        if self.preload:
+            self.jobs.put(({"op": "load"}, None))
+
+        with listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Rejected translation worker connection: {e}")
+                    continue
+                threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn):
+        """Read one request per message, queue it and send back the reply"""
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if request.get("op") == "ping":
+                    response = {"ok": True, "pid": os.getpid(), "model_loaded": self.model_loaded}
+                elif request.get("op") == "stats":
+                    response = {"ok": True, "stats": self.get_stats()}
+                else:
+                    reply: "queue.Queue" = queue.Queue(maxsize=1)
+                    self.jobs.put((request, reply))
+                    response = reply.get()
+                try:
+                    conn.send(response)
+                except (OSError, EOFError) as e:
+                    # The client gave up (timed out) and closed its end while we worked
+                    logger.debug(f"Dropping reply to {request.get('op')!r}, client went away: {e}")
+                    return
+
+    def _inference_loop(self):
+        """Single consumer: owns the model, serializes translations, unloads when idle"""
+        while True:
+            try:
+                request, reply = self.jobs.get(timeout=5)
+            except queue.Empty:
+                self._unload_if_idle()
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = self._run(request)
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Translation worker request failed: {e}")
+                response = {"ok": False, "error": str(e)}
+            self.stats["busy_seconds"] += time.perf_counter() - started
+            self.last_used = time.monotonic()
+            if reply is not None:
+                reply.put(response)
+
+    def _run(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "load":
+            self._ensure_loaded()
+            return {"model_loaded": True}
+        if op == "translate":
+            self._ensure_loaded()
+            self.stats["requests"] += 1
+            return self.language_service._translate_with_indictrans2(request["text"], request["source_lang"])
+        if op == "translate_sentences":
+            self._ensure_loaded()
+            self.stats["requests"] += 1
+            return self.language_service._translate_sentences_with_indictrans2(request["sentences"], request["source_lang"])
+        raise ValueError(f"Unknown translation worker op: {op}")
+
+    def _ensure_loaded(self):
+        if not self.model_loaded:
+            self.language_service._load_indictrans2()
+            self.stats["loads"] += 1
+
+    def _unload_if_idle(self):
+        if not self.model_loaded or self.idle_unload_seconds <= 0:
+            return
+        idle = time.monotonic() - self.last_used
+        if idle >= self.idle_unload_seconds:
+            logger.info(f"Unloading IndicTrans2 after {idle:.0f}s idle")
+            self.language_service.indic_pipeline = None
+            gc.collect()
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except Exception:
+                pass
+            self.stats["unloads"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        from app.services.translation_engine import translation_engine
+        from app.services.translation_memory import translation_memory
+        return {
+            **self.stats,
+            "busy_seconds": round(self.stats["busy_seconds"], 3),
+            "pid": os.getpid(),
+            "model_loaded": self.model_loaded,
+            "queue_depth": self.jobs.qsize(),
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+            "engine": translation_engine.get_stats(),
+            "translation_memory": translation_memory.get_stats(),
+        }
+
+
+class TranslationWorkerClient:
+    """API-side handle to the shared translation worker"""
+
+    def __init__(self):
+        self.enabled = settings.TRANSLATION_WORKER_ENABLED
+        # Translations run inside a model executor call; give up before the executor does,
+        # so a slow translation fails the request instead of outliving its 504
+        executor_budget = settings.MODEL_EXECUTOR_TIMEOUT_SECONDS * EXECUTOR_TIMEOUT_SHARE
+        self.timeout = min(settings.TRANSLATION_WORKER_TIMEOUT_SECONDS, executor_budget)
+        if self.timeout < settings.TRANSLATION_WORKER_TIMEOUT_SECONDS:
+            logger.warning(
+                f"TRANSLATION_WORKER_TIMEOUT_SECONDS={settings.TRANSLATION_WORKER_TIMEOUT_SECONDS:.0f} exceeds "
+                f"{EXECUTOR_TIMEOUT_SHARE:.0%} of MODEL_EXECUTOR_TIMEOUT_SECONDS, using {self.timeout:.0f}s"
+            )
+        self._process: Optional[subprocess.Popen] = None
+
+    def translate(self, text: str, source_lang: str) -> Dict[str, Any]:
+        """Translate via the worker; returns the same dict as LanguageService._translate_with_indictrans2"""
+        return self._translate({"op": "translate", "text": text, "source_lang": source_lang})
+
+    def translate_sentences(self, sentences: List[str], source_lang: str) -> Dict[str, Any]:
+        """Same as LanguageService._translate_sentences_with_indictrans2, run in the worker"""
+        return self._translate({"op": "translate_sentences", "sentences": sentences, "source_lang": source_lang})
+
+    def _translate(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        # One deadline for the whole call, restart and retry included
+        deadline = time.monotonic() + self.timeout
+        try:
+            response = self._request(message, self.timeout)
+        except ConnectionRefusedError:
+            # Worker exited (crash or host restart): bring it back once and retry
+            if not self.ensure_running(preload=False, wait_seconds=min(30.0, self.timeout / 2)):
+                raise
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Translation worker restart took longer than {self.timeout:.0f}s")
+            response = self._request(message, remaining)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "translation worker error"))
+        return response["result"]
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        try:
+            return self._request({"op": "ping"}, 2)
+        except Exception:
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        try:
+            return self._request({"op": "stats"}, 5)["stats"]
+        except Exception as e:
+            return {"available": False, "error": str(e)}
+
+    def ensure_running(self, preload: Optional[bool] = None, wait_seconds: float = 30.0) -> bool:
+        """Start the worker process if no worker answers on the configured address"""
+        try:
+            _worker_authkey()
+        except (RuntimeError, OSError) as e:
+            logger.error(f"Translation worker unavailable: {e}")
+            return False
+        if self.ping():
+            if preload:
+                self._request({"op": "load"}, self.timeout)
+            return True
+        if not settings.TRANSLATION_WORKER_AUTOSTART:
+            logger.warning("Translation worker not running and TRANSLATION_WORKER_AUTOSTART is off")
+            return False
+
+        preload = settings.TRANSLATION_WORKER_PRELOAD if preload is None else preload
+        command = [sys.executable, "-m", "app.services.translation_worker"] + (["--preload"] if preload else [])
+        logger.info(f"Starting translation worker: {' '.join(command)}")
+        # Own session: the worker outlives this API worker and is shared with the others
+        self._process = subprocess.Popen(command, cwd=BACKEND_DIR, start_new_session=True)
+
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            if self.ping():
+                logger.info("✓ Translation worker is up")
+                return True
+            time.sleep(0.25)
+        logger.error(f"Translation worker did not answer within {wait_seconds:.0f}s")
+        return False
+
+    def _request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        with Client(_worker_address(), authkey=_worker_authkey()) as conn:
+            conn.send(message)
+            if not conn.poll(timeout):
+                raise TimeoutError(f"Translation worker did not reply within {timeout:.0f}s")
+            return conn.recv()
+
+
+# Global instance
+translation_worker_client = TranslationWorkerClient()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared IndicTrans2 translation worker")
+    parser.add_argument("--preload", action="store_true", default=settings.TRANSLATION_WORKER_PRELOAD,
+                        help="load IndicTrans2 immediately instead of on the first request")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    TranslationWorkerServer(preload=args.preload).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
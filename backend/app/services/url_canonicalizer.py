@@ -0,0 +1,110 @@
+from urllib.parse import urlsplit, urlunsplit, urljoin, parse_qsl, urlencode
+from typing import Optional
+import html as html_lib
+import logging
+import re
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the click, never select content
+TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "pk_", "hsa_", "__twitter")
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "ocid", "cmpid", "icid",
+    "ref", "ref_src", "referrer", "_ga", "_gl", "ito", "s_cid",
+}
+# Query parameters that only select the AMP rendering of the same article
+AMP_PARAMS = {"amp", "_amp", "outputtype", "usqp"}
+
+# Google AMP cache: https://<host-with-dashes>.cdn.ampproject.org/c/s/<host>/<path>
+AMP_CACHE_PATH = re.compile(r'^/(?:[a-z]/)*?(s/)?([^/]+\.[^/]+)(/.*)?$')
+AMP_PATH_SUFFIX = re.compile(r'(?:/amp/?|\.amp)$')
+LINK_TAG = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+LINK_ATTR = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+
+
+def _extra_strip_params() -> set:
+    return {param.strip().lower() for param in settings.URL_STRIP_PARAMS.split(",") if param.strip()}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so different spellings of the same article compare equal:
+    lowercase scheme and host, no default port, no fragment, sorted query
+    without tracking parameters, AMP variants mapped to the regular page,
+    no trailing slash on non-root paths
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    path = parts.path or "/"
+
+    # AMP cache URLs embed the origin host and path
+    if host.endswith(".cdn.ampproject.org"):
+        match = AMP_CACHE_PATH.match(path)
+        if match:
+            scheme = "https" if match.group(1) else "http"
+            host = match.group(2).lower()
+            path = match.group(3) or "/"
+    elif parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    # AMP variants: amp.example.com, /story/amp, /amp/story, /story.amp(.html);
+    # amp.dev is a site of its own, so the prefix only goes if a registrable host is left
+    if host.startswith("amp.") and "." in host[len("amp."):]:
+        host = host[len("amp."):]
+    if path.startswith("/amp/"):
+        path = path[len("/amp"):]
+    path = AMP_PATH_SUFFIX.sub("", path) or "/"
+    if path.endswith(".amp.html"):
+        path = path[:-len(".amp.html")] + ".html"
+
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    strip = _extra_strip_params()
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_noise_param(key.lower(), strip)
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _is_noise_param(key: str, extra: set) -> bool:
+    return key in TRACKING_PARAMS or key in AMP_PARAMS or key in extra or key.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def find_rel_canonical(html: str, page_url: str) -> Optional[str]:
+    """
+    The page's <link rel="canonical"> target, resolved against the page URL
+    and canonicalized. Ignored when it points to a site root from an article
+    page (a common CMS misconfiguration) or isn't http(s)
+    """
+    for tag in LINK_TAG.findall(html[:200_000]):
+        attrs = {
+            name.lower(): next((value for value in values if value), "")
+            for name, *values in LINK_ATTR.findall(tag)
+        }
+        if "canonical" not in attrs.get("rel", "").lower().split() or not attrs.get("href"):
+            continue
+        target = urljoin(page_url, html_lib.unescape(attrs["href"].strip()))
+        if urlsplit(target).scheme not in DEFAULT_PORTS:
+            return None
+        target = canonical_url(target)
+        if urlsplit(target).path == "/" and urlsplit(canonical_url(page_url)).path != "/":
+            return None
+        return target
+    return None
+
+
+def url_host(url: str) -> str:
+    """Host (with non-default port) of a URL, the unit for per-site politeness limits"""
+    return urlsplit(canonical_url(url)).netloc
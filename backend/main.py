@@ -1,12 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import asyncio
 import logging
 import uvicorn
 
 from app.config import get_settings
 from app.database import init_db
 from app.api.routes import router
-from app.services.ml_service import ml_service
+from app.services.ml_service import ml_batcher
+from app.services.analysis_cache import analysis_cache
+from app.services.model_executor import model_executor
+from app.services.translation_worker import translation_worker_client
+from app.services.llm_client import llm_client
+from app.services.http_fetcher import http_fetcher
+from app.services.bulk_ingest import bulk_ingest
+from app.services.feed_poller import feed_poller
+from app.services.ocr_service import ocr_service
 
 # Configure logging
 logging.basicConfig(
@@ -44,23 +54,54 @@ async def startup_event():
         logger.info("Initializing database...")
         init_db()
         logger.info("✓ Database initialized")
+        await asyncio.to_thread(analysis_cache.purge_stale)
         
-        # Load ML models
-        logger.info("Loading ML models...")
-        ml_service.load_models()
-        logger.info("✓ ML models loaded successfully")
+        # Start (or attach to) the shared translation worker without blocking startup
+        if settings.TRANSLATION_WORKER_ENABLED:
+            app.state.translation_worker = asyncio.create_task(
+                asyncio.to_thread(translation_worker_client.ensure_running)
+            )
         
-        logger.info("✅ System ready!")
+        # Start the model worker pool and load ML models
+        model_executor.start()
+        if settings.ML_BACKGROUND_LOAD:
+            # Serve reads right away; submissions get 503 until /ready reports ready
+            logger.info("Loading ML models in the background...")
+            app.state.model_loader = asyncio.create_task(_load_models_in_background())
+            logger.info("✅ System accepting traffic (models warming up)")
+        else:
+            logger.info("Loading ML models...")
+            await model_executor.load_models()
+            logger.info("✓ ML models loaded successfully")
+            logger.info("✅ System ready!")
+        
+        # Poll configured feeds (each poll waits until the models are ready)
+        feed_poller.start()
         
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
         raise
 
 
+async def _load_models_in_background():
+    try:
+        await model_executor.load_models()
+        logger.info("✅ ML models loaded, system ready!")
+    except Exception as e:
+        logger.error(f"❌ Background model loading failed: {e}")
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down...")
+    await feed_poller.stop()
+    await bulk_ingest.shutdown()
+    await ml_batcher.stop()
+    model_executor.shutdown()
+    ocr_service.shutdown()
+    await llm_client.aclose()
+    await http_fetcher.aclose()
 
 
 @app.get("/")
@@ -83,16 +124,36 @@ def root():
     }
 
 
+def _model_status() -> str:
+    if model_executor.models_ready():
+        return "loaded"
+    return "failed" if model_executor.load_error else "loading"
+
+
 @app.get("/health")
 def health_check():
     """Detailed health check"""
+    backend = model_executor.backend_state()
     return {
         "status": "healthy",
         "database": "connected",
-        "ml_models": "loaded"
+        "ml_models": _model_status(),
+        "ml_inference_path": backend["inference_path"],
+        "ml_backend": backend["backend"],
+        **({"ml_workers": backend["workers"]} if "workers" in backend else {})
     }
 
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness probe: 200 once the ML models are loaded, 503 while they warm up"""
+    ready = model_executor.models_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, **model_executor.load_state()}
+    )
+
+
 # Include API routes
 app.include_router(router)
 
@@ -0,0 +1,129 @@
+"""
+Per-bucket inference latency before and after sequence-length bucketing
+and warm-up.
+
+"before": dynamic padding, no warm-up (the first requests pay one-time costs)
+"after":  inputs padded to ML_LENGTH_BUCKETS, synthetic warm-up per bucket,
+          plus the optional --compile-mode (jit / compile)
+
+Usage (from backend/):
+    python -m scripts.benchmark_buckets --buckets 64,128,256,512 --requests 50
+    python -m scripts.benchmark_buckets --buckets 64,128,256,512 --compile-mode jit
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from app.config import get_settings
+from app.services.ml_service import MLInferenceService, parse_length_buckets
+
+settings = get_settings()
+
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "parity_corpus.txt")
+
+
+def load_sentences() -> List[str]:
+    with open(CORPUS, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def texts_for_bucket(tokenizer, sentences: List[str], target_tokens: int, count: int) -> List[str]:
+    """Build `count` texts whose (character-truncated) token length lands just under target_tokens"""
+    texts = []
+    for i in range(count):
+        text = sentences[i % len(sentences)]
+        j = i + 1
+        while len(text) < 512:
+            candidate = f"{text} {sentences[j % len(sentences)]}"
+            if len(tokenizer(candidate[:512])["input_ids"]) > target_tokens:
+                break
+            text = candidate
+            j += 1
+        texts.append(text)
+    return texts
+
+
+def group_by_bucket(tokenizer, texts: List[str], buckets: List[int]) -> Dict[int, List[str]]:
+    """
+    Group texts by the bucket they actually pad to. Without long-document mode
+    inputs are cut at 512 characters, so large buckets may receive no texts.
+    """
+    grouped = {}
+    for text in texts:
+        length = len(tokenizer(text[:512])["input_ids"])
+        bucket = next((b for b in buckets if b >= length), buckets[-1])
+        grouped.setdefault(bucket, []).append(text)
+    return dict(sorted(grouped.items()))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(service: MLInferenceService, texts_by_bucket: Dict[int, List[str]]) -> Dict[int, List[float]]:
+    """Single-request latency (ms), interleaving buckets like mixed production traffic"""
+    latencies = {bucket: [] for bucket in texts_by_bucket}
+    rounds = max(len(texts) for texts in texts_by_bucket.values())
+    for i in range(rounds):
+        for bucket, texts in texts_by_bucket.items():
+            if i < len(texts):
+                started = time.perf_counter()
+                service.analyze_batch([texts[i]])
+                latencies[bucket].append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def build_service(buckets: List[int], warmup: bool, compile_mode: str) -> MLInferenceService:
+    service = MLInferenceService()
+    service.length_buckets = buckets
+    service.compile_mode = compile_mode
+    settings.ML_WARMUP = warmup
+    service.load_models()
+    return service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buckets", default=settings.ML_LENGTH_BUCKETS or "64,128,256,512")
+    parser.add_argument("--requests", type=int, default=50, help="requests per bucket")
+    parser.add_argument("--compile-mode", default="none", choices=("none", "jit", "compile"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    buckets = parse_length_buckets(args.buckets)
+
+    before = build_service([], warmup=False, compile_mode="none")
+    sentences = load_sentences()
+    texts = [
+        text
+        for bucket in buckets
+        for text in texts_for_bucket(before.sentiment_tokenizer, sentences, bucket, args.requests)
+    ]
+    texts_by_bucket = group_by_bucket(before.sentiment_tokenizer, texts, buckets)
+    results = {"before": measure(before, texts_by_bucket)}
+    del before
+
+    after = build_service(buckets, warmup=True, compile_mode=args.compile_mode)
+    results["after"] = measure(after, texts_by_bucket)
+
+    print(f"{'bucket':>8} {'run':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for bucket in texts_by_bucket:
+        for run in ("before", "after"):
+            values = results[run][bucket]
+            print(
+                f"{bucket:>8} {run:>7} {statistics.median(values):>9.1f} "
+                f"{percentile(values, 99):>9.1f} {max(values):>9.1f}"
+            )
+    if after.warmup_seconds:
+        print(f"warm-up seconds per bucket: {after.warmup_seconds}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
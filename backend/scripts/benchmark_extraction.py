@@ -0,0 +1,176 @@
+"""
+Benchmark article extraction engines on saved pages: time per page and
+extraction quality for the lxml density extractor (content_extractor),
+newspaper3k and the BeautifulSoup class-scan fallback the scraper used
+before it (kept below as legacy_bs4 for comparison; it runs only when
+beautifulsoup4, no longer an app dependency, is installed).
+
+Pages are name.html files with name.expected.json ground truth (title,
+authors, published_date, content) next to them; by default the saved
+fixtures in scripts/fixtures/pages.
+
+Quality columns:
+    body F1   word-level F1 of the extracted body against the expected body
+    title     extracted title equals the expected one (whitespace-normalized)
+    authors   same set of authors
+    date      same publication instant (or both missing)
+
+Usage (from backend/):
+    python -m scripts.benchmark_extraction --repeat 20
+    python -m scripts.benchmark_extraction --pages path/to/saved/pages
+"""
+import argparse
+import collections
+import glob
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from dateutil import parser as date_parser
+from newspaper import Article
+
+from app.services.content_extractor import content_extractor
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "pages")
+
+
+def legacy_bs4(html: str, url: str) -> Dict[str, Any]:
+    """The scraper's former BeautifulSoup fallback, unchanged"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'lxml')
+    title = None
+    if soup.find('h1'):
+        title = soup.find('h1').get_text(strip=True)
+    elif soup.find('title'):
+        title = soup.find('title').get_text(strip=True)
+    article_tags = soup.find_all(['article', 'div'], class_=lambda x: x and any(
+        keyword in str(x).lower() for keyword in ['article', 'content', 'story', 'post']
+    ))
+    if article_tags:
+        paragraphs = article_tags[0].find_all('p')
+    else:
+        paragraphs = soup.find_all('p')
+    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20])
+    return {"title": title or "No title", "content": content or "No content extracted", "authors": [], "published_date": None}
+
+
+def newspaper3k(html: str, url: str) -> Dict[str, Any]:
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return {"title": article.title, "content": article.text, "authors": article.authors, "published_date": article.publish_date}
+
+
+ENGINES: Dict[str, Callable[[str, str], Dict[str, Any]]] = {
+    "lxml": content_extractor.extract,
+    "newspaper3k": newspaper3k,
+}
+try:
+    import bs4  # noqa: F401
+
+    ENGINES["legacy_bs4"] = legacy_bs4
+except ImportError:
+    pass
+
+
+def load_pages(directory: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        truth_path = os.path.splitext(path)[0] + ".expected.json"
+        if not os.path.exists(truth_path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        with open(truth_path, encoding="utf-8") as f:
+            truth = json.load(f)
+        pages.append((os.path.basename(path), html, truth))
+    return pages
+
+
+def words(text: str) -> List[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def body_f1(extracted: str, expected: str) -> float:
+    got, want = collections.Counter(words(extracted)), collections.Counter(words(expected))
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 1.0 if not got and not want else 0.0
+    precision, recall = overlap / sum(got.values()), overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def same_date(extracted, expected: str) -> bool:
+    if not expected:
+        return extracted is None
+    if extracted is None:
+        return False
+    expected = date_parser.parse(expected)
+    if (extracted.tzinfo is None) != (expected.tzinfo is None):
+        return extracted.replace(tzinfo=None) == expected.replace(tzinfo=None)
+    return extracted == expected
+
+
+def score(result: Dict[str, Any], truth: Dict[str, Any]) -> Dict[str, float]:
+    normalize = lambda text: " ".join((text or "").split())
+    return {
+        "body_f1": body_f1(result.get("content", ""), truth["content"]),
+        "title": float(normalize(result.get("title")) == normalize(truth["title"])),
+        "authors": float({a.lower() for a in result.get("authors") or []} == {a.lower() for a in truth["authors"]}),
+        "date": float(same_date(result.get("published_date"), truth.get("published_date"))),
+    }
+
+
+def run(pages: List[Tuple[str, str, Dict[str, Any]]], repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results = {}
+    for name, html, truth in pages:
+        url = f"https://fixtures.example.com/{name}"
+        results[name] = {}
+        for engine, extract in ENGINES.items():
+            timings, result = [], {}
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = extract(html, url)
+                timings.append(time.perf_counter() - started)
+            results[name][engine] = {"ms": statistics.median(timings) * 1000, **score(result, truth)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default=PAGES_DIR, help="directory of name.html + name.expected.json pairs")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per page and engine (median time is reported)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    pages = load_pages(args.pages)
+    if not pages:
+        print(f"No pages with ground truth in {args.pages}")
+        return 1
+
+    results = run(pages, args.repeat)
+    columns = ("ms", "body_f1", "title", "authors", "date")
+
+    print(f"{'page':<22} {'engine':<12} {'ms':>8} {'body F1':>8} {'title':>6} {'authors':>8} {'date':>5}")
+    for name, by_engine in results.items():
+        for engine, row in by_engine.items():
+            print(f"{name:<22} {engine:<12} {row['ms']:>8.2f} {row['body_f1']:>8.1%} "
+                  f"{row['title']:>6.0f} {row['authors']:>8.0f} {row['date']:>5.0f}")
+        print()
+
+    print(f"Mean over {len(pages)} pages:")
+    for engine in ENGINES:
+        means = {column: statistics.mean(results[name][engine][column] for name in results) for column in columns}
+        print(f"  {engine:<12} {means['ms']:>8.2f} ms  body F1 {means['body_f1']:>6.1%}  title {means['title']:>5.0%}  "
+              f"authors {means['authors']:>5.0%}  date {means['date']:>5.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
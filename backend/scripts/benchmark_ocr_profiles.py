@@ -0,0 +1,157 @@
+"""
+Benchmark OCR preprocessing profiles: OCR time and character accuracy per
+profile on synthetic page images (clean, noisy, low-contrast, skewed and a
+blurred oversized "camera" shot) rendered from the parity corpus, plus any
+real fixtures given with --images (name.png next to name.txt ground truth).
+
+Usage (from backend/):
+    python -m scripts.benchmark_ocr_profiles --repeat 3
+    python -m scripts.benchmark_ocr_profiles --images path/to/scans
+"""
+import argparse
+import glob
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.services.ocr_service import ocr_service, PREPROCESSING_PROFILES
+
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "parity_corpus.txt")
+
+
+def load_lines(limit: int) -> List[str]:
+    with open(CORPUS, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()][:limit]
+
+
+def render_page(lines: List[str], width: int = 1700) -> np.ndarray:
+    """Black text on white at roughly 200 DPI body-text size, wrapped to the page width"""
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 30)
+    except OSError:
+        font = ImageFont.load_default()
+    wrapped, current = [], ""
+    for word in " ".join(lines).split():
+        candidate = f"{current} {word}".strip()
+        if current and font.getlength(candidate) > width - 160:
+            wrapped.append(current)
+            current = word
+        else:
+            current = candidate
+    wrapped.append(current)
+
+    page = Image.new("L", (width, 120 + 46 * len(wrapped)), 255)
+    draw = ImageDraw.Draw(page)
+    for i, line in enumerate(wrapped):
+        draw.text((80, 60 + 46 * i), line, fill=0, font=font)
+    return np.asarray(page)
+
+
+def degrade(page: np.ndarray, kind: str, rng: np.random.Generator) -> np.ndarray:
+    if kind == "clean":
+        return page
+    if kind == "noisy":
+        return np.clip(page + rng.normal(0, 28, page.shape), 0, 255).astype(np.uint8)
+    if kind == "low_contrast":
+        return (page * 0.25 + 140).astype(np.uint8)
+    if kind == "skewed":
+        h, w = page.shape
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), 4, 1.0)
+        return cv2.warpAffine(page, matrix, (w, h), borderValue=255)
+    if kind == "camera":
+        big = cv2.resize(page, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
+        big = cv2.GaussianBlur(big, (5, 5), 0)
+        return np.clip(big * 0.8 + 30 + rng.normal(0, 8, big.shape), 0, 255).astype(np.uint8)
+    raise ValueError(kind)
+
+
+def synthetic_fixtures(lines: List[str]) -> List[Tuple[str, np.ndarray, str]]:
+    rng = np.random.default_rng(0)
+    truth = " ".join(lines)
+    page = render_page(lines)
+    return [(kind, degrade(page, kind, rng), truth) for kind in ("clean", "noisy", "low_contrast", "skewed", "camera")]
+
+
+def image_fixtures(directory: str) -> List[Tuple[str, np.ndarray, str]]:
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.png")) + glob.glob(os.path.join(directory, "*.jpg"))):
+        truth_path = os.path.splitext(path)[0] + ".txt"
+        if not os.path.exists(truth_path):
+            continue
+        with open(truth_path, encoding="utf-8") as f:
+            truth = f.read()
+        fixtures.append((os.path.basename(path), np.asarray(Image.open(path).convert("L")), truth))
+    return fixtures
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def char_accuracy(ocr_text: str, truth: str) -> float:
+    """1 - Levenshtein distance / reference length, on whitespace-normalized text"""
+    a, b = normalize(ocr_text), normalize(truth)
+    if not b:
+        return 1.0 if not a else 0.0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return max(0.0, 1 - previous[-1] / len(b))
+
+
+def run(fixtures: List[Tuple[str, np.ndarray, str]], repeat: int, language: str) -> Dict[str, Dict[str, Tuple[float, float, str]]]:
+    results = {}
+    for name, image, truth in fixtures:
+        results[name] = {}
+        for profile in PREPROCESSING_PROFILES:
+            timings, text, applied = [], "", profile
+            for _ in range(repeat):
+                started = time.perf_counter()
+                text, applied = ocr_service._ocr_image(image, language, profile)
+                timings.append(time.perf_counter() - started)
+            results[name][profile] = (statistics.median(timings), char_accuracy(text, truth), applied)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per fixture and profile (median time is reported)")
+    parser.add_argument("--lines", type=int, default=12, help="corpus lines per synthetic page")
+    parser.add_argument("--images", help="directory of real fixtures (image + .txt ground truth)")
+    parser.add_argument("--language", default="eng")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    fixtures = synthetic_fixtures(load_lines(args.lines))
+    if args.images:
+        fixtures += image_fixtures(args.images)
+
+    results = run(fixtures, args.repeat, args.language)
+
+    print(f"{'fixture':<16} {'profile':<9} {'time (s)':>9} {'char acc':>9}  applied")
+    for name, by_profile in results.items():
+        for profile, (seconds, accuracy, applied) in by_profile.items():
+            print(f"{name:<16} {profile:<9} {seconds:>9.3f} {accuracy:>9.1%}  {applied}")
+        print()
+
+    print("Mean over fixtures:")
+    for profile in PREPROCESSING_PROFILES:
+        seconds = statistics.mean(results[name][profile][0] for name in results)
+        accuracy = statistics.mean(results[name][profile][1] for name in results)
+        print(f"  {profile:<9} {seconds:>7.3f}s  {accuracy:>6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
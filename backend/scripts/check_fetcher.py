@@ -0,0 +1,162 @@
+"""
+Check the page fetcher and URL scraping against the fixture HTTP server
+(scripts/fixture_http_server.py), started in-process on a free port:
+
+    size cap      a chunked body over FETCH_MAX_BYTES is cut off with FetchError
+    deadline      a page trickled out slower than FETCH_DEADLINE_SECONDS fails in time
+    bad URLs      HTTP errors and malformed URLs raise FetchError
+    one download  a page whose first engine finds no body is fetched once and
+                  handed to both extractors
+    revalidation  a resubmitted page is revalidated with a conditional GET, gets
+                  304 and reuses the stored extraction
+
+The HTTP cache goes to a temporary file, never the configured one. Exit code 1
+when a check fails.
+
+Usage (from backend/):
+    python -m scripts.check_fetcher
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from typing import Callable, List, Tuple
+
+# Before app.config is imported: keep the check's cache entries out of the real cache
+CACHE_DIR = tempfile.mkdtemp(prefix="check_fetcher_")
+os.environ["HTTP_CACHE_ENABLED"] = "True"
+os.environ["HTTP_CACHE_PATH"] = os.path.join(CACHE_DIR, "http_cache.sqlite3")
+
+from app.services.http_cache import http_cache  # noqa: E402
+from app.services.http_fetcher import FetchError, HTTPFetcher, http_fetcher  # noqa: E402
+from app.services.scraper_service import scraper_service  # noqa: E402
+from scripts.fixture_http_server import make_handler  # noqa: E402
+
+SLOW_SECONDS = 3.0
+PAGE = "english_article.html"
+
+
+async def expect_fetch_error(fetcher: HTTPFetcher, url: str, fragment: str) -> Tuple[bool, str]:
+    try:
+        await fetcher.fetch(url)
+    except FetchError as e:
+        return fragment in str(e), str(e)
+    return False, "no FetchError raised"
+
+
+async def check_size_cap(base_url: str, counts) -> Tuple[bool, str]:
+    fetcher = HTTPFetcher()
+    fetcher.max_bytes = 1_000_000
+    try:
+        ok, detail = await expect_fetch_error(fetcher, f"{base_url}/large?mb=20", "byte cap")
+    finally:
+        await fetcher.aclose()
+    return ok and fetcher.stats["too_large"] == 1, detail
+
+
+async def check_deadline(base_url: str, counts) -> Tuple[bool, str]:
+    fetcher = HTTPFetcher()
+    fetcher.deadline = 1.0
+    started = time.perf_counter()
+    try:
+        ok, detail = await expect_fetch_error(fetcher, f"{base_url}/slow/{PAGE}", "deadline")
+    finally:
+        await fetcher.aclose()
+    elapsed = time.perf_counter() - started
+    return ok and elapsed < SLOW_SECONDS, f"{detail} after {elapsed:.2f}s"
+
+
+async def check_bad_urls(base_url: str, counts) -> Tuple[bool, str]:
+    fetcher = HTTPFetcher()
+    try:
+        http_ok, http_detail = await expect_fetch_error(fetcher, f"{base_url}/status/404", "HTTP 404")
+        url_ok, url_detail = await expect_fetch_error(fetcher, "http://[::1/article", "InvalidURL")
+    finally:
+        await fetcher.aclose()
+    return http_ok and url_ok, f"{http_detail}; {url_detail}"
+
+
+async def check_single_download(base_url: str, counts) -> Tuple[bool, str]:
+    path = f"/plain/{PAGE}"
+    calls: List[str] = []
+    primary, fallback = scraper_service._extract_with_lxml, scraper_service._extract_with_newspaper
+
+    def no_body(html: str, url: str):
+        calls.append("lxml")
+        return {**primary(html, url), "content": ""}
+
+    def counted(html: str, url: str):
+        calls.append("newspaper")
+        return fallback(html, url)
+
+    # Force the fallback path: the first engine "finds" nothing on this page
+    scraper_service._extract_with_lxml, scraper_service._extract_with_newspaper = no_body, counted
+    engine, scraper_service.engine = scraper_service.engine, "lxml"
+    try:
+        result = await scraper_service.extract_from_url(f"{base_url}{path}")
+    finally:
+        scraper_service._extract_with_lxml, scraper_service._extract_with_newspaper = primary, fallback
+        scraper_service.engine = engine
+    ok = counts[path] == 1 and calls == ["lxml", "newspaper"] and len(result["content"]) > 100
+    return ok, f"{counts[path]} download(s), extractors {calls}, {len(result['content'])} chars"
+
+
+async def check_revalidation(base_url: str, counts) -> Tuple[bool, str]:
+    url = f"{base_url}/pages/{PAGE}"
+    revalidated = http_cache.stats["revalidated"]
+    first = await scraper_service.extract_from_url(url)
+    second = await scraper_service.extract_from_url(url)
+    ok = (
+        not first["unchanged"] and second["unchanged"] and second["title"] == first["title"]
+        and http_cache.stats["revalidated"] == revalidated + 1
+    )
+    return ok, f"first unchanged={first['unchanged']}, second unchanged={second['unchanged']}"
+
+
+CHECKS: List[Tuple[str, Callable]] = [
+    ("size cap", check_size_cap),
+    ("deadline", check_deadline),
+    ("bad URLs", check_bad_urls),
+    ("one download", check_single_download),
+    ("revalidation", check_revalidation),
+]
+
+
+async def run(base_url: str, counts) -> bool:
+    passed = True
+    for name, check in CHECKS:
+        try:
+            ok, detail = await check(base_url, counts)
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        passed = passed and ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name:<13} {detail}")
+    await http_fetcher.aclose()
+    return passed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="log every fixture server request")
+    args = parser.parse_args()
+
+    handler = make_handler(latency=0.0, slow_seconds=SLOW_SECONDS, quiet=not args.verbose)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        passed = asyncio.run(run(f"http://127.0.0.1:{server.server_port}", handler.counts))
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
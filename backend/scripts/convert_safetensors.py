@@ -0,0 +1,35 @@
+"""
+Rewrite the local classifier checkpoints as safetensors so load_models()
+can memory-map the weights instead of unpickling and copying them.
+
+Usage (from backend/):
+    python -m scripts.convert_safetensors
+"""
+import logging
+import sys
+
+from transformers import AutoModelForSequenceClassification
+
+from app.config import get_settings
+from app.services.inference_backends import has_safetensors
+
+logger = logging.getLogger("convert_safetensors")
+settings = get_settings()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    for model_path in (settings.SENTIMENT_MODEL_PATH, settings.DEPARTMENT_MODEL_PATH):
+        if has_safetensors(model_path):
+            logger.info(f"✓ {model_path} already has safetensors weights")
+            continue
+        logger.info(f"Converting {model_path} to safetensors")
+        model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        model.save_pretrained(model_path, safe_serialization=True)
+        logger.info(f"✓ Wrote safetensors weights to {model_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
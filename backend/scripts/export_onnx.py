@@ -0,0 +1,162 @@
+"""
+Export the sentiment and department classifiers to ONNX (optionally int8)
+and check the converted backends against the fp32 PyTorch models.
+
+Usage (from backend/):
+    python -m scripts.export_onnx                    # fp32 graphs
+    python -m scripts.export_onnx --int8             # fp32 + dynamically quantized int8 graphs
+    python -m scripts.export_onnx --int8 --verify    # ...then run the parity check
+    python -m scripts.export_onnx --verify-only      # parity check on existing graphs
+
+The parity check runs every backend (torch-int8, onnxruntime fp32/int8) over
+a fixture corpus and fails (exit code 1) when label agreement drops below
+--min-agreement or any class probability moves more than --max-delta.
+"""
+import argparse
+import inspect
+import logging
+import os
+import sys
+from typing import Dict, List, Tuple
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from app.config import get_settings
+from app.services.inference_backends import (
+    OnnxSequenceClassifier, onnx_model_path, quantize_dynamic_int8
+)
+
+logger = logging.getLogger("export_onnx")
+settings = get_settings()
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "parity_corpus.txt")
+
+
+def model_paths() -> Dict[str, str]:
+    return {
+        "sentiment": settings.SENTIMENT_MODEL_PATH,
+        "department": settings.DEPARTMENT_MODEL_PATH,
+    }
+
+
+def export_model(name: str, model_path: str, output_dir: str, opset: int, int8: bool):
+    """Export one classifier with dynamic batch and sequence axes"""
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    sample = tokenizer(["export sample text"], return_tensors="pt")
+    # Inputs are traced positionally, so they must follow forward()'s parameter order
+    # (input_ids, attention_mask, token_type_ids), not the tokenizer's model_input_names;
+    # OnnxSequenceClassifier feeds them by these names
+    input_names = [key for key in inspect.signature(model.forward).parameters if key in sample]
+    dynamic_axes = {key: {0: "batch", 1: "sequence"} for key in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = onnx_model_path(output_dir, name)
+    logger.info(f"Exporting {name} -> {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[key] for key in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+
+    if int8:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        int8_path = onnx_model_path(output_dir, name, quantized=True)
+        logger.info(f"Quantizing {name} -> {int8_path}")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+
+def load_corpus(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def class_probabilities(model, tokenizer, texts: List[str], batch_size: int = 8) -> torch.Tensor:
+    rows = []
+    for start in range(0, len(texts), batch_size):
+        encodings = tokenizer(
+            [text[:512] for text in texts[start:start + batch_size]],
+            padding=True, truncation=True, return_tensors="pt"
+        )
+        with torch.no_grad():
+            rows.append(torch.softmax(model(**encodings).logits, dim=-1))
+    return torch.cat(rows)
+
+
+def compare(reference: torch.Tensor, candidate: torch.Tensor) -> Tuple[float, float, float]:
+    """Returns: (label agreement, max abs probability delta, mean abs probability delta)"""
+    agreement = (reference.argmax(-1) == candidate.argmax(-1)).float().mean().item()
+    delta = (reference - candidate).abs()
+    return agreement, delta.max().item(), delta.mean().item()
+
+
+def verify(output_dir: str, corpus_path: str, min_agreement: float, max_delta: float) -> bool:
+    texts = load_corpus(corpus_path)
+    logger.info(f"Parity check on {len(texts)} fixture texts from {corpus_path}")
+    passed = True
+
+    for name, model_path in model_paths().items():
+        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        reference_model = AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+        reference = class_probabilities(reference_model, tokenizer, texts)
+
+        candidates = {"torch-int8": lambda: quantize_dynamic_int8(
+            AutoModelForSequenceClassification.from_pretrained(model_path).eval()
+        )}
+        for quantized in (False, True):
+            path = onnx_model_path(output_dir, name, quantized)
+            if os.path.exists(path):
+                label = "onnxruntime-int8" if quantized else "onnxruntime"
+                candidates[label] = lambda p=path: OnnxSequenceClassifier(p, model_path)
+
+        for label, load in candidates.items():
+            agreement, worst, mean = compare(reference, class_probabilities(load(), tokenizer, texts))
+            ok = agreement >= min_agreement and worst <= max_delta
+            passed = passed and ok
+            print(
+                f"{'PASS' if ok else 'FAIL'}  {name:<10} {label:<17} "
+                f"agreement={agreement:.2%}  max_delta={worst:.4f}  mean_delta={mean:.4f}"
+            )
+
+    return passed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", default=settings.ML_ONNX_DIR)
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--int8", action="store_true", help="also write dynamically quantized int8 graphs")
+    parser.add_argument("--verify", action="store_true", help="run the parity check after exporting")
+    parser.add_argument("--verify-only", action="store_true", help="skip export, only run the parity check")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    parser.add_argument("--max-delta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if not args.verify_only:
+        for name, model_path in model_paths().items():
+            export_model(name, model_path, args.output_dir, args.opset, args.int8)
+        logger.info("✓ Export complete")
+
+    if args.verify or args.verify_only:
+        if not verify(args.output_dir, args.corpus, args.min_agreement, args.max_delta):
+            logger.error("Parity check failed")
+            return 1
+        logger.info("✓ Parity check passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
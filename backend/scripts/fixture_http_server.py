@@ -0,0 +1,210 @@
+"""
+Local HTTP server for exercising the page fetcher and scrapers offline.
+Serves the saved article pages in scripts/fixtures/pages plus routes for the
+failure modes the fetcher has to survive.
+
+Usage (from backend/):
+    python -m scripts.fixture_http_server --port 8090
+
+Routes:
+    /pages/<name>.html        saved fixture page (text/html, no charset: decoding relies on <meta>),
+                              with ETag/Last-Modified; conditional requests get 304
+    /plain/<name>.html        same page without validators
+    /redirect/<name>.html     302 to /pages/<name>.html
+    /slow/<name>.html         fixture page trickled out over --slow seconds
+    /large?mb=20              endless-looking HTML body of the given size
+    /status/<code>            empty response with that status
+    /feeds/rss.xml            RSS, Atom, news sitemap and sitemap index listing the
+    /feeds/atom.xml           fixture pages, published --feed-spacing minutes apart
+    /feeds/sitemap.xml        up to server start (with ETag; conditional requests get 304)
+    /feeds/sitemap_index.xml
+
+Every request is logged with a running count per path, so a single fetch per
+submitted URL is easy to check. python -m scripts.check_fetcher runs the
+fetcher's checks (size cap, deadline, one download, 304s) against it.
+"""
+import argparse
+import collections
+import email.utils
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "pages")
+
+
+def page_names():
+    return sorted(name for name in os.listdir(PAGES_DIR) if name.endswith(".html"))
+
+
+def render_feed(kind: str, base_url: str, spacing_minutes: float, started: datetime) -> bytes:
+    """Feed document listing the fixture pages, newest first"""
+    entries = [
+        (f"{base_url}/pages/{name}", started - timedelta(minutes=spacing_minutes * i))
+        for i, name in enumerate(page_names())
+    ]
+    if kind == "rss.xml":
+        items = "".join(
+            f"<item><title>{link.rsplit('/', 1)[-1]}</title><link>{link}</link><guid>{link}</guid>"
+            f"<pubDate>{email.utils.format_datetime(published)}</pubDate></item>"
+            for link, published in entries
+        )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>Fixtures</title>{items}</channel></rss>'
+    elif kind == "atom.xml":
+        items = "".join(
+            f'<entry><id>{link}</id><link rel="alternate" href="{link}"/><updated>{published.isoformat()}</updated></entry>'
+            for link, published in entries
+        )
+        body = f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Fixtures</title>{items}</feed>'
+    elif kind == "sitemap.xml":
+        items = "".join(
+            f"<url><loc>{link}</loc><news:news><news:publication_date>{published.isoformat()}"
+            f"</news:publication_date></news:news></url>"
+            for link, published in entries
+        )
+        body = (
+            '<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            f'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">{items}</urlset>'
+        )
+    elif kind == "sitemap_index.xml":
+        body = (
+            '<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<sitemap><loc>{base_url}/feeds/sitemap.xml</loc><lastmod>{started.isoformat()}</lastmod></sitemap>"
+            "</sitemapindex>"
+        )
+    else:
+        return b""
+    return body.encode("utf-8")
+
+
+def make_handler(latency: float, slow_seconds: float, feed_spacing: float = 30.0, quiet: bool = False):
+    counts = collections.Counter()
+    lock = threading.Lock()
+    started = datetime.now(timezone.utc).replace(microsecond=0)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like real news sites
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            with lock:
+                counts[parsed.path] += 1
+                self.hits = counts[parsed.path]
+            time.sleep(latency)
+
+            parts = parsed.path.strip("/").split("/", 1)
+            route, name = parts[0], parts[1] if len(parts) > 1 else ""
+            if route == "pages":
+                return self._send_page(name, validators=True)
+            if route == "plain":
+                return self._send_page(name)
+            if route == "redirect":
+                return self._send(302, b"", {"Location": f"/pages/{name}"})
+            if route == "slow":
+                return self._send_page(name, trickle=slow_seconds)
+            if route == "large":
+                megabytes = float(parse_qs(parsed.query).get("mb", ["20"])[0])
+                return self._send_large(int(megabytes * 1024 * 1024))
+            if route == "status" and name.isdigit():
+                return self._send(int(name), b"")
+            if route == "feeds":
+                return self._send_feed(name)
+            self._send(404, b"not found")
+
+        def _send_page(self, name: str, trickle: float = 0.0, validators: bool = False):
+            path = os.path.join(PAGES_DIR, os.path.basename(name))
+            if not os.path.isfile(path):
+                return self._send(404, b"no such fixture")
+            with open(path, "rb") as f:
+                body = f.read()
+            if validators:
+                # Editing a fixture file changes both, so revalidation can be exercised by hand
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                last_modified = email.utils.formatdate(os.path.getmtime(path), usegmt=True)
+                headers = {"ETag": etag, "Last-Modified": last_modified}
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, b"", headers)
+                return self._send(200, body, {"Content-Type": "text/html", **headers})
+            if not trickle:
+                return self._send(200, body, {"Content-Type": "text/html"})
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            step = max(1, len(body) // 20)
+            try:
+                for i in range(0, len(body), step):
+                    self.wfile.write(body[i:i + step])
+                    self.wfile.flush()
+                    time.sleep(trickle / 20)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client hit its deadline
+
+        def _send_feed(self, name: str):
+            base_url = f"http://{self.headers.get('Host', 'localhost')}"
+            body = render_feed(name, base_url, feed_spacing, started)
+            if not body:
+                return self._send(404, b"no such feed")
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", {"ETag": etag})
+            self._send(200, body, {"Content-Type": "application/xml", "ETag": etag})
+
+        def _send_large(self, size: int):
+            # No Content-Length: the cap has to be enforced while streaming
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = b"<p>" + b"filler " * 2000 + b"</p>\n"
+            sent = 0
+            try:
+                while sent < size:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    sent += len(chunk)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _send(self, status: int, body: bytes, headers: dict = None):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            if not quiet:
+                print(f"[fixtures] {self.address_string()} {fmt % args} (hit #{getattr(self, 'hits', 0)})")
+
+    Handler.counts = counts  # requests per path, for checks that run the server in-process
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0, help="delay before every response, in seconds")
+    parser.add_argument("--slow", type=float, default=10.0, help="seconds /slow/ pages take to trickle out")
+    parser.add_argument("--feed-spacing", type=float, default=30.0, help="minutes between fixture items in /feeds/")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.latency, args.slow, args.feed_spacing))
+    print(f"Fixture pages on http://{args.host}:{args.port}/pages/ ({', '.join(page_names())})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
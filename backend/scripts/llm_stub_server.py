@@ -0,0 +1,113 @@
+"""
+Local stand-in for the Groq chat completions API, for exercising the LLM
+client offline: latency, error injection and outages.
+
+Usage (from backend/):
+    python -m scripts.llm_stub_server --port 8089 --latency 0.2 --fail-rate 0.3
+
+then run the API with
+    GROQ_BASE_URL=http://127.0.0.1:8089/openai/v1 GROQ_API_KEY=stub
+
+Only POST .../chat/completions is implemented. The reply echoes the first
+line of the prompt's text so callers can tell responses apart.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    def __init__(self, latency: float, fail_rate: float, fail_status: int, down_after: int, down_for: int):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.down_after = down_after
+        self.down_for = down_for
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def next_request(self) -> int:
+        with self.lock:
+            self.requests += 1
+            return self.requests
+
+    def is_down(self, n: int) -> bool:
+        """Simulated outage: requests down_after+1 .. down_after+down_for fail"""
+        return self.down_after > 0 and self.down_after < n <= self.down_after + self.down_for
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            n = state.next_request()
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                return self._send(401, {"error": {"message": "missing bearer token"}})
+
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(state.latency * random.uniform(0.5, 1.5))
+
+            if state.is_down(n) or random.random() < state.fail_rate:
+                headers = {"Retry-After": "1"} if state.fail_status == 429 else {}
+                return self._send(state.fail_status, {"error": {"message": "stub failure"}}, headers)
+
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            lines = [line for line in prompt.splitlines() if line.strip()]
+            # Prompts put the text after a "...:" header line; echo it back as the "translation"
+            text = lines[-2] if len(lines) >= 2 else (lines[0] if lines else "")
+            self._send(200, {
+                "id": f"stub-{n}",
+                "object": "chat.completion",
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"[stub] {text[:500]}"},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 0, "total_tokens": len(prompt.split())}
+            })
+
+        def _send(self, status: int, payload: dict, headers: dict = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            print(f"[stub] {self.address_string()} {fmt % args}")
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.1, help="mean response latency in seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--fail-status", type=int, default=503, help="HTTP status for injected failures")
+    parser.add_argument("--down-after", type=int, default=0, help="start an outage after this many requests (0 = never)")
+    parser.add_argument("--down-for", type=int, default=20, help="number of requests the outage lasts")
+    args = parser.parse_args()
+
+    state = StubState(args.latency, args.fail_rate, args.fail_status, args.down_after, args.down_for)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"LLM stub listening on http://{args.host}:{args.port}/openai/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()